@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Compare sequential, thread and process execution on a synthetic collection.
+
+Generates a collection with many roles (each with argument specs, a
+defaults file and a README with DocSmith markers) in a temporary
+directory and processes it in dry-run mode, like ``generate --check``:
+sequentially, with a thread pool and with a process pool. Executor
+startup is part of the measured time.
+
+Threads only run in parallel on free-threaded Python builds (like
+CPython 3.13t); on builds with a GIL, expect the process pool to win.
+
+Usage:
+    uv run python scripts/benchmark_executors.py [--roles 500] [--jobs N]
+        [--repeat 3]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from ansible_docsmith.core.collection import CollectionProcessor
+from ansible_docsmith.core.executors import create_executor, free_threaded
+from ansible_docsmith.core.processor import ProcessingResults
+
+SPEC = """---
+argument_specs:
+  main:
+    short_description: Synthetic role {index}
+    description: Role generated by the executor benchmark.
+    options:
+{options}
+"""
+
+OPTION = """      {role}_option_{number}:
+        type: dict
+        required: false
+        default: {{}}
+        description: Option {number} of the role, see O({role}_option_0).
+        options:
+          enabled:
+            type: bool
+            default: true
+            description: Whether C(option {number}) is enabled.
+          mode:
+            type: str
+            choices: [fast, safe]
+            default: safe
+            description: Processing mode.
+"""
+
+README = """# {role}
+
+Hand-written introduction.
+
+<!-- ANSIBLE DOCSMITH TOC START -->
+<!-- ANSIBLE DOCSMITH TOC END -->
+
+<!-- ANSIBLE DOCSMITH MAIN START -->
+<!-- ANSIBLE DOCSMITH MAIN END -->
+"""
+
+
+def create_collection(root: Path, roles: int, options: int) -> Path:
+    """Write a synthetic collection and return its path."""
+    collection = root / "collection"
+    (collection / "roles").mkdir(parents=True)
+    (collection / "galaxy.yml").write_text("namespace: bench\nname: roles\n")
+    (collection / "README.md").write_text("# Benchmark collection\n")
+    for index in range(roles):
+        role = f"role_{index:04d}"
+        role_path = collection / "roles" / role
+        (role_path / "meta").mkdir(parents=True)
+        (role_path / "defaults").mkdir()
+        (role_path / "meta" / "argument_specs.yml").write_text(
+            SPEC.format(
+                index=index,
+                options="".join(
+                    OPTION.format(role=role, number=number) for number in range(options)
+                ).rstrip("\n"),
+            )
+        )
+        (role_path / "defaults" / "main.yml").write_text(
+            "---\n"
+            + "".join(f"{role}_option_{number}: {{}}\n" for number in range(options))
+        )
+        (role_path / "README.md").write_text(README.format(role=role))
+    return collection
+
+
+def measure(
+    run: Callable[[], ProcessingResults], repeat: int
+) -> tuple[float, ProcessingResults]:
+    """Return the median duration of several runs and the last results."""
+    durations = []
+    results = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = run()
+        durations.append(time.perf_counter() - start)
+    assert results is not None
+    return statistics.median(durations), results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--roles", type=int, default=500, help="number of roles")
+    parser.add_argument(
+        "--options", type=int, default=10, help="options per role (dicts)"
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=os.cpu_count() or 1, help="parallel workers"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="runs per mode")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp:
+        collection = create_collection(Path(temp), args.roles, args.options)
+
+        def sequential() -> ProcessingResults:
+            return CollectionProcessor(collection, dry_run=True).process_collection()
+
+        def parallel(executor_type: str) -> Callable[[], ProcessingResults]:
+            def run() -> ProcessingResults:
+                with create_executor(executor_type, args.jobs) as executor:
+                    return CollectionProcessor(
+                        collection, dry_run=True, executor=executor
+                    ).process_collection()
+
+            return run
+
+        print(
+            f"Python {sys.version.split()[0]}"
+            f" ({'free-threaded' if free_threaded() else 'with GIL'}),"
+            f" {args.roles} roles with {args.options} options each,"
+            f" {args.jobs} jobs, median of {args.repeat} runs"
+        )
+        baseline, expected = measure(sequential, args.repeat)
+        print(f"{'sequential':<12}{baseline:>9.2f} s")
+        for executor_type in ("thread", "process"):
+            duration, results = measure(parallel(executor_type), args.repeat)
+            if results != expected:
+                print(f"{executor_type}: results differ from sequential processing")
+                return 1
+            print(
+                f"{executor_type:<12}{duration:>9.2f} s"
+                f"{baseline / duration:>8.2f}x speedup"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
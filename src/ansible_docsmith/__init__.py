@@ -14,16 +14,19 @@ from .constants import (
     MARKER_README_TOC_END,
     MARKER_README_TOC_START,
 )
+from .core.aio import process_collection_async, process_role_async
 from .core.defaults_comments import DefaultsCommentGenerator
 from .core.doc_generators import RSTDocumentationGenerator
 from .core.exceptions import (
     AnsibleDocSmithError,
     FileOperationError,
+    GitError,
     ParseError,
     ProcessingError,
     TemplateError,
     ValidationError,
 )
+from .core.memory import RenderedRole, render_role
 from .core.parser import ArgumentSpecParser
 from .core.processor import RoleProcessor
 from .core.readme_updater import ReadmeUpdater
@@ -49,16 +52,21 @@ __all__ = [
     "BaseTocGenerator",
     "DefaultsCommentGenerator",
     "FileOperationError",
+    "GitError",
     "MarkdownTocGenerator",
     "ParseError",
     "ProcessingError",
     "RSTDocumentationGenerator",
     "RSTTocGenerator",
     "ReadmeUpdater",
+    "RenderedRole",
     "RoleProcessor",
     "TemplateError",
     "ValidationError",
     "__author__",
     "__version__",
     "create_toc_generator",
+    "process_collection_async",
+    "process_role_async",
+    "render_role",
 ]
@@ -3,29 +3,61 @@
 Ansible-DocSmith CLI - Generate Ansible role documentation from argument_specs.yml
 """
 
-import difflib
+import contextlib
+import functools
+import glob
+import heapq
 import logging
+import operator
+import sys
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
 import typer
-from rich import print as rprint
-from rich.console import Console
-from rich.table import Table
 
 from . import __version__
-from .constants import CLI_HEADER
+from .constants import (
+    CLI_HEADER,
+    DIFF_FORMATS,
+    PARALLEL_MAX_PENDING_ROLES,
+    TIMINGS_TOP_ROLES,
+)
 from .core.collection import CollectionProcessor, detect_project_type
-from .core.exceptions import ProcessingError, ValidationError
-from .core.processor import ProcessingResults, RoleProcessor
+from .core.diffs import CompactFileDiffs, diff_stat, unified_diff
+from .core.discovery import changed_projects, discover_projects
+from .core.exceptions import (
+    FileOperationError,
+    GitError,
+    ProcessingError,
+    ValidationError,
+)
+from .core.executors import create_executor, resolve_executor_type, submit_role
+from .core.git import changed_files, docsmith_pin_changed
+from .core.processor import ComponentCache, ProcessingResults, RoleProcessor
+from .core.sources import (
+    FILE_SYSTEM,
+    FileSource,
+    GitSource,
+    TarballSource,
+    is_tarball,
+)
+from .core.timing import OTHER_STAGE, collect_timings, timed
+from .core.trace import TraceWriter
+from .core.validators import SPEC_CHECKS, select_spec_checks
 from .utils.logging import setup_logging
+from .utils.output import Output
 
 app = typer.Typer(
     name="ansible-docsmith",
     help="Generate and maintain Ansible role documentation from argument_specs.yml",
     add_completion=True,
 )
-console = Console()
+# Configured per command (see --output); Rich is imported on first use
+console = Output()
 LOGGER = logging.getLogger(__name__)
 
 
@@ -36,9 +68,18 @@ def _display_header() -> None:
     console.print()  # Blank line
 
 
+def _setup_output(output_mode: str, verbose: bool) -> None:
+    """Configure the console output and logging of a command."""
+    try:
+        console.configure(output_mode)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--output") from e
+    setup_logging(verbose, rich=console.rich)
+
+
 def version_callback(value: bool) -> None:
     if value:
-        rprint(f"Ansible-DocSmith version: {__version__}")
+        typer.echo(f"Ansible-DocSmith version: {__version__}")
         raise typer.Exit()
 
 
@@ -58,12 +99,13 @@ def main(
 
 @app.command()
 def generate(
-    role_path: Path = typer.Argument(
-        ...,
-        help="Path to an Ansible role or collection directory",
-        exists=True,
-        file_okay=False,
-        dir_okay=True,
+    ctx: typer.Context,
+    role_paths: list[str] | None = typer.Argument(
+        None,
+        help="Paths to Ansible role or collection directories. Glob patterns "
+        "(like 'roles/*') are expanded. With --changed: changed files.",
+        metavar="PATH...",
+        show_default=False,
     ),
     output_readme: bool = typer.Option(
         True, "--readme/--no-readme", help="Generate/update README documentation"
@@ -94,6 +136,112 @@ def generate(
         "files (implies --dry-run): exit code 1 if changes would be made. "
         "Useful for CI/CD pipelines and pre-commit hooks.",
     ),
+    fail_fast: bool = typer.Option(
+        False,
+        "--fail-fast",
+        help="Stop at the first error or, with --check/--dry-run, at the first "
+        "file that would change, skipping the remaining files and roles.",
+    ),
+    recursive: bool = typer.Option(
+        False,
+        "--recursive",
+        "-r",
+        help="Find all roles and collections below the given paths (e.g. "
+        "a monorepo), including ansible_collections/<ns>/<name> layouts.",
+    ),
+    ignore: list[str] | None = typer.Option(
+        None,
+        "--ignore",
+        help="Directory name or relative path pattern (like 'tests/*') not "
+        "to walk with --recursive; can be given multiple times.",
+    ),
+    changed: bool = typer.Option(
+        False,
+        "--changed",
+        help="Treat PATH... as changed files (e.g. passed by pre-commit) and "
+        "only process the roles and collections owning them.",
+    ),
+    files_from: str | None = typer.Option(
+        None,
+        "--files-from",
+        help="Read changed files from a file ('-' for stdin), one per line; "
+        "implies --changed.",
+    ),
+    since: str | None = typer.Option(
+        None,
+        "--since",
+        metavar="REF",
+        help="Only process roles and collections with files changed since "
+        "the git ref (committed, staged, unstaged or untracked), below "
+        "PATH... (default: current directory).",
+    ),
+    git_ref: str | None = typer.Option(
+        None,
+        "--git-ref",
+        metavar="REF",
+        help="Read the roles and collections from a git ref (tag, branch, "
+        "commit) instead of the working tree, without a checkout. Read-only: "
+        "implies --dry-run.",
+    ),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        min=0,
+        help="Number of roles to process in parallel (0: number of CPUs).",
+    ),
+    executor_type: str = typer.Option(
+        "auto",
+        "--executor",
+        help="Run parallel jobs in 'thread's or 'process'es. 'auto' uses "
+        "threads on free-threaded Python builds (no GIL), processes otherwise.",
+        case_sensitive=False,
+    ),
+    diff_format: str = typer.Option(
+        "full",
+        "--diff-format",
+        help="How to show the changes of dry runs: 'full' (colored diffs), "
+        "'stat' (added/removed lines per file) or 'patch' (plain unified "
+        "patch, e.g. for 'git apply').",
+        case_sensitive=False,
+    ),
+    diff_output: Path | None = typer.Option(
+        None,
+        "--diff-output",
+        metavar="FILE",
+        help="Write the patch to FILE instead of stdout (implies --diff-format patch).",
+        dir_okay=False,
+    ),
+    diff_max_lines: int = typer.Option(
+        0,
+        "--diff-max-lines",
+        min=0,
+        help="Show at most N lines of each file's diff with --diff-format "
+        "full (0: no limit).",
+    ),
+    output_mode: str = typer.Option(
+        "rich",
+        "--output",
+        help="Console output: 'rich' (formatted), 'plain' (plain lines, e.g. "
+        "for CI logs), 'quiet' (only errors, warnings and failures) or "
+        "'json-lines' (one JSON record per role and a summary).",
+        case_sensitive=False,
+    ),
+    show_timings: bool = typer.Option(
+        False,
+        "--timings",
+        help="Time the processing stages and show the time per stage and "
+        f"the {TIMINGS_TOP_ROLES} slowest roles at the end (also with "
+        "--output quiet; always in the summary of --output json-lines).",
+    ),
+    trace_path: Path | None = typer.Option(
+        None,
+        "--trace",
+        metavar="FILE",
+        help="Write the spans of every role and stage to FILE in the Chrome "
+        "Trace Event format (open it in Perfetto or chrome://tracing).",
+        dir_okay=False,
+    ),
     verbose: bool = typer.Option(
         False, "-v", "--verbose", help="Enable verbose logging"
     ),
@@ -115,7 +263,7 @@ def generate(
 ) -> None:
     """Generate comprehensive documentation for an Ansible role."""
 
-    setup_logging(verbose)
+    _setup_output(output_mode, verbose)
     _display_header()
 
     # Check mode never writes files
@@ -124,20 +272,47 @@ def generate(
 
     # Validate format type
     if format_type.lower() not in ["auto", "markdown", "rst"]:
-        console.print("[red]Error: Format must be 'auto', 'markdown' or 'rst'[/red]")
+        console.print(
+            "[red]Error: Format must be 'auto', 'markdown' or 'rst'[/red]", problem=True
+        )
         raise typer.Exit(1)
 
     # Validate template file extension if provided
     if template_readme and not template_readme.name.endswith(".j2"):
-        console.print("[red]Error: Template file must have .j2 extension[/red]")
+        console.print(
+            "[red]Error: Template file must have .j2 extension[/red]", problem=True
+        )
         raise typer.Exit(1)
 
     # Validate TOC bullet style if provided
     if readme_toc_list_bulletpoints and readme_toc_list_bulletpoints not in ["*", "-"]:
-        console.print("[red]Error: TOC bullet style must be '*' or '-'[/red]")
+        console.print(
+            "[red]Error: TOC bullet style must be '*' or '-'[/red]", problem=True
+        )
         raise typer.Exit(1)
 
-    console.print(f"[bold green]Processing role:[/bold green] {role_path}")
+    executor = _create_executor(ctx, jobs, executor_type)
+    diff_options = _diff_options(diff_format, diff_output, diff_max_lines)
+    source = _open_source(ctx, git_ref, role_paths or [])
+    if source.read_only:
+        dry_run = True
+    targets, selected_roles = _select_targets(
+        role_paths or [],
+        recursive,
+        ignore,
+        changed,
+        files_from,
+        since,
+        template_readme=template_readme,
+        source=source,
+    )
+    if any(is_tarball(target) for target in targets):
+        # Tarballs are read-only
+        dry_run = True
+    if len(targets) == 1:
+        console.print(f"[bold green]Processing role:[/bold green] {targets[0]}")
+    else:
+        console.print(f"[bold green]Processing {len(targets)} paths[/bold green]")
     console.print(
         f"[blue]Options:[/blue] README={output_readme}, "
         f"Defaults={update_defaults}, Dry-run={dry_run}"
@@ -149,68 +324,55 @@ def generate(
     if dry_run:
         console.print("[yellow]DRY RUN MODE - No files will be modified[/yellow]")
 
+    role_timings = _role_timings(show_timings)
+    trace = _open_trace(ctx, trace_path)
+    start = time.perf_counter()
     try:
-        # Initialize processor
-        is_collection = detect_project_type(role_path) == "collection"
-        if is_collection:
-            console.print(
-                f"[blue]Detected collection layout[/blue] "
-                f"(roles below {role_path / 'roles'})"
-            )
-
         try:
-            if is_collection:
-                collection_processor = CollectionProcessor(
-                    collection_path=role_path,
-                    dry_run=dry_run,
-                    template_readme=template_readme,
-                    toc_bullet_style=readme_toc_list_bulletpoints,
-                    format_type=format_type,
-                    defaults_comments_nested=defaults_comments_nested,
-                )
-            else:
-                processor = RoleProcessor(
-                    dry_run=dry_run,
-                    template_readme=template_readme,
-                    toc_bullet_style=readme_toc_list_bulletpoints,
-                    format_type=format_type,
-                    role_path=role_path,
-                    defaults_comments_nested=defaults_comments_nested,
-                )
-        except ValueError as e:
-            LOGGER.error("Template error: %s", e)
-            raise typer.Exit(1) from e
-
-        # Process the collection or role
-        if is_collection:
-            results = collection_processor.process_collection(
-                generate_readme=output_readme,
-                update_defaults=update_defaults,
-            )
-        else:
-            results = processor.process_role(
-                role_path=role_path,
+            results = _process_targets(
+                targets,
+                dry_run=dry_run,
+                template_readme=template_readme,
+                toc_bullet_style=readme_toc_list_bulletpoints,
+                format_type=format_type,
+                defaults_comments_nested=defaults_comments_nested,
+                fail_fast=fail_fast,
+                selected_roles=selected_roles,
+                source=source,
                 generate_readme=output_readme,
                 update_defaults=update_defaults,
+                executor=executor,
+                role_timings=role_timings,
+                trace=trace,
             )
+        except ValueError as e:
+            LOGGER.error("Template error: %s", e)
+            raise typer.Exit(1) from e
 
         # Display results
-        _display_results(results, dry_run)
+        elapsed = time.perf_counter() - start
+        with _run_timings(results.timings if role_timings is not None else None):
+            _display_results(results, dry_run, diff_options)
+        if show_timings:
+            _display_timings(results, role_timings, elapsed)
+        _close_trace(trace)
+        if console.json_lines:
+            failed = bool(results.errors or (check and results.changed_files()))
+            console.record(_summary_record(results, not failed, role_timings, elapsed))
 
         if results.errors:
-            console.print("\n[red]❌ Processing completed with errors[/red]")
+            console.print(
+                "\n[red]❌ Processing completed with errors[/red]", problem=True
+            )
             console.print()  # Trailing newline
             raise typer.Exit(1)
         elif check:
-            changed_files = [
-                file_path
-                for file_path, old_content, new_content in results.file_diffs
-                if old_content != new_content
-            ]
+            changed_files = results.changed_files()
             if changed_files:
                 console.print(
                     f"\n[red]❌ Documentation is not up to date "
-                    f"({len(changed_files)} file(s) would change)[/red]"
+                    f"({len(changed_files)} file(s) would change)[/red]",
+                    problem=True,
                 )
                 console.print()  # Trailing newline
                 raise typer.Exit(1)
@@ -239,12 +401,13 @@ def generate(
 
 @app.command()
 def validate(
-    role_path: Path = typer.Argument(
-        ...,
-        help="Path to an Ansible role or collection directory",
-        exists=True,
-        file_okay=False,
-        dir_okay=True,
+    ctx: typer.Context,
+    role_paths: list[str] | None = typer.Argument(
+        None,
+        help="Paths to Ansible role or collection directories. Glob patterns "
+        "(like 'roles/*') are expanded. With --changed: changed files.",
+        metavar="PATH...",
+        show_default=False,
     ),
     format_type: str = typer.Option(
         "auto",
@@ -252,6 +415,14 @@ def validate(
         help="Expected format: 'auto', 'markdown' or 'rst' (auto detects from files)",
         case_sensitive=False,
     ),
+    output_mode: str = typer.Option(
+        "rich",
+        "--output",
+        help="Console output: 'rich' (formatted), 'plain' (plain lines, e.g. "
+        "for CI logs), 'quiet' (only errors, warnings and failures) or "
+        "'json-lines' (one JSON record per role and a summary).",
+        case_sensitive=False,
+    ),
     verbose: bool = typer.Option(
         False, "-v", "--verbose", help="Enable verbose logging"
     ),
@@ -269,61 +440,436 @@ def validate(
         help="Treat warnings as errors (exit code 1). Useful for CI/CD "
         "pipelines and pre-commit hooks. Notices do not fail validation.",
     ),
+    only_checks: list[str] | None = typer.Option(
+        None,
+        "--only",
+        help="Run only the given argument spec check(s), comma-separated or "
+        f"repeated. Available: {', '.join(SPEC_CHECKS)}",
+    ),
+    skip_checks: list[str] | None = typer.Option(
+        None,
+        "--skip",
+        help="Skip the given argument spec check(s), comma-separated or repeated",
+    ),
+    fail_fast: bool = typer.Option(
+        False,
+        "--fail-fast",
+        help="Stop at the first validation error, skipping the remaining "
+        "checks and roles.",
+    ),
+    recursive: bool = typer.Option(
+        False,
+        "--recursive",
+        "-r",
+        help="Find all roles and collections below the given paths (e.g. "
+        "a monorepo), including ansible_collections/<ns>/<name> layouts.",
+    ),
+    ignore: list[str] | None = typer.Option(
+        None,
+        "--ignore",
+        help="Directory name or relative path pattern (like 'tests/*') not "
+        "to walk with --recursive; can be given multiple times.",
+    ),
+    changed: bool = typer.Option(
+        False,
+        "--changed",
+        help="Treat PATH... as changed files (e.g. passed by pre-commit) and "
+        "only process the roles and collections owning them.",
+    ),
+    files_from: str | None = typer.Option(
+        None,
+        "--files-from",
+        help="Read changed files from a file ('-' for stdin), one per line; "
+        "implies --changed.",
+    ),
+    since: str | None = typer.Option(
+        None,
+        "--since",
+        metavar="REF",
+        help="Only process roles and collections with files changed since "
+        "the git ref (committed, staged, unstaged or untracked), below "
+        "PATH... (default: current directory).",
+    ),
+    git_ref: str | None = typer.Option(
+        None,
+        "--git-ref",
+        metavar="REF",
+        help="Read the roles and collections from a git ref (tag, branch, "
+        "commit) instead of the working tree, without a checkout.",
+    ),
 ) -> None:
     """Validate argument_specs.yml structure and content."""
 
-    setup_logging(verbose)
+    _setup_output(output_mode, verbose)
     _display_header()
 
-    console.print(f"[green]Validating:[/green] {role_path}")
+    source = _open_source(ctx, git_ref, role_paths or [])
+    targets, selected_roles = _select_targets(
+        role_paths or [],
+        recursive,
+        ignore,
+        changed,
+        files_from,
+        since,
+        source=source,
+    )
+    console.print(f"[green]Validating:[/green] {', '.join(map(str, targets))}")
+
+    # Validate format type
+    if format_type.lower() not in ["auto", "markdown", "rst"]:
+        console.print(
+            "[red]Error: Format must be 'auto', 'markdown' or 'rst'[/red]", problem=True
+        )
+        raise typer.Exit(1)
 
+    # Validate check selection
+    only = _split_check_names(only_checks)
+    skip = _split_check_names(skip_checks)
     try:
-        # Validate format type
-        if format_type.lower() not in ["auto", "markdown", "rst"]:
-            console.print(
-                "[red]Error: Format must be 'auto', 'markdown' or 'rst'[/red]"
-            )
-            raise typer.Exit(1)
+        select_spec_checks(only, skip)
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]", problem=True)
+        raise typer.Exit(1) from e
 
-        if detect_project_type(role_path) == "collection":
-            _validate_collection(
-                role_path,
-                format_type=format_type,
-                validate_readme=validate_readme,
-                validate_argument_specs=validate_argument_specs,
-                strict=strict,
+    components = ComponentCache()
+    failed = has_warnings = False
+    for target in targets:
+        if len(targets) > 1:
+            console.print(f"\n[bold]{target}[/bold]")
+
+        options: dict[str, Any] = {
+            "format_type": format_type,
+            "validate_readme": validate_readme,
+            "validate_argument_specs": validate_argument_specs,
+            "only_checks": only,
+            "skip_checks": skip,
+            "fail_fast": fail_fast,
+            "components": components,
+            "source": _target_source(target, source),
+            "verbose": verbose,
+        }
+        if detect_project_type(target, options["source"]) == "collection":
+            target_failed, target_has_warnings = _validate_collection(
+                target, selected_roles=selected_roles.get(target), **options
             )
-            return
+        else:
+            target_failed, target_has_warnings = _validate_role(target, **options)
+        failed = failed or target_failed
+        has_warnings = has_warnings or target_has_warnings
+        if failed and fail_fast:
+            break
+
+    if console.json_lines:
+        console.record(
+            {
+                "type": "summary",
+                "status": "failed" if failed or (strict and has_warnings) else "passed",
+            }
+        )
+    if failed:
+        console.print("\n[red]❌ Validation failed[/red]", problem=True)
+        console.print()  # Trailing newline
+        raise typer.Exit(1)
 
-        # Initialize processor
-        processor = RoleProcessor(format_type=format_type, role_path=role_path)
+    if strict and has_warnings:
+        console.print(
+            "\n[red]❌ Validation failed (--strict): "
+            "warnings are treated as errors[/red]",
+            problem=True,
+        )
+        console.print()  # Trailing newline
+        raise typer.Exit(1)
 
-        # Validate the role
-        role_data = processor.validate_role(
-            role_path,
-            validate_readme=validate_readme,
-            validate_argument_specs=validate_argument_specs,
+    console.print("\n[green]✅ Validation passed![/green]")
+    console.print()  # Trailing newline
+
+
+@app.command()
+def ci(
+    ctx: typer.Context,
+    role_paths: list[str] | None = typer.Argument(
+        None,
+        help="Paths to Ansible role or collection directories. Glob patterns "
+        "(like 'roles/*') are expanded. With --changed: changed files.",
+        metavar="PATH...",
+        show_default=False,
+    ),
+    format_type: str = typer.Option(
+        "auto",
+        "--format",
+        help="Output format: 'auto', 'markdown' or 'rst' (auto detects from files)",
+        case_sensitive=False,
+    ),
+    check_readme: bool = typer.Option(
+        True, "--readme/--no-readme", help="Validate and check README documentation"
+    ),
+    check_defaults: bool = typer.Option(
+        True,
+        "--defaults/--no-defaults",
+        help="Check comments in entry-point variable files like defaults/main.yml",
+    ),
+    defaults_comments_nested: bool = typer.Option(
+        True,
+        "--defaults-comments-nested/--no-defaults-comments-nested",
+        help=("Document nested options (dict attributes) in entry-point file comments"),
+    ),
+    strict: bool = typer.Option(
+        True,
+        "--strict/--no-strict",
+        help="Treat validation warnings as errors (exit code 1). Notices do not "
+        "fail the run.",
+    ),
+    fail_fast: bool = typer.Option(
+        False,
+        "--fail-fast",
+        help="Stop at the first error or file that would change, skipping the "
+        "remaining files and roles.",
+    ),
+    recursive: bool = typer.Option(
+        False,
+        "--recursive",
+        "-r",
+        help="Find all roles and collections below the given paths (e.g. "
+        "a monorepo), including ansible_collections/<ns>/<name> layouts.",
+    ),
+    ignore: list[str] | None = typer.Option(
+        None,
+        "--ignore",
+        help="Directory name or relative path pattern (like 'tests/*') not "
+        "to walk with --recursive; can be given multiple times.",
+    ),
+    changed: bool = typer.Option(
+        False,
+        "--changed",
+        help="Treat PATH... as changed files (e.g. passed by pre-commit) and "
+        "only process the roles and collections owning them.",
+    ),
+    files_from: str | None = typer.Option(
+        None,
+        "--files-from",
+        help="Read changed files from a file ('-' for stdin), one per line; "
+        "implies --changed.",
+    ),
+    since: str | None = typer.Option(
+        None,
+        "--since",
+        metavar="REF",
+        help="Only process roles and collections with files changed since "
+        "the git ref (committed, staged, unstaged or untracked), below "
+        "PATH... (default: current directory).",
+    ),
+    git_ref: str | None = typer.Option(
+        None,
+        "--git-ref",
+        metavar="REF",
+        help="Read the roles and collections from a git ref (tag, branch, "
+        "commit) instead of the working tree, without a checkout.",
+    ),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        min=0,
+        help="Number of roles to process in parallel (0: number of CPUs).",
+    ),
+    executor_type: str = typer.Option(
+        "auto",
+        "--executor",
+        help="Run parallel jobs in 'thread's or 'process'es. 'auto' uses "
+        "threads on free-threaded Python builds (no GIL), processes otherwise.",
+        case_sensitive=False,
+    ),
+    diff_format: str = typer.Option(
+        "full",
+        "--diff-format",
+        help="How to show the changes of dry runs: 'full' (colored diffs), "
+        "'stat' (added/removed lines per file) or 'patch' (plain unified "
+        "patch, e.g. for 'git apply').",
+        case_sensitive=False,
+    ),
+    diff_output: Path | None = typer.Option(
+        None,
+        "--diff-output",
+        metavar="FILE",
+        help="Write the patch to FILE instead of stdout (implies --diff-format patch).",
+        dir_okay=False,
+    ),
+    diff_max_lines: int = typer.Option(
+        0,
+        "--diff-max-lines",
+        min=0,
+        help="Show at most N lines of each file's diff with --diff-format "
+        "full (0: no limit).",
+    ),
+    output_mode: str = typer.Option(
+        "rich",
+        "--output",
+        help="Console output: 'rich' (formatted), 'plain' (plain lines, e.g. "
+        "for CI logs), 'quiet' (only errors, warnings and failures) or "
+        "'json-lines' (one JSON record per role and a summary).",
+        case_sensitive=False,
+    ),
+    show_timings: bool = typer.Option(
+        False,
+        "--timings",
+        help="Time the processing stages and show the time per stage and "
+        f"the {TIMINGS_TOP_ROLES} slowest roles at the end (also with "
+        "--output quiet; always in the summary of --output json-lines).",
+    ),
+    trace_path: Path | None = typer.Option(
+        None,
+        "--trace",
+        metavar="FILE",
+        help="Write the spans of every role and stage to FILE in the Chrome "
+        "Trace Event format (open it in Perfetto or chrome://tracing).",
+        dir_okay=False,
+    ),
+    verbose: bool = typer.Option(
+        False, "-v", "--verbose", help="Enable verbose logging"
+    ),
+    readme_toc_list_bulletpoints: str | None = typer.Option(
+        None,
+        "--readme-toc-list-bulletpoints",
+        help=(
+            "Bullet style for README TOC ('*' or '-'). Auto-detected if not specified."
+        ),
+    ),
+    template_readme: Path | None = typer.Option(
+        None,
+        "--template-readme",
+        help="Path to custom README template file (.md.j2)",
+        exists=True,
+        file_okay=True,
+        dir_okay=False,
+    ),
+) -> None:
+    """Validate and check that the documentation is up to date, in one pass.
+
+    Combines "validate --strict" and "generate --check": every role is
+    parsed once, validated, and its documentation is rendered and compared
+    with the files on disk without writing anything. Exit code 1 if
+    validation fails or any file would change.
+    """
+
+    _setup_output(output_mode, verbose)
+    _display_header()
+
+    # Validate format type
+    if format_type.lower() not in ["auto", "markdown", "rst"]:
+        console.print(
+            "[red]Error: Format must be 'auto', 'markdown' or 'rst'[/red]", problem=True
         )
+        raise typer.Exit(1)
 
-        # Display validation results
-        _display_validation_results(role_data)
+    # Validate template file extension if provided
+    if template_readme and not template_readme.name.endswith(".j2"):
+        console.print(
+            "[red]Error: Template file must have .j2 extension[/red]", problem=True
+        )
+        raise typer.Exit(1)
 
-        if strict and role_data.get("warnings"):
-            console.print(
-                "\n[red]❌ Validation failed (--strict): "
-                "warnings are treated as errors[/red]"
+    # Validate TOC bullet style if provided
+    if readme_toc_list_bulletpoints and readme_toc_list_bulletpoints not in ["*", "-"]:
+        console.print(
+            "[red]Error: TOC bullet style must be '*' or '-'[/red]", problem=True
+        )
+        raise typer.Exit(1)
+
+    executor = _create_executor(ctx, jobs, executor_type)
+    diff_options = _diff_options(diff_format, diff_output, diff_max_lines)
+    source = _open_source(ctx, git_ref, role_paths or [])
+    targets, selected_roles = _select_targets(
+        role_paths or [],
+        recursive,
+        ignore,
+        changed,
+        files_from,
+        since,
+        template_readme=template_readme,
+        source=source,
+    )
+    if len(targets) == 1:
+        console.print(f"[bold green]Checking:[/bold green] {targets[0]}")
+    else:
+        console.print(f"[bold green]Checking {len(targets)} paths[/bold green]")
+
+    role_timings = _role_timings(show_timings)
+    trace = _open_trace(ctx, trace_path)
+    start = time.perf_counter()
+    try:
+        try:
+            results = _process_targets(
+                targets,
+                dry_run=True,
+                template_readme=template_readme,
+                toc_bullet_style=readme_toc_list_bulletpoints,
+                format_type=format_type,
+                defaults_comments_nested=defaults_comments_nested,
+                fail_fast=fail_fast,
+                selected_roles=selected_roles,
+                source=source,
+                generate_readme=check_readme,
+                update_defaults=check_defaults,
+                validate_collection_readme=check_readme,
+                executor=executor,
+                role_timings=role_timings,
+                trace=trace,
             )
+        except ValueError as e:
+            LOGGER.error("Template error: %s", e)
+            raise typer.Exit(1) from e
+
+        # Display freshness and validation results together
+        elapsed = time.perf_counter() - start
+        with _run_timings(results.timings if role_timings is not None else None):
+            _display_results(results, dry_run=True, diff_options=diff_options)
+        if results.validation_warnings:
+            console.print("\n[yellow]Validation warnings:[/yellow]", problem=True)
+            for warning in results.validation_warnings:
+                console.print(f"  [yellow]⚠[/yellow] {warning}", problem=True)
+        if results.validation_notices:
+            console.print("\n[blue]Validation notices:[/blue]")
+            for notice in results.validation_notices:
+                console.print(f"  [blue]ℹ[/blue] {notice}")
+
+        failures = []
+        if results.errors:
+            failures.append(f"{len(results.errors)} error(s)")
+        if strict and results.validation_warnings:
+            failures.append(
+                f"{len(results.validation_warnings)} validation warning(s) (--strict)"
+            )
+        changed_files = results.changed_files()
+        if changed_files:
+            failures.append(
+                f"documentation is not up to date "
+                f"({len(changed_files)} file(s) would change)"
+            )
+
+        if show_timings:
+            _display_timings(results, role_timings, elapsed)
+        _close_trace(trace)
+        if console.json_lines:
+            console.record(
+                _summary_record(results, not failures, role_timings, elapsed)
+            )
+        if failures:
+            console.print("\n[red]❌ CI check failed:[/red]", problem=True)
+            for failure in failures:
+                console.print(f"  • {failure}", style="red", problem=True)
             console.print()  # Trailing newline
             raise typer.Exit(1)
 
-        console.print("\n[green]✅ Validation passed![/green]")
+        console.print(
+            "\n[green]✅ Validation passed and documentation is up to date![/green]"
+        )
         console.print()  # Trailing newline
 
     except typer.Exit:
         # Intentional exit with a specific code; do not treat as error
         raise
-    except ValidationError as e:
-        LOGGER.error("Validation failed: %s", e)
+    except (ValidationError, ProcessingError) as e:
+        LOGGER.error("Processing error: %s", e)
         console.print()  # Trailing newline
         raise typer.Exit(1) from e
     except Exception as e:
@@ -336,16 +882,725 @@ def validate(
         raise typer.Exit(1) from e
 
 
+def _split_check_names(values: list[str] | None) -> list[str]:
+    """Flatten repeated and comma-separated check names."""
+    return [
+        name.strip()
+        for value in values or []
+        for name in value.split(",")
+        if name.strip()
+    ]
+
+
+def _open_source(
+    ctx: typer.Context, git_ref: str | None, values: list[str]
+) -> FileSource:
+    """Return the source to read the roles and collections from.
+
+    Git sources are closed when the command ends.
+    """
+    if git_ref is None:
+        return FILE_SYSTEM
+
+    # Repository of the first path (or of its nearest existing parent)
+    path = Path(values[0]).absolute() if values else Path.cwd()
+    while not path.is_dir():
+        path = path.parent
+    try:
+        source = GitSource(git_ref, path)
+    except GitError as e:
+        raise typer.BadParameter(str(e), param_hint="--git-ref") from e
+    ctx.call_on_close(source.close)
+    console.print(f"[blue]Reading from {source} (read-only)[/blue]")
+    return source
+
+
+def _create_executor(
+    ctx: typer.Context, jobs: int, executor_type: str
+) -> Executor | None:
+    """Return the executor for processing roles in parallel.
+
+    None for a single job (sequential processing); executors are shut
+    down when the command ends.
+    """
+    try:
+        resolve_executor_type(executor_type)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--executor") from e
+    if jobs == 1:
+        return None
+    executor = create_executor(executor_type, jobs or None)
+    ctx.call_on_close(functools.partial(executor.shutdown, cancel_futures=True))
+    return executor
+
+
+@dataclass(frozen=True)
+class _DiffOptions:
+    """How to show the changes of dry runs (see --diff-format)."""
+
+    format: str = "full"
+    output: Path | None = None
+    max_lines: int = 0
+
+
+def _diff_options(
+    diff_format: str, diff_output: Path | None, diff_max_lines: int
+) -> _DiffOptions:
+    """Check and combine the diff options."""
+    diff_format = diff_format.lower()
+    if diff_format not in DIFF_FORMATS:
+        raise typer.BadParameter(
+            f"Must be one of {', '.join(map(repr, DIFF_FORMATS))}",
+            param_hint="--diff-format",
+        )
+    if diff_output is not None:
+        diff_format = "patch"
+    elif diff_format == "patch" and console.json_lines:
+        raise typer.BadParameter(
+            "Cannot write a patch to stdout with --output json-lines; "
+            "use --diff-output.",
+            param_hint="--diff-format",
+        )
+    return _DiffOptions(diff_format, diff_output, diff_max_lines)
+
+
+def _target_source(target: Path, source: FileSource) -> FileSource:
+    """Return the source to read a target from (tarballs are read as such).
+
+    Raises:
+        typer.BadParameter: If a tarball cannot be read
+    """
+    if source is not FILE_SYSTEM or not is_tarball(target):
+        return source
+    try:
+        tarball = TarballSource(target)
+    except FileOperationError as e:
+        raise typer.BadParameter(str(e), param_hint="PATH...") from e
+    console.print(f"[blue]Reading from {tarball} (read-only)[/blue]")
+    return tarball
+
+
+def _select_targets(
+    values: list[str],
+    recursive: bool,
+    ignore: list[str] | None,
+    changed: bool,
+    files_from: str | None,
+    since: str | None = None,
+    template_readme: Path | None = None,
+    source: FileSource = FILE_SYSTEM,
+) -> tuple[list[Path], dict[Path, set[str]]]:
+    """Return the roles and collections to process.
+
+    Returns:
+        Tuple of (target paths, collection path -> names of the roles to
+        process for collections not processed as a whole)
+
+    Raises:
+        typer.BadParameter: If no or invalid paths are given
+        typer.Exit: With --changed or --since, if no changed file belongs
+            to a role or collection (exit code 0: nothing to do)
+    """
+    if source is not FILE_SYSTEM:
+        if recursive or changed or files_from is not None or since is not None:
+            raise typer.BadParameter(
+                "Cannot be combined with --recursive, --changed, --files-from "
+                "or --since.",
+                param_hint="--git-ref",
+            )
+        if not values:
+            raise typer.BadParameter("Missing argument.", param_hint="PATH...")
+        return _expand_paths(values, source=source), {}
+
+    if since is not None:
+        if changed or files_from is not None:
+            raise typer.BadParameter(
+                "Cannot be combined with --changed or --files-from.",
+                param_hint="--since",
+            )
+        values = values or ["."]
+        changed_paths = _changed_since(values, since, template_readme)
+        if changed_paths is None:
+            # Everything may render differently; process all targets
+            return _expand_paths(values, recursive, ignore), {}
+        values, changed = [str(path) for path in changed_paths], True
+
+    if files_from is not None:
+        changed = True
+        values = [*values, *_read_files_from(files_from)]
+
+    if not changed:
+        if not values:
+            raise typer.BadParameter("Missing argument.", param_hint="PATH...")
+        return _expand_paths(values, recursive, ignore), {}
+
+    projects = changed_projects(Path(value) for value in values)
+    if not projects:
+        console.print("No roles or collections affected by the changed files.")
+        raise typer.Exit(0)
+    return list(projects), {
+        path: roles for path, roles in projects.items() if roles is not None
+    }
+
+
+def _changed_since(
+    values: list[str], since: str, template_readme: Path | None
+) -> list[Path] | None:
+    """Return the files below the given paths changed since a git ref.
+
+    Returns:
+        The changed files, or None if all roles have to be processed
+        because the README template or the pinned DocSmith version changed
+    """
+    changed_paths: list[Path] = []
+    for path in _expand_paths(values):
+        try:
+            files = changed_files(path, since)
+            if docsmith_pin_changed(path, since, files):
+                console.print(
+                    "[blue]DocSmith version changed, processing all roles[/blue]"
+                )
+                return None
+        except GitError as e:
+            raise typer.BadParameter(str(e), param_hint="--since") from e
+
+        if template_readme is not None and template_readme.resolve() in files:
+            console.print("[blue]README template changed, processing all roles[/blue]")
+            return None
+
+        base = path.resolve()
+        changed_paths.extend(file for file in files if file.is_relative_to(base))
+    return changed_paths
+
+
+def _read_files_from(source: str) -> list[str]:
+    """Read a list of files, one per line (or NUL-separated)."""
+    try:
+        content = (
+            sys.stdin.read()
+            if source == "-"
+            else Path(source).read_text(encoding="utf-8")
+        )
+    except OSError as e:
+        raise typer.BadParameter(
+            f"Cannot read '{source}': {e}", param_hint="--files-from"
+        ) from e
+    return [
+        line.strip()
+        for line in content.replace("\0", "\n").splitlines()
+        if line.strip()
+    ]
+
+
+def _expand_paths(
+    values: list[str],
+    recursive: bool = False,
+    ignore: list[str] | None = None,
+    source: FileSource = FILE_SYSTEM,
+) -> list[Path]:
+    """Expand glob patterns and check the given role/collection paths.
+
+    Paths are returned in the given order (matches of a pattern sorted),
+    each directory only once. With recursive, every path is replaced by
+    the roles and collections found below it (collection tarballs are
+    kept as they are). Paths in other sources than the file system are
+    taken literally.
+
+    Raises:
+        typer.BadParameter: If a path is no directory or tarball, a pattern
+            does not match any or nothing is found below a path
+    """
+    paths: list[Path] = []
+    seen: set[Path] = set()
+    for value in values:
+        if source is not FILE_SYSTEM:
+            if not source.is_dir(Path(value)):
+                raise typer.BadParameter(
+                    f"Directory '{value}' does not exist in {source}.",
+                    param_hint="PATH...",
+                )
+            candidates = [Path(value)]
+        elif any(char in value for char in "*?["):
+            candidates = [
+                Path(match)
+                for match in sorted(glob.glob(value, recursive=True))
+                if Path(match).is_dir() or is_tarball(Path(match))
+            ]
+            if not candidates:
+                raise typer.BadParameter(
+                    f"No directory matches '{value}'.", param_hint="PATH..."
+                )
+        else:
+            if not Path(value).is_dir() and not is_tarball(Path(value)):
+                raise typer.BadParameter(
+                    f"Directory '{value}' does not exist.", param_hint="PATH..."
+                )
+            candidates = [Path(value)]
+
+        if recursive:
+            candidates = [
+                project
+                for candidate in candidates
+                for project in (
+                    [candidate]
+                    if is_tarball(candidate)
+                    else [
+                        path
+                        for _type, path in discover_projects(candidate, ignore or ())
+                    ]
+                )
+            ]
+            if not candidates:
+                raise typer.BadParameter(
+                    f"No roles or collections found below '{value}'.",
+                    param_hint="PATH...",
+                )
+
+        for path in candidates:
+            resolved = path.resolve()
+            if resolved not in seen:
+                seen.add(resolved)
+                paths.append(path)
+    return paths
+
+
+def _process_targets(
+    targets: list[Path],
+    dry_run: bool,
+    template_readme: Path | None,
+    toc_bullet_style: str | None,
+    format_type: str,
+    defaults_comments_nested: bool,
+    fail_fast: bool,
+    selected_roles: dict[Path, set[str]],
+    source: FileSource,
+    generate_readme: bool,
+    update_defaults: bool,
+    validate_collection_readme: bool = False,
+    executor: Executor | None = None,
+    role_timings: dict[Path, float] | None = None,
+    trace: TraceWriter | None = None,
+) -> ProcessingResults:
+    """Process roles and collections with shared components.
+
+    The results of all targets are combined; with several targets, their
+    messages are prefixed with the target path. Collections listed in
+    selected_roles only process the given roles. With an executor, role
+    targets are scheduled ahead of the target being reported (at most
+    PARALLEL_MAX_PENDING_ROLES at a time, like the roles of a collection)
+    and the roles of each collection in parallel; results are still
+    combined in target order. If
+    role_timings is given, stages are timed (including the ones outside of
+    roles, like "diff") and the processing time of every role is added to
+    it; the spans of every role are written to
+    the trace, if given.
+
+    Raises:
+        ValueError: On template errors
+    """
+    components = ComponentCache()
+    # Diffs are only read to display them (one at a time)
+    combined = ProcessingResults(
+        operations=[], errors=[], warnings=[], file_diffs=CompactFileDiffs()
+    )
+    target_sources: dict[Path, FileSource] = {}
+    # Scheduled role targets, in target order
+    role_futures: dict[Path, Future[ProcessingResults]] = {}
+    unscheduled = iter(targets if executor is not None else [])
+
+    def schedule(executor: Executor) -> None:
+        while len(role_futures) < PARALLEL_MAX_PENDING_ROLES:
+            target = next(unscheduled, None)
+            if target is None:
+                return
+            target_source = target_sources[target] = _target_source(target, source)
+            if detect_project_type(target, target_source) != "collection":
+                role_futures[target] = submit_role(
+                    executor,
+                    RoleProcessor(
+                        dry_run=dry_run,
+                        template_readme=template_readme,
+                        toc_bullet_style=toc_bullet_style,
+                        format_type=format_type,
+                        role_path=target,
+                        defaults_comments_nested=defaults_comments_nested,
+                        fail_fast=fail_fast,
+                        components=components,
+                        source=target_source,
+                        collect_timings=role_timings is not None,
+                        collect_spans=trace is not None,
+                    ),
+                    target,
+                    generate_readme=generate_readme,
+                    update_defaults=update_defaults,
+                )
+
+    # Stages outside of roles, like compressing diffs while merging
+    with (
+        _run_timings(combined.timings if role_timings is not None else None),
+        _cancel_on_exit(role_futures),
+    ):
+        for target in targets:
+            if executor is not None:
+                schedule(executor)
+            if len(targets) > 1:
+                console.print(f"\n[bold]{target}[/bold]")
+
+            target_source = target_sources.get(target) or _target_source(target, source)
+            if target in role_futures:
+                results = role_futures.pop(target).result()
+                _report_results("role", target, results, role_timings, trace)
+            elif detect_project_type(target, target_source) == "collection":
+                console.print(
+                    f"[blue]Detected collection layout[/blue] "
+                    f"(roles below {target / 'roles'})"
+                )
+                collection = CollectionProcessor(
+                    collection_path=target,
+                    dry_run=dry_run,
+                    template_readme=template_readme,
+                    toc_bullet_style=toc_bullet_style,
+                    format_type=format_type,
+                    defaults_comments_nested=defaults_comments_nested,
+                    fail_fast=fail_fast,
+                    components=components,
+                    selected_roles=selected_roles.get(target),
+                    source=target_source,
+                    executor=executor,
+                    collect_timings=role_timings is not None,
+                    collect_spans=trace is not None,
+                )
+                results = collection.process_collection(
+                    generate_readme=generate_readme,
+                    update_defaults=update_defaults,
+                    validate_collection_readme=validate_collection_readme,
+                    compact_diffs=True,
+                    progress=_collection_reporter(collection, role_timings, trace),
+                )
+            else:
+                results = RoleProcessor(
+                    dry_run=dry_run,
+                    template_readme=template_readme,
+                    toc_bullet_style=toc_bullet_style,
+                    format_type=format_type,
+                    role_path=target,
+                    defaults_comments_nested=defaults_comments_nested,
+                    fail_fast=fail_fast,
+                    components=components,
+                    source=target_source,
+                    collect_timings=role_timings is not None,
+                    collect_spans=trace is not None,
+                ).process_role(
+                    role_path=target,
+                    generate_readme=generate_readme,
+                    update_defaults=update_defaults,
+                )
+                _report_results("role", target, results, role_timings, trace)
+
+            combined.merge(results, prefix=f"{target}: " if len(targets) > 1 else "")
+            if fail_fast and (
+                combined.errors or (dry_run and combined.changed_files())
+            ):
+                break
+
+    return combined
+
+
+@contextlib.contextmanager
+def _cancel_on_exit(futures: dict[Path, Future[ProcessingResults]]) -> Iterator[None]:
+    """Cancel the futures not consumed when the block is left."""
+    try:
+        yield
+    finally:
+        for future in futures.values():
+            future.cancel()
+
+
+def _report_results(
+    record_type: str,
+    path: Path,
+    results: ProcessingResults,
+    role_timings: dict[Path, float] | None = None,
+    trace: TraceWriter | None = None,
+    collection: Path | None = None,
+) -> None:
+    """Report the results of a role or collection README when it is done.
+
+    Writes its JSON record (json-lines mode), adds the processing time of
+    roles to role_timings and writes (then drops) its spans to the trace,
+    if given.
+
+    Args:
+        record_type: "role" or "collection"
+        path: The role or collection path
+        results: The (unprefixed) results of the role or collection README
+        role_timings: Processing time per role path (see --timings)
+        trace: The trace file (see --trace)
+        collection: The collection path of collection roles
+    """
+    if role_timings is not None and record_type == "role":
+        role_timings[path] = sum(results.timings.values())
+    if trace is not None:
+        trace.write_spans(results.spans)
+        results.spans.clear()
+    if not console.json_lines:
+        return
+    record: dict[str, Any] = {"type": record_type, "path": str(path)}
+    if record_type == "role":
+        record["role"] = path.name
+        record["collection"] = None if collection is None else str(collection)
+    record.update(
+        operations=[
+            {"file": str(file_path), "action": action, "status": status}
+            for file_path, action, status in results.operations
+        ],
+        changed_files=[str(file_path) for file_path in results.changed_files()],
+        errors=results.errors,
+        warnings=results.warnings,
+        validation_warnings=results.validation_warnings,
+        validation_notices=results.validation_notices,
+        timings=_timings_record(results.timings),
+    )
+    console.record(record)
+
+
+def _collection_reporter(
+    collection: CollectionProcessor,
+    role_timings: dict[Path, float] | None = None,
+    trace: TraceWriter | None = None,
+) -> Callable[[str | None, ProcessingResults], None] | None:
+    """Return the progress callback reporting the roles of a collection."""
+    if not console.json_lines and role_timings is None and trace is None:
+        return None
+
+    def report(role_name: str | None, results: ProcessingResults) -> None:
+        if role_name is None:
+            _report_results(
+                "collection", collection.collection_path, results, trace=trace
+            )
+        else:
+            _report_results(
+                "role",
+                collection.selected_roles[role_name],
+                results,
+                role_timings,
+                trace,
+                collection=collection.collection_path,
+            )
+
+    return report
+
+
+def _role_timings(show_timings: bool) -> dict[Path, float] | None:
+    """Return the dict collecting role timings, if stages are timed.
+
+    They are timed with --timings and for the records of json-lines mode.
+    """
+    return {} if show_timings or console.json_lines else None
+
+
+@contextlib.contextmanager
+def _run_timings(timings: dict[str, float] | None) -> Iterator[None]:
+    """Add the stages run outside of roles (like "diff") to timings, if given.
+
+    The remaining time ("other") is left out: it is mostly spent waiting
+    for the roles, whose timings cover it.
+    """
+    if timings is None:
+        yield
+        return
+    run_timings: dict[str, float] = {}
+    with collect_timings(run_timings):
+        yield
+    run_timings.pop(OTHER_STAGE, None)
+    for name, seconds in run_timings.items():
+        timings[name] = timings.get(name, 0.0) + seconds
+
+
+def _open_trace(ctx: typer.Context, trace_path: Path | None) -> TraceWriter | None:
+    """Create the trace file of --trace; it is closed when the command ends."""
+    if trace_path is None:
+        return None
+    try:
+        trace = TraceWriter(trace_path)
+    except OSError as e:
+        raise typer.BadParameter(
+            f"Cannot write '{trace_path}': {e}", param_hint="--trace"
+        ) from e
+    ctx.call_on_close(trace.close)
+    return trace
+
+
+def _close_trace(trace: TraceWriter | None) -> None:
+    """Finish the trace file (if any) once all roles are done."""
+    if trace is not None:
+        trace.close()
+        console.print(f"\n[blue]Trace written to {trace.path}[/blue]")
+
+
+def _slowest_roles(role_timings: dict[Path, float]) -> list[tuple[Path, float]]:
+    """Return the TIMINGS_TOP_ROLES slowest roles with their times."""
+    return heapq.nlargest(
+        TIMINGS_TOP_ROLES, role_timings.items(), key=operator.itemgetter(1)
+    )
+
+
+def _timings_record(timings: dict[str, float]) -> dict[str, float]:
+    """Return stage timings for JSON records (seconds, rounded to 1 µs)."""
+    return {stage: round(seconds, 6) for stage, seconds in timings.items()}
+
+
+def _summary_record(
+    results: ProcessingResults,
+    passed: bool,
+    role_timings: dict[Path, float] | None = None,
+    elapsed: float | None = None,
+) -> dict[str, Any]:
+    """Return the summary record closing the JSON records of a run."""
+    record: dict[str, Any] = {
+        "type": "summary",
+        "status": "passed" if passed else "failed",
+        "operations": len(results.operations),
+        "changed_files": len(results.changed_files()),
+        "errors": len(results.errors),
+        "warnings": len(results.warnings),
+        "validation_warnings": len(results.validation_warnings),
+        "validation_notices": len(results.validation_notices),
+        "timings": _timings_record(results.timings),
+    }
+    if role_timings is not None:
+        record["slowest_roles"] = [
+            {"path": str(path), "seconds": round(seconds, 6)}
+            for path, seconds in _slowest_roles(role_timings)
+        ]
+    if elapsed is not None:
+        record["elapsed"] = round(elapsed, 6)
+    return record
+
+
+def _display_timings(
+    results: ProcessingResults,
+    role_timings: dict[Path, float] | None,
+    elapsed: float,
+) -> None:
+    """Display the time per stage and the slowest roles (see --timings).
+
+    Stage times are summed over all roles; with parallel jobs, they can
+    add up to more than the elapsed (wall clock) time.
+    """
+    if console.json_lines:
+        # Part of the summary record
+        return
+    total = sum(results.timings.values())
+    stages = sorted(results.timings.items(), key=operator.itemgetter(1), reverse=True)
+    slowest = _slowest_roles(role_timings or {})
+    if console.rich:
+        from rich.table import Table
+
+        console.print()
+        table = Table(title=f"Timings ({elapsed:.3f}s elapsed)")
+        table.add_column("Stage", style="cyan")
+        table.add_column("Seconds", justify="right")
+        table.add_column("Share", justify="right")
+        for stage, seconds in stages:
+            table.add_row(stage, f"{seconds:.3f}", f"{seconds / (total or 1):.1%}")
+        console.rich_console.print(table)
+        if slowest:
+            table = Table(title="Slowest roles")
+            table.add_column("Role", style="cyan")
+            table.add_column("Seconds", justify="right")
+            for path, seconds in slowest:
+                table.add_row(str(path), f"{seconds:.3f}")
+            console.rich_console.print(table)
+        return
+
+    # Plain lines, also in quiet mode (--timings asks for them)
+    console.write(f"Timings ({elapsed:.3f}s elapsed):")
+    for stage, seconds in stages:
+        console.write(f"  {stage}: {seconds:.3f}s ({seconds / (total or 1):.1%})")
+    if slowest:
+        console.write("Slowest roles:")
+        for path, seconds in slowest:
+            console.write(f"  {path}: {seconds:.3f}s")
+
+
+def _validate_role(
+    role_path: Path,
+    format_type: str,
+    validate_readme: bool,
+    validate_argument_specs: bool,
+    only_checks: list[str],
+    skip_checks: list[str],
+    fail_fast: bool,
+    components: ComponentCache,
+    source: FileSource,
+    verbose: bool,
+) -> tuple[bool, bool]:
+    """Validate a role and display the results.
+
+    Returns:
+        Tuple of (validation failed, warnings found)
+    """
+    try:
+        processor = RoleProcessor(
+            format_type=format_type,
+            role_path=role_path,
+            fail_fast=fail_fast,
+            components=components,
+            source=source,
+        )
+        role_data = processor.validate_role(
+            role_path,
+            validate_readme=validate_readme,
+            validate_argument_specs=validate_argument_specs,
+            only_checks=only_checks,
+            skip_checks=skip_checks,
+        )
+    except ValidationError as e:
+        LOGGER.error("Validation failed: %s", e)
+        _report_validation(role_path, errors=[str(e)])
+        return True, False
+    except Exception as e:
+        LOGGER.error("Unexpected error: %s", e)
+        if verbose:
+            import traceback
+
+            traceback.print_exc()
+        _report_validation(role_path, errors=[f"Unexpected error: {e}"])
+        return True, False
+
+    if console.json_lines:
+        _report_validation(role_path, role_data)
+    else:
+        _display_validation_results(role_data)
+    return False, bool(role_data.get("warnings"))
+
+
 def _validate_collection(
     collection_path: Path,
     format_type: str,
     validate_readme: bool,
     validate_argument_specs: bool,
-    strict: bool,
-) -> None:
-    """Validate all roles of a collection plus the collection README."""
+    only_checks: list[str],
+    skip_checks: list[str],
+    fail_fast: bool,
+    components: ComponentCache,
+    source: FileSource,
+    verbose: bool,
+    selected_roles: set[str] | None = None,
+) -> tuple[bool, bool]:
+    """Validate the (selected) roles of a collection plus its README.
+
+    Returns:
+        Tuple of (validation failed, warnings found)
+    """
     processor = CollectionProcessor(
-        collection_path=collection_path, format_type=format_type
+        collection_path=collection_path,
+        format_type=format_type,
+        fail_fast=fail_fast,
+        components=components,
+        selected_roles=selected_roles,
+        source=source,
     )
     console.print(
         f"[blue]Detected collection layout[/blue] "
@@ -355,18 +1610,41 @@ def _validate_collection(
     summary = processor.validate_collection(
         validate_readme=validate_readme,
         validate_argument_specs=validate_argument_specs,
+        only_checks=only_checks,
+        skip_checks=skip_checks,
     )
 
     has_warnings = bool(summary["warnings"])
+    if console.json_lines:
+        for role_name, role_data in summary["roles"].items():
+            _report_validation(
+                processor.roles[role_name], role_data, collection=collection_path
+            )
+            has_warnings = has_warnings or bool(role_data.get("warnings"))
+        console.record(
+            {
+                "type": "collection",
+                "path": str(collection_path),
+                "errors": summary["errors"],
+                "warnings": summary["warnings"],
+                "notices": summary["notices"],
+            }
+        )
+        return bool(summary["errors"]), has_warnings
+
     for role_name, role_data in summary["roles"].items():
-        console.print(f"\n[bold]Role: {role_name}[/bold]")
+        # Name the role of its warnings in quiet mode, too
+        console.print(
+            f"\n[bold]Role: {role_name}[/bold]",
+            problem=bool(role_data.get("warnings")),
+        )
         _display_validation_results(role_data)
         has_warnings = has_warnings or bool(role_data.get("warnings"))
 
     if summary["warnings"]:
-        console.print("\n[yellow]Collection warnings:[/yellow]")
+        console.print("\n[yellow]Collection warnings:[/yellow]", problem=True)
         for warning in summary["warnings"]:
-            console.print(f"  [yellow]⚠[/yellow] {warning}")
+            console.print(f"  [yellow]⚠[/yellow] {warning}", problem=True)
 
     if summary["notices"]:
         console.print("\n[blue]Collection notices:[/blue]")
@@ -374,104 +1652,274 @@ def _validate_collection(
             console.print(f"  [blue]ℹ[/blue] {notice}")
 
     if summary["errors"]:
-        console.print("\n[red]Errors:[/red]")
+        console.print("\n[red]Errors:[/red]", problem=True)
         for error in summary["errors"]:
-            console.print(f"  • {error}", style="red")
-        console.print("\n[red]❌ Validation failed[/red]")
-        console.print()  # Trailing newline
-        raise typer.Exit(1)
+            console.print(f"  • {error}", style="red", problem=True)
 
-    if strict and has_warnings:
-        console.print(
-            "\n[red]❌ Validation failed (--strict): "
-            "warnings are treated as errors[/red]"
-        )
-        console.print()  # Trailing newline
-        raise typer.Exit(1)
+    return bool(summary["errors"]), has_warnings
 
-    console.print("\n[green]✅ Validation passed![/green]")
-    console.print()  # Trailing newline
 
+def _display_results(
+    results: ProcessingResults,
+    dry_run: bool,
+    diff_options: _DiffOptions | None = None,
+) -> None:
+    """Display processing results in a rich table (or as plain lines)."""
 
-def _display_results(results: ProcessingResults, dry_run: bool) -> None:
-    """Display processing results in a rich table."""
+    diff_options = diff_options or _DiffOptions()
+    if console.json_lines:
+        # Results are reported as JSON records; only write a patch file
+        if dry_run and results.file_diffs and diff_options.output is not None:
+            _write_patch(results, diff_options.output)
+        return
 
     if not results.operations and not results.errors and not results.warnings:
         console.print("[yellow]No operations performed yet[/yellow]")
         return
 
+    if console.rich:
+        _display_operations_table(results, dry_run)
+    elif not console.quiet and results.operations:
+        console.write("Processing Results" + (" (DRY RUN)" if dry_run else "") + ":")
+        for file_path, action, status in results.operations:
+            console.write(f"  {_display_path(file_path)} | {action} | {status}")
+
+    # Display detailed diffs for dry-run mode (only patches when quiet)
+    if (
+        dry_run
+        and results.file_diffs
+        and (not console.quiet or diff_options.format == "patch")
+    ):
+        _display_diffs(results, diff_options)
+
+    # Display warnings
+    if results.warnings:
+        console.print("\n[yellow]Warnings:[/yellow]", problem=True)
+        for warning in results.warnings:
+            console.print(f"  • {warning}", style="yellow", problem=True)
+
+    # Display errors
+    if results.errors:
+        console.print("\n[red]Errors:[/red]", problem=True)
+        for error in results.errors:
+            console.print(f"  • {error}", style="red", problem=True)
+
+
+def _display_operations_table(results: ProcessingResults, dry_run: bool) -> None:
+    """Display the operations of processing results in a rich table."""
+    from rich.table import Table
+
     table = Table(title="Processing Results" + (" (DRY RUN)" if dry_run else ""))
     table.add_column("File", style="cyan")
     table.add_column("Action", style="magenta")
     table.add_column("Status", style="green")
 
     for file_path, action, status in results.operations:
-        # Show relative path for readability
-        display_path = str(file_path.name) if file_path.name else str(file_path)
-        table.add_row(display_path, action, status)
+        table.add_row(_display_path(file_path), action, status)
 
     if table.rows:
-        console.print(table)
+        console.rich_console.print(table)
 
-    # Display detailed diffs for dry-run mode
-    if dry_run and results.file_diffs:
-        console.print(
-            "\n[bold]Modifications that would be made without --dry-run "
-            "([yellow]nothing was changed yet[/yellow]):[/bold]"
-        )
-        for file_path, old_content, new_content in results.file_diffs:
-            _display_file_diff(file_path, old_content, new_content)
 
-    # Display warnings
-    if results.warnings:
-        console.print("\n[yellow]Warnings:[/yellow]")
-        for warning in results.warnings:
-            console.print(f"  • {warning}", style="yellow")
+def _display_path(file_path: Path) -> str:
+    """Return the path of a file as displayed in the results."""
+    # Show relative path for readability
+    return str(file_path.name) if file_path.name else str(file_path)
 
-    # Display errors
-    if results.errors:
-        console.print("\n[red]Errors:[/red]")
-        for error in results.errors:
-            console.print(f"  • {error}", style="red")
 
+@timed("diff")
+def _display_diffs(results: ProcessingResults, diff_options: _DiffOptions) -> None:
+    """Display the changes of a dry run in the selected format."""
+    if diff_options.format == "patch":
+        _write_patch(results, diff_options.output)
+        return
+
+    console.print(
+        "\n[bold]Modifications that would be made without --dry-run "
+        "([yellow]nothing was changed yet[/yellow]):[/bold]"
+    )
+    if diff_options.format == "stat":
+        _display_diff_stat(results)
+        return
+    for file_path, old_content, new_content in results.file_diffs:
+        _display_file_diff(file_path, old_content, new_content, diff_options.max_lines)
+
+
+def _display_diff_stat(results: ProcessingResults) -> None:
+    """Display the numbers of added and removed lines per changed file."""
+    total_added = total_removed = changed = 0
+    for file_path, old_content, new_content in results.file_diffs:
+        if old_content == new_content:
+            continue
+        added, removed = diff_stat(old_content, new_content)
+        total_added += added
+        total_removed += removed
+        changed += 1
+        if not console.rich:
+            console.write(f"  {file_path} | +{added} -{removed}")
+            continue
+        from rich.text import Text
+
+        line = Text(f"  {file_path} | ")
+        line.append(f"+{added}", style="green")
+        line.append(" ")
+        line.append(f"-{removed}", style="red")
+        console.rich_console.print(line)
+    console.print(
+        f"  {changed} file(s) changed, {total_added} insertion(s)(+), "
+        f"{total_removed} deletion(s)(-)"
+    )
 
-def _display_file_diff(file_path: Path, old_content: str, new_content: str) -> None:
-    """Display a unified diff for a file."""
-    console.print(f"\n[bold cyan]--- {file_path}[/bold cyan]")
 
-    # Generate unified diff
-    old_lines = old_content.splitlines(keepends=True)
-    new_lines = new_content.splitlines(keepends=True)
+@timed("diff")
+def _write_patch(results: ProcessingResults, output: Path | None) -> None:
+    """Write the changes as a plain unified patch (no Rich formatting).
 
-    diff = difflib.unified_diff(
-        old_lines,
-        new_lines,
-        fromfile=f"a/{file_path.name}",
-        tofile=f"b/{file_path.name}",
-        lineterm="",
-    )
+    Paths below the current directory are written relative to it, with
+    the usual "a/" and "b/" prefixes. Created files are diffed against
+    /dev/null, as git and patch expect.
+    """
+    target = sys.stdout
+    patch_file = None
+    if output is not None:
+        try:
+            patch_file = output.open("w", encoding="utf-8", newline="\n")
+        except OSError as e:
+            raise typer.BadParameter(
+                f"Cannot write '{output}': {e}", param_hint="--diff-output"
+            ) from e
+        target = patch_file
+    created = {
+        file_path
+        for file_path, action, _status in results.operations
+        if action == "Created"
+    }
+    try:
+        for file_path, old_content, new_content in results.file_diffs:
+            name = _patch_path(file_path)
+            if name.startswith("/"):
+                fromfile, tofile = name, name
+            else:
+                fromfile, tofile = f"a/{name}", f"b/{name}"
+            if file_path in created:
+                fromfile = "/dev/null"
+            target.writelines(unified_diff(old_content, new_content, fromfile, tofile))
+        target.flush()
+    finally:
+        if patch_file is not None:
+            patch_file.close()
+    if output is not None:
+        console.print(f"\n[blue]Patch written to {output}[/blue]")
+
+
+def _patch_path(file_path: Path) -> str:
+    """Return the path of a file as written into patches."""
+    absolute = file_path.absolute()
+    try:
+        return absolute.relative_to(Path.cwd()).as_posix()
+    except ValueError:
+        return absolute.as_posix()
 
-    diff_lines = list(diff)
+
+def _display_file_diff(
+    file_path: Path, old_content: str, new_content: str, max_lines: int = 0
+) -> None:
+    """Display a unified diff for a file.
+
+    Args:
+        max_lines: Show at most this many lines of the diff (0: all)
+    """
+    console.print(f"\n[bold cyan]--- {file_path}[/bold cyan]")
+
+    diff_lines = list(
+        unified_diff(
+            old_content,
+            new_content,
+            fromfile=f"a/{file_path.name}",
+            tofile=f"b/{file_path.name}",
+        )
+    )
     if not diff_lines:
         console.print("[dim]No changes detected[/dim]")
         return
 
     # Skip the first two lines (file headers) as we show our own
-    for line in diff_lines[2:]:
-        line = line.rstrip()
-        if line.startswith("+") and not line.startswith("+++"):
-            console.print(f"[green]{line}[/green]")
-        elif line.startswith("-") and not line.startswith("---"):
-            console.print(f"[red]{line}[/red]")
+    body = diff_lines[2:]
+    omitted = 0
+    if max_lines and len(body) > max_lines:
+        omitted = len(body) - max_lines
+        body = body[:max_lines]
+
+    if not console.rich:
+        # File contents are written as they are
+        for line in body:
+            console.write(line.rstrip())
+        if omitted:
+            console.write(
+                f"... {omitted} more line(s) of this diff not shown (--diff-max-lines)"
+            )
+        return
+
+    # One Text for all lines: file contents are never parsed as markup,
+    # and printing is fast for large diffs
+    from rich.text import Text
+
+    text = Text()
+    for line in body:
+        if line.startswith("+"):
+            style = "green"
+        elif line.startswith("-"):
+            style = "red"
         elif line.startswith("@@"):
-            console.print(f"[bold blue]{line}[/bold blue]")
+            style = "bold blue"
         else:
-            console.print(line)
+            style = ""
+        text.append(line.rstrip() + "\n", style=style)
+    text.rstrip()
+    console.rich_console.print(text)
+    if omitted:
+        console.print(
+            f"[dim]... {omitted} more line(s) of this diff not shown "
+            "(--diff-max-lines)[/dim]"
+        )
+
+
+def _report_validation(
+    role_path: Path,
+    role_data: dict[str, Any] | None = None,
+    errors: list[str] | None = None,
+    collection: Path | None = None,
+) -> None:
+    """Write the JSON record of a role's validation (json-lines mode)."""
+    if not console.json_lines:
+        return
+    role_data = role_data or {}
+    console.record(
+        {
+            "type": "role",
+            "path": str(role_path),
+            "role": role_data.get("role_name", role_path.name),
+            "collection": None if collection is None else str(collection),
+            "errors": errors or [],
+            "warnings": role_data.get("warnings", []),
+            "notices": role_data.get("notices", []),
+            "timings": _timings_record(
+                {
+                    f"check:{name}": seconds
+                    for name, seconds in role_data.get("check_timings", {}).items()
+                }
+            ),
+        }
+    )
 
 
 def _display_validation_results(role_data: dict[str, Any]) -> None:
     """Display validation results."""
 
+    if console.quiet:
+        _display_validation_problems(role_data)
+        return
+
     specs = role_data["specs"]
     spec_file = role_data["spec_file"]
     role_name = role_data["role_name"]
@@ -496,11 +1944,7 @@ def _display_validation_results(role_data: dict[str, Any]) -> None:
                     var_type = var_spec.get("type", "str")
                     console.print(f"  • {var_name} ({var_type}, {required})")
 
-    # Show warnings
-    if role_data.get("warnings"):
-        console.print("\n[yellow]Warnings:[/yellow]")
-        for warning in role_data["warnings"]:
-            console.print(f"  [yellow]⚠[/yellow] {warning}")
+    _display_validation_problems(role_data)
 
     # Show notices
     if role_data.get("notices"):
@@ -509,5 +1953,13 @@ def _display_validation_results(role_data: dict[str, Any]) -> None:
             console.print(f"  [blue]ℹ[/blue] {notice}")
 
 
+def _display_validation_problems(role_data: dict[str, Any]) -> None:
+    """Display the warnings of validation results."""
+    if role_data.get("warnings"):
+        console.print("\n[yellow]Warnings:[/yellow]", problem=True)
+        for warning in role_data["warnings"]:
+            console.print(f"  [yellow]⚠[/yellow] {warning}", problem=True)
+
+
 if __name__ == "__main__":
     app()
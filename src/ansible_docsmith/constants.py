@@ -23,11 +23,96 @@ MARKER_COMMENT_RST_END = ""
 # Default maximum length for variable description shown in tables
 TABLE_DESCRIPTION_MAX_LENGTH = 250
 
+# Maximum nesting depth of nested options ("dict attributes") that get a
+# section (and therefore an anchor) in the built-in README templates
+README_MAX_NESTED_DEPTH = 3
+
 # Maximum nesting depth for documenting nested options ("dict attributes")
 # in entry-point file comments. Matches the depth limit of the built-in
 # README templates.
 COMMENT_MAX_NESTED_DEPTH = 3
 
+# Default limits applied when parsing argument specs. They protect against
+# generated or malformed specs (e.g. YAML alias bombs) that would
+# otherwise exhaust memory or time. Specs exceeding them fail with a
+# ParseError. Can be changed per parser (see parser.SpecLimits).
+SPEC_MAX_NESTED_DEPTH = 50
+SPEC_MAX_OPTIONS = 10_000
+SPEC_MAX_FILE_SIZE = 5 * 1024 * 1024  # bytes
+
+# Directories never walked when discovering roles and collections
+# recursively (VCS metadata, dependencies, caches and virtualenvs; any
+# other virtualenv is recognized by its pyvenv.cfg)
+DISCOVERY_PRUNED_DIRS = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        ".mypy_cache",
+        ".nox",
+        ".pytest_cache",
+        ".ruff_cache",
+        ".tox",
+        ".venv",
+        "__pycache__",
+        "node_modules",
+        "venv",
+    }
+)
+
+# Files that may pin the DocSmith version. With --since, a changed pin
+# (compared to the given git ref) re-processes all roles, as the new
+# version may render them differently.
+GIT_DEPENDENCY_PIN_FILES = (
+    ".pre-commit-config.yaml",
+    "Pipfile.lock",
+    "poetry.lock",
+    "pyproject.toml",
+    "requirements*.txt",
+    "uv.lock",
+)
+
+# File name suffixes of collection tarballs (as built by ``ansible-galaxy
+# collection build``), processed without extraction
+TARBALL_SUFFIXES = (".tar.gz", ".tgz", ".tar")
+
+# Tarball members read into memory (relative to the collection root; "*"
+# matches a single path component). Other members are only listed.
+TARBALL_READ_MEMBERS = (
+    "galaxy.yml",
+    "README.*",
+    "roles/*/README.*",
+    "roles/*/meta/argument_specs.*",
+    "roles/*/defaults/*",
+)
+
+# Executor types for processing roles in parallel ("auto": threads on
+# free-threaded Python builds without a GIL, processes otherwise)
+EXECUTOR_TYPES = ("auto", "thread", "process")
+
+# Roles scheduled on an executor ahead of the caller consuming their
+# results at most; bounds the memory held by finished roles' results
+PARALLEL_MAX_PENDING_ROLES = 64
+
+# Console output modes of the CLI commands: formatted with Rich, plain
+# lines (e.g. for CI logs), only problems, or JSON records (one per line)
+OUTPUT_MODES = ("rich", "plain", "quiet", "json-lines")
+
+# Number of slowest roles listed by --timings (and in its JSON summary)
+TIMINGS_TOP_ROLES = 10
+
+# Output formats of the diffs of dry runs: colored unified diffs, per-file
+# line counts, or a plain patch
+DIFF_FORMATS = ("full", "stat", "patch")
+
+# Files with at least this many lines (old plus new) are compared with a
+# near-linear algorithm instead of difflib's, which can take quadratic
+# time on large rewrites. Line ranges without lines unique to both sides
+# are still compared with difflib if the product of their lengths is at
+# most DIFF_FALLBACK_MAX_COMPARISONS, and reported as replaced otherwise.
+DIFF_FAST_MIN_LINES = 2000
+DIFF_FALLBACK_MAX_COMPARISONS = 40_000
+
 # Valid keys in role argument specs, used to warn about unknown (likely
 # misspelled) keys. Based on the role argument spec documentation schema
 # maintained by the Ansible community (antsibull-docs, role.py /
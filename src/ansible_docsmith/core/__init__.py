@@ -1,14 +1,17 @@
 """Core functionality for ansible-docsmith."""
 
+from .aio import process_collection_async, process_role_async
 from .defaults_comments import DefaultsCommentGenerator
 from .exceptions import (
     AnsibleDocSmithError,
     FileOperationError,
+    GitError,
     ParseError,
     ProcessingError,
     TemplateError,
     ValidationError,
 )
+from .memory import RenderedRole, render_role
 from .parser import ArgumentSpecParser
 from .processor import RoleProcessor
 
@@ -17,9 +20,14 @@ __all__ = [
     "ArgumentSpecParser",
     "DefaultsCommentGenerator",
     "FileOperationError",
+    "GitError",
     "ParseError",
     "ProcessingError",
+    "RenderedRole",
     "RoleProcessor",
     "TemplateError",
     "ValidationError",
+    "process_collection_async",
+    "process_role_async",
+    "render_role",
 ]
@@ -0,0 +1,380 @@
+"""asyncio variants of the role and collection processing entry points.
+
+The files of a role are read concurrently (in asyncio's default thread
+pool) into a MemorySource; parsing and rendering then run in an executor
+supplied by the caller (a thread or process pool), so neither blocks the
+event loop. Changed files are written back concurrently once their role
+is done.
+
+Cancelling the awaiting task cancels all roles not yet done; roles
+already written stay written, like when interrupting the CLI.
+"""
+
+import asyncio
+import functools
+import os
+from collections.abc import Callable, Collection
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TypeVar
+
+from .collection import CollectionProcessor, find_collection_roles
+from .parser import SpecLimits
+from .processor import ComponentCache, ProcessingResults, RoleProcessor
+from .sources import MemorySource
+
+T = TypeVar("T")
+
+# Argument spec files of a role (see has_argument_specs())
+_ROLE_SPEC_FILES = ("meta/argument_specs.yml", "meta/argument_specs.yaml")
+
+# Called with the role name and its results whenever a role is done
+ProgressCallback = Callable[[str, ProcessingResults], None]
+
+
+@dataclass(frozen=True)
+class _Options:
+    """Processing options, passed to the executor (picklable)."""
+
+    template_readme: Path | None
+    toc_bullet_style: str | None
+    format_type: str
+    defaults_comments_nested: bool
+    spec_limits: SpecLimits | None
+    generate_readme: bool
+    update_defaults: bool
+
+
+async def process_role_async(
+    role_path: Path,
+    dry_run: bool = False,
+    template_readme: Path | None = None,
+    toc_bullet_style: str | None = None,
+    format_type: str = "auto",
+    defaults_comments_nested: bool = True,
+    spec_limits: SpecLimits | None = None,
+    generate_readme: bool = True,
+    update_defaults: bool = True,
+    executor: Executor | None = None,
+) -> ProcessingResults:
+    """Process a role like RoleProcessor.process_role(), without blocking.
+
+    Args:
+        role_path: Path to the role directory
+        executor: Executor for parsing and rendering; asyncio's default
+            executor if None
+        (others): See RoleProcessor
+
+    Returns:
+        The results; file_diffs are only set in dry-run mode, like for
+        RoleProcessor. Files that cannot be read are reported as errors,
+        and the role is not processed then.
+    """
+    options = _Options(
+        template_readme=template_readme,
+        toc_bullet_style=toc_bullet_style,
+        format_type=format_type,
+        defaults_comments_nested=defaults_comments_nested,
+        spec_limits=spec_limits,
+        generate_readme=generate_readme,
+        update_defaults=update_defaults,
+    )
+    _files, results = await _process_role(role_path, options, executor)
+    if not dry_run:
+        await _write_changes(results)
+    return results
+
+
+async def process_collection_async(
+    collection_path: Path,
+    dry_run: bool = False,
+    template_readme: Path | None = None,
+    toc_bullet_style: str | None = None,
+    format_type: str = "auto",
+    defaults_comments_nested: bool = True,
+    spec_limits: SpecLimits | None = None,
+    selected_roles: Collection[str] | None = None,
+    generate_readme: bool = True,
+    update_defaults: bool = True,
+    executor: Executor | None = None,
+    max_concurrent_roles: int = 8,
+    progress: ProgressCallback | None = None,
+) -> ProcessingResults:
+    """Process a collection like CollectionProcessor.process_collection().
+
+    Roles are processed concurrently (at most max_concurrent_roles at a
+    time); the collection README is updated once all roles are done.
+
+    Args:
+        collection_path: Path to the collection directory
+        selected_roles: Names of the roles to process; all if None
+        executor: Executor for parsing and rendering; asyncio's default
+            executor if None
+        max_concurrent_roles: Maximum number of roles read, rendered or
+            written at the same time
+        progress: Called (in the event loop) whenever a role is done, in
+            order of completion
+        (others): See CollectionProcessor
+
+    Returns:
+        The combined results, with the roles in collection order. Files
+        that cannot be read and selected roles the collection does not
+        have are reported as errors.
+    """
+    if max_concurrent_roles < 1:
+        raise ValueError("max_concurrent_roles must be at least 1")
+    options = _Options(
+        template_readme=template_readme,
+        toc_bullet_style=toc_bullet_style,
+        format_type="auto",
+        defaults_comments_nested=defaults_comments_nested,
+        spec_limits=spec_limits,
+        generate_readme=generate_readme,
+        update_defaults=update_defaults,
+    )
+
+    all_roles = await asyncio.to_thread(find_collection_roles, collection_path)
+    roles = (
+        all_roles
+        if selected_roles is None
+        else {name: path for name, path in all_roles.items() if name in selected_roles}
+    )
+    combined = ProcessingResults(operations=[], errors=[], warnings=[], file_diffs=[])
+    if selected_roles is not None:
+        combined.errors.extend(
+            f"Role '{name}' not found in {collection_path}"
+            for name in sorted(set(selected_roles) - all_roles.keys())
+        )
+    semaphore = asyncio.Semaphore(max_concurrent_roles)
+    role_results: dict[str, ProcessingResults] = {}
+    readme_names: dict[str, str] = {}
+    # Collection-relative path -> content of the files read
+    collection_files: dict[str, str] = {}
+
+    async def process(role_name: str, role_path: Path) -> None:
+        async with semaphore:
+            files, results = await _process_role(role_path, options, executor)
+            if not dry_run:
+                await _write_changes(results)
+        role_results[role_name] = results
+        # Role READMEs are Markdown unless there is a README.rst (see
+        # detect_format_from_role())
+        readme_names[role_name] = "README.rst" if "README.rst" in files else "README.md"
+        _add_files(collection_files, collection_path, role_path, files)
+        if progress is not None:
+            progress(role_name, results)
+
+    async with asyncio.TaskGroup() as group:
+        for role_name, role_path in roles.items():
+            group.create_task(process(role_name, role_path))
+
+    for role_name in roles:
+        combined.merge(role_results[role_name], prefix=f"Role '{role_name}': ")
+
+    if generate_readme:
+        # The collection README lists all roles and embeds the
+        # documentation of the processed ones
+        read_errors: list[str] = []
+        collection_files.update(
+            await _read_files(collection_path, ["README.md", "README.rst"], read_errors)
+        )
+        for role_name, role_path in all_roles.items():
+            if role_name not in roles:
+                files = await _read_files(
+                    role_path, list(_ROLE_SPEC_FILES), read_errors
+                )
+                _add_files(collection_files, collection_path, role_path, files)
+        if read_errors:
+            # Not updated from incomplete files
+            combined.errors.extend(read_errors)
+            return combined
+
+        role_readmes = {
+            role_name: (
+                roles[role_name] / readme_names[role_name],
+                content,
+            )
+            for role_name in roles
+            if (content := role_results[role_name].readme_content) is not None
+        }
+        readme_results = await _run(
+            executor,
+            _process_collection_readme_files,
+            collection_path,
+            collection_files,
+            role_readmes,
+            options,
+            format_type,
+        )
+        if not dry_run:
+            await _write_changes(readme_results)
+        combined.merge(readme_results)
+
+    return combined
+
+
+async def _run(executor: Executor | None, func: Callable[..., T], *args: object) -> T:
+    """Run a function in the executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(func, *args))
+
+
+async def _process_role(
+    role_path: Path, options: _Options, executor: Executor | None
+) -> tuple[dict[str, str], ProcessingResults]:
+    """Read the files of a role and process it in the executor.
+
+    Returns:
+        The files read and the results; if a file cannot be read, the
+        role is not processed (which could overwrite the file) and the
+        results hold the read errors
+    """
+    errors: list[str] = []
+    files = await _read_role_files(role_path, errors)
+    if errors:
+        return files, ProcessingResults(
+            operations=[], errors=errors, warnings=[], file_diffs=[]
+        )
+    results = await _run(executor, _process_role_files, role_path, files, options)
+    return files, results
+
+
+def _process_role_files(
+    role_path: Path, files: dict[str, str], options: _Options
+) -> ProcessingResults:
+    """Process a role given as file contents (runs in the executor)."""
+    return RoleProcessor(
+        template_readme=options.template_readme,
+        toc_bullet_style=options.toc_bullet_style,
+        format_type=options.format_type,
+        role_path=role_path,
+        defaults_comments_nested=options.defaults_comments_nested,
+        spec_limits=options.spec_limits,
+        components=ComponentCache.shared(),
+        source=MemorySource(role_path, files),
+    ).process_role(
+        role_path,
+        generate_readme=options.generate_readme,
+        update_defaults=options.update_defaults,
+    )
+
+
+def _process_collection_readme_files(
+    collection_path: Path,
+    files: dict[str, str],
+    role_readmes: dict[str, tuple[Path, str]],
+    options: _Options,
+    format_type: str,
+) -> ProcessingResults:
+    """Update the README of a collection given as file contents."""
+    results = ProcessingResults(operations=[], errors=[], warnings=[], file_diffs=[])
+    CollectionProcessor(
+        collection_path,
+        template_readme=options.template_readme,
+        toc_bullet_style=options.toc_bullet_style,
+        format_type=format_type,
+        defaults_comments_nested=options.defaults_comments_nested,
+        spec_limits=options.spec_limits,
+        components=ComponentCache.shared(),
+        source=MemorySource(collection_path, files),
+    )._process_collection_readme(role_readmes, results)
+    return results
+
+
+def _add_files(
+    collection_files: dict[str, str],
+    collection_path: Path,
+    role_path: Path,
+    files: dict[str, str],
+) -> None:
+    """Add the files of a role to the files of its collection."""
+    prefix = role_path.relative_to(collection_path).as_posix()
+    collection_files.update(
+        (f"{prefix}/{name}", content) for name, content in files.items()
+    )
+
+
+async def _read_role_files(role_path: Path, errors: list[str]) -> dict[str, str]:
+    """Read the files DocSmith needs of a role, concurrently.
+
+    Args:
+        role_path: Path to the role directory
+        errors: List to add read errors to
+
+    Returns:
+        Role-relative POSIX path -> content
+    """
+    try:
+        defaults_names = await asyncio.to_thread(_list_files, role_path / "defaults")
+    except OSError as e:
+        errors.append(f"Cannot read {role_path / 'defaults'}: {e}")
+        defaults_names = []
+    names = [
+        "README.md",
+        "README.rst",
+        *_ROLE_SPEC_FILES,
+        *(f"defaults/{name}" for name in defaults_names),
+    ]
+    return await _read_files(role_path, names, errors)
+
+
+def _list_files(directory: Path) -> list[str]:
+    """Return the names of the files in a directory (none if missing)."""
+    try:
+        with os.scandir(directory) as entries:
+            return sorted(entry.name for entry in entries if entry.is_file())
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+
+async def _read_files(
+    root: Path, names: list[str], errors: list[str]
+) -> dict[str, str]:
+    """Read files below a directory concurrently, skipping missing ones.
+
+    Args:
+        root: Directory the names are relative to
+        names: Root-relative POSIX paths
+        errors: List to add the errors of files that cannot be read (or
+            decoded) to; they are skipped, too
+    """
+
+    def read(name: str) -> str | None:
+        try:
+            return (root / name).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        except (OSError, UnicodeDecodeError) as e:
+            errors.append(f"Cannot read {root / name}: {e}")
+            return None
+
+    contents = await asyncio.gather(*(asyncio.to_thread(read, name) for name in names))
+    return {
+        name: content
+        for name, content in zip(names, contents, strict=True)
+        if content is not None
+    }
+
+
+async def _write_changes(results: ProcessingResults) -> None:
+    """Write the changed files of a (dry) run concurrently.
+
+    The diffs are dropped afterwards, as RoleProcessor only reports them
+    in dry-run mode. Write failures are added to the errors.
+    """
+
+    def write(path: Path, content: str) -> None:
+        try:
+            path.write_text(content, encoding="utf-8", newline="\n")
+        except OSError as e:
+            results.errors.append(f"Cannot write {path}: {e}")
+
+    await asyncio.gather(
+        *(
+            asyncio.to_thread(write, path, new_content)
+            for path, old_content, new_content in results.file_diffs
+            if new_content != old_content
+        )
+    )
+    results.file_diffs.clear()
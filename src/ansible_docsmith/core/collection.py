@@ -14,38 +14,62 @@ Role-named sections are strictly opt-in: roles without markers in the
 collection README are simply not referenced there.
 """
 
+import contextlib
+import itertools
+from collections.abc import Callable, Collection, Iterator
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
 from pathlib import Path
 from typing import Any
 
-from .processor import ProcessingResults, RoleProcessor, detect_format_from_role
-from .readme_updater import MARKER_PATTERN, ReadmeUpdater, marker_comment
+from ..constants import PARALLEL_MAX_PENDING_ROLES
+from .diffs import CompactFileDiffs
+from .executors import submit_role
+from .parser import SpecLimits
+from .processor import (
+    ComponentCache,
+    ProcessingResults,
+    RoleProcessor,
+    detect_format_from_role,
+)
+from .readme_updater import MARKER_PATTERN, marker_comment
+from .sources import FILE_SYSTEM, FileSource
+from .timing import collect_timings, timed
 from .toc import create_toc_generator
 
 
-def find_collection_roles(collection_path: Path) -> dict[str, Path]:
+def has_argument_specs(role_path: Path, source: FileSource | None = None) -> bool:
+    """Return whether the directory has a meta/argument_specs.{yml,yaml}."""
+    source = source or FILE_SYSTEM
+    meta_dir = role_path / "meta"
+    return any(
+        source.is_file(meta_dir / f"argument_specs.{ext}") for ext in ("yml", "yaml")
+    )
+
+
+def find_collection_roles(
+    collection_path: Path, source: FileSource | None = None
+) -> dict[str, Path]:
     """Discover roles with argument specs, sorted by role name."""
+    source = source or FILE_SYSTEM
     roles: dict[str, Path] = {}
     roles_dir = collection_path / "roles"
-    if not roles_dir.is_dir():
+    try:
+        names = source.list_dirs(roles_dir)
+    except FileNotFoundError:
         return roles
 
-    for role_dir in sorted(roles_dir.iterdir()):
-        if not role_dir.is_dir():
-            continue
-        for ext in ("yml", "yaml"):
-            if (role_dir / "meta" / f"argument_specs.{ext}").exists():
-                roles[role_dir.name] = role_dir
-                break
+    for name in names:
+        if has_argument_specs(roles_dir / name, source):
+            roles[name] = roles_dir / name
 
     return roles
 
 
-def detect_project_type(path: Path) -> str | None:
+def detect_project_type(path: Path, source: FileSource | None = None) -> str | None:
     """Return "role", "collection" or None for the given path."""
-    for ext in ("yml", "yaml"):
-        if (path / "meta" / f"argument_specs.{ext}").exists():
-            return "role"
-    if find_collection_roles(path):
+    if has_argument_specs(path, source):
+        return "role"
+    if find_collection_roles(path, source):
         return "collection"
     return None
 
@@ -61,18 +85,52 @@ class CollectionProcessor:
         toc_bullet_style: str | None = None,
         format_type: str = "auto",
         defaults_comments_nested: bool = True,
+        spec_limits: SpecLimits | None = None,
+        fail_fast: bool = False,
+        components: ComponentCache | None = None,
+        selected_roles: Collection[str] | None = None,
+        source: FileSource | None = None,
+        executor: Executor | None = None,
+        collect_timings: bool = False,
+        collect_spans: bool = False,
     ):
         self.collection_path = collection_path
-        self.dry_run = dry_run
+        # Source of all files; read-only sources always run in dry-run mode
+        self.source = source or FILE_SYSTEM
+        # Parsers and generators shared by all role processors
+        self.components = components or ComponentCache()
+        self.dry_run = dry_run or self.source.read_only
         self.template_readme = template_readme
         self.toc_bullet_style = toc_bullet_style
         self.defaults_comments_nested = defaults_comments_nested
-        self.roles = find_collection_roles(collection_path)
+        self.spec_limits = spec_limits
+        # Stop scheduling roles once the outcome is known (see
+        # RoleProcessor.outcome_known())
+        self.fail_fast = fail_fast
+        # Processes the roles in parallel if set (see executors.py); the
+        # caller owns (and shuts down) the executor
+        self.executor = executor
+        # Collect the time spent per stage (and spans) of every role and
+        # the collection README (see RoleProcessor)
+        self.collect_timings = collect_timings or collect_spans
+        self.collect_spans = collect_spans
+        self.roles = find_collection_roles(collection_path, self.source)
+        # Roles to process or validate (e.g. the ones with changed files);
+        # the collection README's sections of other roles are left as is
+        self.selected_roles = (
+            self.roles
+            if selected_roles is None
+            else {
+                name: path
+                for name, path in self.roles.items()
+                if name in selected_roles
+            }
+        )
 
         # Format of the collection README (role READMEs are detected
         # per role, independently)
         if format_type.lower() == "auto":
-            self.format_type = detect_format_from_role(collection_path)
+            self.format_type = detect_format_from_role(collection_path, self.source)
         else:
             self.format_type = format_type.lower()
 
@@ -84,48 +142,269 @@ class CollectionProcessor:
             format_type="auto",
             role_path=role_path,
             defaults_comments_nested=self.defaults_comments_nested,
+            spec_limits=self.spec_limits,
+            fail_fast=self.fail_fast,
+            components=self.components,
+            source=self.source,
+            collect_timings=self.collect_timings,
+            collect_spans=self.collect_spans,
         )
 
     def process_collection(
         self,
         generate_readme: bool = True,
         update_defaults: bool = True,
+        validate_collection_readme: bool = False,
+        compact_diffs: bool = False,
+        progress: Callable[[str | None, ProcessingResults], None] | None = None,
     ) -> ProcessingResults:
-        """Process all roles, then the collection README."""
+        """Process all (selected) roles, then the collection README.
+
+        All results are combined (in collection order) and returned at
+        once; see iter_collection() to handle them role by role instead.
+
+        Args:
+            generate_readme: Generate/update the README files
+            update_defaults: Add comments to the entry-point files
+            validate_collection_readme: Also check the markers of the
+                collection README like validate_collection() does; errors
+                are added to "errors", warnings and notices to the
+                "validation_*" lists
+            compact_diffs: Store the file diffs of dry runs compressed
+                (see CompactFileDiffs) as soon as each role is done
+            progress: Called with the role name and its results (messages
+                not prefixed) whenever a role is done, in order of
+                completion with an executor; finally with None and the
+                results of the collection README. In fail-fast mode, it
+                can also be called for roles after the first failing one
+                (in collection order) that finished before it; like in
+                a sequential run, they are not part of the results.
+        """
         combined = ProcessingResults(
-            operations=[], errors=[], warnings=[], file_diffs=[]
+            operations=[],
+            errors=[],
+            warnings=[],
+            file_diffs=CompactFileDiffs() if compact_diffs else [],
         )
-        # role name -> (role README path, its content after this run)
-        role_readmes: dict[str, tuple[Path, str]] = {}
+        # Results are merged in collection order (the collection README
+        # last); done holds the ones done ahead of a role before them
+        positions = {name: index for index, name in enumerate(self.selected_roles)}
+        done: dict[int, tuple[str | None, ProcessingResults]] = {}
+        next_position = 0
+        stopped = False
+        for role_name, results in self.iter_collection(
+            generate_readme=generate_readme,
+            update_defaults=update_defaults,
+            validate_collection_readme=validate_collection_readme,
+            in_order=progress is None,
+        ):
+            if progress is not None:
+                progress(role_name, results)
+            position = len(positions) if role_name is None else positions[role_name]
+            done[position] = (role_name, results)
+            while next_position in done and not stopped:
+                merged_name, merged_results = done.pop(next_position)
+                self._merge_role_results(combined, merged_name, merged_results)
+                next_position += 1
+                # Fail-fast: roles after the first failing one (in collection
+                # order) are dropped, like a sequential run skips them
+                stopped = merged_name is not None and self._outcome_known(
+                    merged_results
+                )
+        return combined
 
-        for role_name, role_path in self.roles.items():
-            processor = self._role_processor(role_path, self.dry_run)
-            results = processor.process_role(
-                role_path,
-                generate_readme=generate_readme,
-                update_defaults=update_defaults,
-            )
+    def _outcome_known(self, results: ProcessingResults) -> bool:
+        """Whether fail-fast mode skips the roles after these results.
 
-            combined.operations.extend(results.operations)
-            combined.file_diffs.extend(results.file_diffs)
-            combined.errors.extend(
-                f"Role '{role_name}': {error}" for error in results.errors
-            )
-            combined.warnings.extend(
-                f"Role '{role_name}': {warning}" for warning in results.warnings
-            )
+        Like RoleProcessor.outcome_known() of the role processors.
+        """
+        if not self.fail_fast:
+            return False
+        return bool(results.errors) or (self.dry_run and bool(results.changed_files()))
+
+    @staticmethod
+    def _merge_role_results(
+        combined: ProcessingResults, role_name: str | None, results: ProcessingResults
+    ) -> None:
+        """Add the results of a role (or the collection README if None)."""
+        combined.merge(
+            results, prefix="" if role_name is None else f"Role '{role_name}': "
+        )
 
-            if results.readme_content is not None:
-                readme_ext = "rst" if processor.format_type == "rst" else "md"
+    def iter_collection(
+        self,
+        generate_readme: bool = True,
+        update_defaults: bool = True,
+        validate_collection_readme: bool = False,
+        in_order: bool = False,
+    ) -> Iterator[tuple[str | None, ProcessingResults]]:
+        """Process the collection, yielding the results role by role.
+
+        Like process_collection(), but the results of every role are
+        yielded as soon as the role is done, so callers can report, write
+        or discard them right away: only the README contents referenced by
+        the collection README are kept until the end. The results of the
+        collection README (and its validation) come last, with None as
+        role name. Messages are not prefixed with the role name.
+
+        In fail-fast mode, iteration ends after the first role with an
+        error or (in dry-run mode) a file that would change, once all
+        roles before it (in collection order) are done, so the same roles
+        run before it as in a sequential run. Roles after it may have been
+        yielded already when not in_order. Roles not started yet are
+        cancelled when iteration ends early, e.g. when the caller stops
+        iterating.
+
+        Args:
+            in_order: Yield the roles in collection order; otherwise (with
+                an executor) in order of completion
+            (others): See process_collection()
+
+        Yields:
+            Tuples of (role name or None, results)
+        """
+        # Role names whose README contents the collection README indexes
+        # (TOC <role> and TOC-FULL <role> sections)
+        indexed_roles = self._indexed_roles() if generate_readme else set()
+        # role name -> (role README path, its content after this run)
+        role_readmes: dict[str, tuple[Path, str]] = {}
+        # Fail-fast: position of the first role (in collection order) whose
+        # outcome is known, and of the first role not yielded yet
+        positions = {name: index for index, name in enumerate(self.selected_roles)}
+        order = list(self.selected_roles)
+        done: set[str] = set()
+        stop_position: int | None = None
+        next_position = 0
+
+        for role_name, processor, results in self._iter_role_results(
+            generate_readme, update_defaults, in_order
+        ):
+            role_path = self.selected_roles[role_name]
+            if results.readme_content is not None and role_name in indexed_roles:
+                readme_ext = (
+                    "rst" if processor.readme_format(role_path) == "rst" else "md"
+                )
                 role_readmes[role_name] = (
                     role_path / f"README.{readme_ext}",
                     results.readme_content,
                 )
 
+            yield role_name, results
+            done.add(role_name)
+            while next_position < len(order) and order[next_position] in done:
+                next_position += 1
+            if processor.outcome_known(results) and (
+                stop_position is None or positions[role_name] < stop_position
+            ):
+                stop_position = positions[role_name]
+            if stop_position is not None and next_position > stop_position:
+                return
+
+        collection_results = ProcessingResults(
+            operations=[], errors=[], warnings=[], file_diffs=[]
+        )
+        if validate_collection_readme:
+            errors, warnings, notices = self._validate_collection_readme_markers()
+            collection_results.errors.extend(errors)
+            collection_results.validation_warnings.extend(warnings)
+            collection_results.validation_notices.extend(notices)
+
         if generate_readme:
-            self._process_collection_readme(role_readmes, combined)
+            # The collection README lists roles in collection order
+            with self._collect_timings(collection_results):
+                self._process_collection_readme(
+                    {
+                        role_name: role_readmes[role_name]
+                        for role_name in self.selected_roles
+                        if role_name in role_readmes
+                    },
+                    collection_results,
+                )
 
-        return combined
+        yield None, collection_results
+
+    def _collect_timings(
+        self, results: ProcessingResults
+    ) -> contextlib.AbstractContextManager[None]:
+        """Return the block collecting the timings of the collection README."""
+        if self.collect_spans:
+            return collect_timings(
+                results.timings,
+                results.spans,
+                "collection README",
+                "collection",
+                {"path": str(self.collection_path)},
+            )
+        if self.collect_timings:
+            return collect_timings(results.timings)
+        return contextlib.nullcontext()
+
+    def _iter_role_results(
+        self, generate_readme: bool, update_defaults: bool, in_order: bool
+    ) -> Iterator[tuple[str, RoleProcessor, ProcessingResults]]:
+        """Process the selected roles, sequentially or with the executor.
+
+        With an executor, at most PARALLEL_MAX_PENDING_ROLES roles are
+        scheduled ahead of the consumer, which bounds the memory held by
+        results not yet consumed. No more roles are scheduled once the
+        outcome of a role is known (fail-fast mode): they all come after it.
+        """
+        processors = {
+            role_name: self._role_processor(role_path, self.dry_run)
+            for role_name, role_path in self.selected_roles.items()
+        }
+        if self.executor is None:
+            for role_name, processor in processors.items():
+                yield (
+                    role_name,
+                    processor,
+                    processor.process_role(
+                        self.selected_roles[role_name],
+                        generate_readme=generate_readme,
+                        update_defaults=update_defaults,
+                    ),
+                )
+            return
+
+        executor = self.executor
+        unscheduled = iter(processors.items())
+        # Scheduled roles, in collection order
+        pending: dict[Future[ProcessingResults], str] = {}
+        outcome_known = False
+
+        def schedule() -> None:
+            if outcome_known:
+                return
+            for role_name, processor in itertools.islice(
+                unscheduled, PARALLEL_MAX_PENDING_ROLES - len(pending)
+            ):
+                future = submit_role(
+                    executor,
+                    processor,
+                    self.selected_roles[role_name],
+                    generate_readme=generate_readme,
+                    update_defaults=update_defaults,
+                )
+                pending[future] = role_name
+
+        try:
+            schedule()
+            while pending:
+                if in_order:
+                    done = [next(iter(pending))]
+                else:
+                    finished = wait(pending, return_when=FIRST_COMPLETED).done
+                    done = [future for future in pending if future in finished]
+                for future in done:
+                    role_name = pending.pop(future)
+                    results = future.result()
+                    if processors[role_name].outcome_known(results):
+                        outcome_known = True
+                    yield role_name, processors[role_name], results
+                schedule()
+        finally:
+            for future in pending:
+                future.cancel()
 
     def _has_named_section(
         self, content: str, marker_type: str, role_name: str
@@ -144,27 +423,48 @@ class CollectionProcessor:
         all anchors prefixed by "<role>-", so several embedded roles
         cannot collide on variable names.
         """
-        from .doc_generators import create_documentation_generator
-
         role_path = self.roles[role_name]
         processor = self._role_processor(role_path, dry_run=True)
         role_data = processor.validate_role(role_path)
 
-        doc_generator = create_documentation_generator(
-            format_type=self.format_type, template_file=self.template_readme
+        doc_generator = self.components.doc_generator(
+            self.format_type, self.template_readme
         )
         return doc_generator.generate_role_documentation(
             role_data["specs"],
             role_name,
             role_path,
             anchor_namespace=f"{role_name}-",
+            option_indexes=role_data["option_indexes"],
         )
 
+    def _indexed_roles(self) -> set[str]:
+        """Return the roles with MAIN, TOC or TOC-FULL sections in the README.
+
+        The sections of a role are only updated while its README content
+        is kept (see iter_collection()), even MAIN embeds, which do not
+        read it.
+        """
+        readme_path = self._find_collection_readme()
+        if readme_path is None:
+            return set()
+        try:
+            content = self.source.read_text(readme_path)
+        except (OSError, UnicodeDecodeError):
+            # Reported when updating the README
+            return set()
+        return {
+            match.group("role")
+            for match in MARKER_PATTERN.finditer(content)
+            if match.group("role")
+        }
+
     def _find_collection_readme(self) -> Path | None:
         readme_ext = "rst" if self.format_type == "rst" else "md"
         readme_path = self.collection_path / f"README.{readme_ext}"
-        return readme_path if readme_path.exists() else None
+        return readme_path if self.source.exists(readme_path) else None
 
+    @timed("collection_readme")
     def _process_collection_readme(
         self,
         role_readmes: dict[str, tuple[Path, str]],
@@ -176,11 +476,11 @@ class CollectionProcessor:
             return
 
         try:
-            original_content = readme_path.read_text(encoding="utf-8")
+            original_content = self.source.read_text(readme_path)
             content = original_content
 
-            updater = ReadmeUpdater(
-                format_type=self.format_type, toc_bullet_style=self.toc_bullet_style
+            updater = self.components.readme_updater(
+                self.format_type, self.toc_bullet_style
             )
             collection_toc = updater.toc_generator
             bullet_style = self.toc_bullet_style or collection_toc._detect_bullet_style(
@@ -215,7 +515,7 @@ class CollectionProcessor:
                     toc_headings = collection_toc._extract_headings(embed_content)
                     toc_link_prefix = ""
                 else:
-                    role_updater = ReadmeUpdater(format_type=role_format)
+                    role_updater = self.components.readme_updater(role_format)
                     main_content = role_updater._extract_main_content(role_content)
                     toc_headings = role_toc._extract_headings(main_content)
                     toc_link_prefix = link_prefix
@@ -256,7 +556,7 @@ class CollectionProcessor:
             if self.dry_run:
                 results.file_diffs.append((readme_path, original_content, content))
             elif content != original_content:
-                readme_path.write_text(content, encoding="utf-8", newline="\n")
+                self.source.write_text(readme_path, content)
 
             action = "Updated" if content != original_content else "Unchanged"
             results.operations.append((readme_path, action, "✅"))
@@ -268,8 +568,12 @@ class CollectionProcessor:
         self,
         validate_readme: bool = True,
         validate_argument_specs: bool = True,
+        only_checks: Collection[str] | None = None,
+        skip_checks: Collection[str] | None = None,
     ) -> dict[str, Any]:
-        """Validate all roles and the collection README's markers.
+        """Validate all (selected) roles and the collection README's markers.
+
+        See RoleProcessor.validate_role() for the arguments.
 
         Returns:
             Dict with "roles" (role name -> role_data of successfully
@@ -286,16 +590,20 @@ class CollectionProcessor:
 
         from .exceptions import ProcessingError, ValidationError
 
-        for role_name, role_path in self.roles.items():
+        for role_name, role_path in self.selected_roles.items():
             processor = self._role_processor(role_path, dry_run=True)
             try:
                 summary["roles"][role_name] = processor.validate_role(
                     role_path,
                     validate_readme=validate_readme,
                     validate_argument_specs=validate_argument_specs,
+                    only_checks=only_checks,
+                    skip_checks=skip_checks,
                 )
             except (ValidationError, ProcessingError) as e:
                 summary["errors"].append(f"Role '{role_name}': {e}")
+                if self.fail_fast:
+                    return summary
 
         if validate_readme:
             errors, warnings, notices = self._validate_collection_readme_markers()
@@ -317,7 +625,7 @@ class CollectionProcessor:
         if readme_path is None:
             return errors, warnings, notices
 
-        content = readme_path.read_text(encoding="utf-8")
+        content = self.source.read_text(readme_path)
 
         # Unknown roles referenced by markers
         referenced_roles = {
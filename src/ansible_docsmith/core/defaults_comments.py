@@ -13,7 +13,20 @@ from ..constants import COMMENT_MAX_NESTED_DEPTH
 from .exceptions import FileOperationError
 from .markdown_ast import parse_markdown
 from .markup import convert_ansible_markup
+from .options import (
+    OptionIndex,
+    OptionIndexEntry,
+    build_option_index,
+    group_nested_options,
+)
+from .parser import ThreadLocalYAML
+from .sources import FILE_SYSTEM, FileSource
 from .text import normalize_description
+from .timing import timed
+
+# (spec id, name, depth) -> (spec, comment lines) of nested options. The
+# spec is kept alive to keep its id from being reused.
+SuboptionMemo = dict[tuple[int, str, int], tuple[Any, list[str]]]
 
 
 class DefaultsCommentGenerator:
@@ -27,21 +40,39 @@ class DefaultsCommentGenerator:
                 attributes") of a variable inside its comment block.
         """
         self.nested_options = nested_options
-        self.yaml = YAML()
-        self.yaml.preserve_quotes = True
-        self.yaml.explicit_start = True
-        self.yaml.indent(mapping=2, sequence=4, offset=2)
+        self._yaml = ThreadLocalYAML()
+
+    @property
+    def yaml(self) -> YAML:
+        """Return the YAML loader of the current thread."""
+        return self._yaml.yaml
 
-    def add_comments(self, defaults_path: Path, specs: dict[str, Any]) -> str | None:
-        """Add block comments above variables in defaults file."""
+    @timed("defaults_comments")
+    def add_comments(
+        self,
+        defaults_path: Path,
+        specs: dict[str, Any],
+        source: FileSource | None = None,
+        option_indexes: dict[str, OptionIndex] | None = None,
+    ) -> str | None:
+        """Add block comments above variables in defaults file.
+
+        Args:
+            defaults_path: Path of the defaults file
+            specs: Normalized specs; the first entry point is documented
+            source: Source to read the file from (default: file system)
+            option_indexes: Option indexes of the entry points as returned
+                by ArgumentSpecParser.validate_structure(); built from the
+                specs if None
+        """
+        source = source or FILE_SYSTEM
 
-        if not defaults_path.exists():
+        if not source.exists(defaults_path):
             return None
 
         try:
             # Read the original file as text
-            with open(defaults_path, encoding="utf-8") as file:
-                original_content = file.read()
+            original_content = source.read_text(defaults_path)
 
             # Parse YAML to validate and get variable names
             data = self.yaml.load(original_content)
@@ -52,6 +83,14 @@ class DefaultsCommentGenerator:
             entry_point_name = next(iter(specs.keys()))
             entry_point_spec = specs[entry_point_name]
             options = entry_point_spec.get("options", {})
+            if option_indexes and entry_point_name in option_indexes:
+                option_index = option_indexes[entry_point_name]
+            else:
+                option_index = build_option_index(options or {})
+            nested_options = group_nested_options(option_index)
+            # Comment lines of nested options, shared by the variables of
+            # this call (see _format_suboptions())
+            suboption_memo: SuboptionMemo = {}
 
             # Clean the file first - remove all existing variable comments
             cleaned_content = self._remove_existing_variable_comments(
@@ -72,7 +111,11 @@ class DefaultsCommentGenerator:
 
                     if description:
                         # Generate block comment with full variable details
-                        comment_lines = self._format_block_comment(var_spec)
+                        comment_lines = self._format_block_comment(
+                            var_spec,
+                            nested_options.get(variable_match),
+                            suboption_memo,
+                        )
 
                         # Add blank line before comment (if previous line isn't blank)
                         if result_lines and result_lines[-1].strip():
@@ -104,8 +147,21 @@ class DefaultsCommentGenerator:
         match = re.match(r"^([a-zA-Z_][a-zA-Z0-9_]*)\s*:", line)
         return match.group(1) if match else None
 
-    def _format_block_comment(self, var_spec: dict[str, Any]) -> list[str]:
-        """Format variable spec as detailed block comment with proper line wrapping."""
+    def _format_block_comment(
+        self,
+        var_spec: dict[str, Any],
+        nested_options: list[OptionIndexEntry] | None = None,
+        suboption_memo: SuboptionMemo | None = None,
+    ) -> list[str]:
+        """Format variable spec as detailed block comment with proper line wrapping.
+
+        Args:
+            var_spec: The (normalized) option specification
+            nested_options: The variable's nested options from the option
+                index; built from var_spec when not provided
+            suboption_memo: Memo shared with the other variables of the
+                same file (see _format_suboptions())
+        """
         description = var_spec.get("description", "")
 
         # Normalize description - handle both string and list formats
@@ -132,6 +188,16 @@ class DefaultsCommentGenerator:
         details = self._format_variable_details(var_spec)
         comment_lines.extend(details)
 
+        # Nested options ("dict attributes"), see issue #21
+        if self.nested_options and var_spec.get("options"):
+            if nested_options is None:
+                nested_options = list(
+                    build_option_index(var_spec["options"], depth=1).values()
+                )
+            comment_lines.extend(
+                self._format_suboptions(nested_options, suboption_memo)
+            )
+
         return comment_lines
 
     def _format_variable_details(
@@ -139,6 +205,9 @@ class DefaultsCommentGenerator:
     ) -> list[str]:
         """Format variable details (type, required, default, choices) as comments.
 
+        Nested options are not rendered here; if the spec has any, this
+        ends with the "Dict attributes:" heading they are listed under.
+
         Args:
             var_spec: The (normalized) option specification
             indent: Indentation inside the comment, after the "# " prefix
@@ -170,12 +239,10 @@ class DefaultsCommentGenerator:
         if elements:
             details.append(f"# {indent}- List elements: {elements}")
 
-        # Nested options ("dict attributes"), see issue #21
-        suboptions = var_spec.get("options")
-        if suboptions and self.nested_options:
+        # Heading for nested options ("dict attributes")
+        if var_spec.get("options") and self.nested_options:
             if depth < COMMENT_MAX_NESTED_DEPTH:
                 details.append(f"# {indent}- Dict attributes:")
-                details.extend(self._format_suboptions(suboptions, depth + 1))
             else:
                 details.append(
                     f"# {indent}- Dict attributes: (omitted at this nesting "
@@ -184,42 +251,70 @@ class DefaultsCommentGenerator:
 
         return details
 
-    def _format_suboptions(self, options: dict[str, Any], depth: int = 1) -> list[str]:
+    def _format_suboptions(
+        self,
+        entries: list[OptionIndexEntry],
+        memo: SuboptionMemo | None = None,
+    ) -> list[str]:
         """Render nested option specs as indented comment bullets.
 
         Produces a compact block per attribute: the description on the
         bullet line (wrapped with hanging indent) followed by the same
-        detail bullets used for top-level variables.
+        detail bullets used for top-level variables. The entries are
+        flattened in pre-order, so every attribute directly follows the
+        "Dict attributes:" heading of its parent.
+
+        Args:
+            entries: Nested option index entries
+            memo: Comment lines of nested options already rendered, so
+                subtrees shared via YAML aliases are formatted once
         """
-        bullet_indent = "  " * (2 * depth - 1)
-        detail_indent = f"{bullet_indent}  "
+        if memo is None:
+            memo = {}
         lines: list[str] = []
 
-        for name, spec in options.items():
-            header = f"{bullet_indent}- {name}:"
+        for entry in entries:
+            if entry.depth > COMMENT_MAX_NESTED_DEPTH:
+                # Below an attribute whose own attributes are omitted
+                continue
 
-            description = self._normalize_description(spec.get("description", ""))
-            if description:
-                width = max(78 - len(detail_indent), 30)
-                wrapped = self._parse_and_format_description(
-                    description, max_width=width
-                )
-                desc_lines = wrapped.split("\n")
-                first_line = desc_lines[0]
-                if first_line and len(f"{header} {first_line}") <= 78:
-                    lines.append(f"# {header} {first_line}")
-                    remaining = desc_lines[1:]
-                else:
-                    lines.append(f"# {header}")
-                    remaining = desc_lines
-                lines.extend(
-                    f"# {detail_indent}{line}" if line else "#" for line in remaining
-                )
+            key = (id(entry.spec), entry.name, entry.depth)
+            cached = memo.get(key)
+            if cached is None:
+                cached = (entry.spec, self._format_suboption(entry))
+                memo[key] = cached
+            lines.extend(cached[1])
+
+        return lines
+
+    def _format_suboption(self, entry: OptionIndexEntry) -> list[str]:
+        """Render the comment bullet of a single nested option."""
+        lines: list[str] = []
+        depth = entry.depth
+        spec = entry.spec
+        bullet_indent = "  " * (2 * depth - 1)
+        detail_indent = f"{bullet_indent}  "
+        header = f"{bullet_indent}- {entry.name}:"
+
+        description = self._normalize_description(spec.get("description", ""))
+        if description:
+            width = max(78 - len(detail_indent), 30)
+            wrapped = self._parse_and_format_description(description, max_width=width)
+            desc_lines = wrapped.split("\n")
+            first_line = desc_lines[0]
+            if first_line and len(f"{header} {first_line}") <= 78:
+                lines.append(f"# {header} {first_line}")
+                remaining = desc_lines[1:]
             else:
                 lines.append(f"# {header}")
+                remaining = desc_lines
+            lines.extend(
+                f"# {detail_indent}{line}" if line else "#" for line in remaining
+            )
+        else:
+            lines.append(f"# {header}")
 
-            lines.extend(self._format_variable_details(spec, detail_indent, depth))
-
+        lines.extend(self._format_variable_details(spec, detail_indent, depth))
         return lines
 
     def _format_default_comment(self, default: Any, indent: str = "") -> list[str]:
@@ -285,6 +380,7 @@ class DefaultsCommentGenerator:
 
         return self._parse_and_format_description(text)
 
+    @timed("comment_format")
     def _parse_and_format_description(self, text: str, max_width: int = 0) -> str:
         """Parse description as Markdown and apply enhanced formatting rules.
 
@@ -0,0 +1,370 @@
+"""Compact storage of the file diffs of dry runs.
+
+Dry runs (like ``generate --check``) report the old and new content of
+every file they touch in ProcessingResults.file_diffs. For large
+collections, holding all of these strings until the end costs several
+times the size of the documentation. CompactFileDiffs stores each diff
+as content digests plus zlib-compressed contents instead; the new
+content is compressed with the old one as preset dictionary, so it
+mostly costs its changes. Contents are only decompressed when a diff is
+read (e.g. to display it).
+
+unified_diff() and diff_stat() compare contents for display, with a
+near-linear algorithm for large files.
+"""
+
+import bisect
+import difflib
+import hashlib
+import zlib
+from collections import Counter
+from collections.abc import Iterable, Iterator, MutableSequence, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import overload
+
+from typing_extensions import override
+
+from ..constants import DIFF_FALLBACK_MAX_COMPARISONS, DIFF_FAST_MIN_LINES
+from .timing import timed
+
+# (file, old_content, new_content), as stored in ProcessingResults
+FileDiff = tuple[Path, str, str]
+
+# Largest preset dictionary zlib makes use of (its window size)
+_ZDICT_SIZE = 32 * 1024
+
+
+def content_digest(content: str) -> bytes:
+    """Return a digest identifying a file content."""
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+
+
+@dataclass(frozen=True)
+class CompactFileDiff:
+    """A file diff with compressed contents."""
+
+    path: Path
+    old_digest: bytes
+    new_digest: bytes
+    old_data: bytes
+    # Compressed with the (end of the) old content as preset dictionary;
+    # None if the content did not change
+    new_data: bytes | None
+
+    @classmethod
+    @timed("diff")
+    def from_contents(
+        cls, path: Path, old_content: str, new_content: str
+    ) -> "CompactFileDiff":
+        """Compress a diff."""
+        old_bytes = old_content.encode("utf-8")
+        old_digest = content_digest(old_content)
+        new_digest = content_digest(new_content)
+        new_data = None
+        if new_digest != old_digest:
+            compressor = zlib.compressobj(zdict=old_bytes[-_ZDICT_SIZE:])
+            new_data = compressor.compress(new_content.encode("utf-8"))
+            new_data += compressor.flush()
+        return cls(path, old_digest, new_digest, zlib.compress(old_bytes), new_data)
+
+    @property
+    def changed(self) -> bool:
+        """Whether the content changes."""
+        return self.old_digest != self.new_digest
+
+    def old_content(self) -> str:
+        """Decompress the old content."""
+        return zlib.decompress(self.old_data).decode("utf-8")
+
+    def contents(self) -> FileDiff:
+        """Decompress the diff into a (file, old, new content) tuple."""
+        old_content = self.old_content()
+        if self.new_data is None:
+            return self.path, old_content, old_content
+        old_bytes = old_content.encode("utf-8")
+        decompressor = zlib.decompressobj(zdict=old_bytes[-_ZDICT_SIZE:])
+        new_bytes = decompressor.decompress(self.new_data) + decompressor.flush()
+        return self.path, old_content, new_bytes.decode("utf-8")
+
+
+class CompactFileDiffs(MutableSequence[FileDiff]):
+    """File diffs stored compactly; a drop-in for a list of FileDiff tuples.
+
+    Tuples are compressed when added and decompressed (one at a time)
+    when read, so iterating over all diffs never holds more than one of
+    them in full. changed_files() only compares digests.
+    """
+
+    def __init__(self, diffs: Iterable[FileDiff] = ()) -> None:
+        self._diffs: list[CompactFileDiff] = []
+        self.extend(diffs)
+
+    @staticmethod
+    def _compact(diff: FileDiff | CompactFileDiff) -> CompactFileDiff:
+        if isinstance(diff, CompactFileDiff):
+            return diff
+        return CompactFileDiff.from_contents(*diff)
+
+    def compact_diffs(self) -> list[CompactFileDiff]:
+        """Return the stored diffs without decompressing them."""
+        return list(self._diffs)
+
+    def changed_files(self) -> list[Path]:
+        """Return the files whose content changes."""
+        return [diff.path for diff in self._diffs if diff.changed]
+
+    @overload
+    def __getitem__(self, index: int) -> FileDiff: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[FileDiff]: ...
+
+    @override
+    def __getitem__(self, index: int | slice) -> FileDiff | list[FileDiff]:
+        if isinstance(index, slice):
+            return [diff.contents() for diff in self._diffs[index]]
+        return self._diffs[index].contents()
+
+    @overload
+    def __setitem__(self, index: int, value: FileDiff) -> None: ...
+
+    @overload
+    def __setitem__(self, index: slice, value: Iterable[FileDiff]) -> None: ...
+
+    @override
+    def __setitem__(
+        self, index: int | slice, value: FileDiff | Iterable[FileDiff]
+    ) -> None:
+        if isinstance(index, slice):
+            self._diffs[index] = [self._compact(diff) for diff in value]  # type: ignore[arg-type]
+        else:
+            self._diffs[index] = self._compact(value)  # type: ignore[arg-type]
+
+    @override
+    def __delitem__(self, index: int | slice) -> None:
+        del self._diffs[index]
+
+    @override
+    def __len__(self) -> int:
+        return len(self._diffs)
+
+    @override
+    def __iter__(self) -> Iterator[FileDiff]:
+        for diff in self._diffs:
+            yield diff.contents()
+
+    @override
+    def insert(self, index: int, value: FileDiff) -> None:
+        self._diffs.insert(index, self._compact(value))
+
+    @override
+    def extend(self, values: Iterable[FileDiff]) -> None:
+        if isinstance(values, CompactFileDiffs):
+            # Already compressed
+            self._diffs.extend(values._diffs)
+        else:
+            self._diffs.extend(self._compact(diff) for diff in values)
+
+    @override
+    def clear(self) -> None:
+        self._diffs.clear()
+
+    @override
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CompactFileDiffs):
+            return self._diffs == other._diffs
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    @override
+    def __repr__(self) -> str:
+        return f"CompactFileDiffs({list(self)!r})"
+
+
+class _FastMatcher(difflib.SequenceMatcher[str]):
+    """SequenceMatcher with a near-linear matching of lines.
+
+    difflib's own matching can take quadratic time on large, heavily
+    rewritten files. This one strips the common prefix and suffix, then
+    anchors on lines occurring exactly once on both sides (their longest
+    increasing sequence, like patience diff) and repeats that between the
+    anchors. Ranges without such lines are matched by difflib if small
+    and reported as replaced otherwise. Opcodes and grouping are
+    difflib's.
+    """
+
+    def __init__(self, a: Sequence[str], b: Sequence[str]) -> None:
+        super().__init__(None, a, b, autojunk=False)
+        self._lines = (a, b)
+        self._blocks: list[difflib.Match] | None = None
+
+    @override
+    def get_matching_blocks(self) -> list[difflib.Match]:
+        if self._blocks is None:
+            a, b = self._lines
+            pairs = _matching_lines(a, b)
+            blocks: list[difflib.Match] = []
+            for i, j in pairs:
+                if blocks and blocks[-1].a + blocks[-1].size == i:
+                    last = blocks[-1]
+                    if last.b + last.size == j:
+                        blocks[-1] = difflib.Match(last.a, last.b, last.size + 1)
+                        continue
+                blocks.append(difflib.Match(i, j, 1))
+            blocks.append(difflib.Match(len(a), len(b), 0))
+            self._blocks = blocks
+        return self._blocks
+
+
+def _matching_lines(a: Sequence[str], b: Sequence[str]) -> list[tuple[int, int]]:
+    """Return the pairs of matching line indices, sorted."""
+    pairs: list[tuple[int, int]] = []
+    ranges = [(0, len(a), 0, len(b))]
+    while ranges:
+        alo, ahi, blo, bhi = ranges.pop()
+        while alo < ahi and blo < bhi and a[alo] == b[blo]:
+            pairs.append((alo, blo))
+            alo, blo = alo + 1, blo + 1
+        while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+            ahi, bhi = ahi - 1, bhi - 1
+            pairs.append((ahi, bhi))
+        if alo == ahi or blo == bhi:
+            continue
+
+        anchors = _unique_anchors(a, alo, ahi, b, blo, bhi)
+        if anchors:
+            for i, j in anchors:
+                ranges.append((alo, i, blo, j))
+                pairs.append((i, j))
+                alo, blo = i + 1, j + 1
+            ranges.append((alo, ahi, blo, bhi))
+        elif (ahi - alo) * (bhi - blo) <= DIFF_FALLBACK_MAX_COMPARISONS:
+            matcher = difflib.SequenceMatcher(None, a[alo:ahi], b[blo:bhi], False)
+            pairs.extend(
+                (alo + block.a + offset, blo + block.b + offset)
+                for block in matcher.get_matching_blocks()
+                for offset in range(block.size)
+            )
+    pairs.sort()
+    return pairs
+
+
+def _unique_anchors(
+    a: Sequence[str], alo: int, ahi: int, b: Sequence[str], blo: int, bhi: int
+) -> list[tuple[int, int]]:
+    """Return the longest increasing sequence of lines unique on both sides."""
+    a_counts = Counter(a[alo:ahi])
+    b_positions: dict[str, int] = {}
+    b_counts: Counter[str] = Counter()
+    for j in range(blo, bhi):
+        line = b[j]
+        if a_counts[line] == 1:
+            b_counts[line] += 1
+            b_positions[line] = j
+    candidates = [
+        (i, b_positions[a[i]])
+        for i in range(alo, ahi)
+        if a_counts[a[i]] == 1 and b_counts[a[i]] == 1
+    ]
+    if not candidates:
+        return []
+
+    # Patience sorting: tails[k] is the candidate index ending the best
+    # increasing sequence of length k + 1
+    tails: list[int] = []
+    tail_values: list[int] = []
+    previous = [-1] * len(candidates)
+    for index, (_i, j) in enumerate(candidates):
+        k = bisect.bisect_left(tail_values, j)
+        if k:
+            previous[index] = tails[k - 1]
+        if k == len(tails):
+            tails.append(index)
+            tail_values.append(j)
+        else:
+            tails[k] = index
+            tail_values[k] = j
+
+    anchors = []
+    index = tails[-1]
+    while index != -1:
+        anchors.append(candidates[index])
+        index = previous[index]
+    anchors.reverse()
+    return anchors
+
+
+def _matcher(a: list[str], b: list[str]) -> difflib.SequenceMatcher[str]:
+    """Return the line matcher for two files (see DIFF_FAST_MIN_LINES)."""
+    if len(a) + len(b) < DIFF_FAST_MIN_LINES:
+        return difflib.SequenceMatcher(None, a, b)
+    return _FastMatcher(a, b)
+
+
+def _format_range(start: int, stop: int) -> str:
+    """Format a line range of a hunk header like difflib does."""
+    length = stop - start
+    if length == 1:
+        return str(start + 1)
+    return f"{start if not length else start + 1},{length}"
+
+
+def unified_diff(
+    old_content: str,
+    new_content: str,
+    fromfile: str,
+    tofile: str,
+    context: int = 3,
+) -> Iterator[str]:
+    """Yield the lines of a unified diff, each ending with a newline.
+
+    Large files are compared with a near-linear algorithm (see
+    _FastMatcher). Lines without a trailing newline are marked like
+    ``diff`` does, so the output can be applied as a patch. Nothing is
+    yielded for equal contents.
+    """
+    a = old_content.splitlines(keepends=True)
+    b = new_content.splitlines(keepends=True)
+    started = False
+    for group in _matcher(a, b).get_grouped_opcodes(context):
+        if not started:
+            yield f"--- {fromfile}\n"
+            yield f"+++ {tofile}\n"
+            started = True
+        first, last = group[0], group[-1]
+        yield (
+            f"@@ -{_format_range(first[1], last[2])} "
+            f"+{_format_range(first[3], last[4])} @@\n"
+        )
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                lines = [(" ", line) for line in a[i1:i2]]
+            else:
+                lines = [("-", line) for line in a[i1:i2]]
+                lines += [("+", line) for line in b[j1:j2]]
+            for prefix, line in lines:
+                if line.endswith("\n"):
+                    yield prefix + line
+                else:
+                    yield f"{prefix}{line}\n"
+                    yield "\\ No newline at end of file\n"
+
+
+def diff_stat(old_content: str, new_content: str) -> tuple[int, int]:
+    """Return the numbers of added and removed lines.
+
+    Like in unified_diff(), a line only differing in its line ending (like
+    a missing newline at the end of the file) counts as changed.
+    """
+    a = old_content.splitlines(keepends=True)
+    b = new_content.splitlines(keepends=True)
+    added = removed = 0
+    for tag, i1, i2, j1, j2 in _matcher(a, b).get_opcodes():
+        if tag != "equal":
+            removed += i2 - i1
+            added += j2 - j1
+    return added, removed
@@ -0,0 +1,215 @@
+"""Discovery of the roles and collections to process.
+
+- discover_projects() walks a whole directory tree, e.g. a monorepo
+  holding a ``roles/`` directory next to ``ansible_collections/<ns>/<name>``
+  checkouts. The tree is walked once with ``os.scandir()``; the directory
+  entries read there answer most questions without further ``stat()``
+  calls.
+- changed_projects() maps a list of changed files (as known by pre-commit
+  or CI) to the roles and collections owning them.
+"""
+
+import fnmatch
+import os
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+from ..constants import DISCOVERY_PRUNED_DIRS
+from .collection import find_collection_roles, has_argument_specs
+
+
+def discover_projects(root: Path, ignore: Iterable[str] = ()) -> list[tuple[str, Path]]:
+    """Find all roles and collections below a directory.
+
+    Directories in DISCOVERY_PRUNED_DIRS, virtualenvs (directories with a
+    ``pyvenv.cfg``) and directories matching an ignore pattern are not
+    walked. Neither are found roles nor the roles/ directory of found
+    collections, as a collection's roles are processed as part of the
+    collection. Other directories of a collection are walked: a repository
+    with a top-level roles/ directory is a collection itself, but may hold
+    further collections (e.g. below ansible_collections/). Symlinked
+    directories are followed, but every directory is visited only once, so
+    roles reachable through several paths are found once (and symlink loops
+    end).
+
+    Args:
+        root: Directory to walk; may be a role or collection itself
+        ignore: fnmatch patterns matched against directory names and
+            against paths relative to root (like "tests/*")
+
+    Returns:
+        List of ("role" | "collection", path) tuples, sorted by path
+    """
+    patterns = list(ignore)
+    found: list[tuple[str, Path]] = []
+    # Identities of walked directories and of roles of found collections
+    visited = {_key(root)}
+    collection_role_keys: set[tuple[int, int]] = set()
+
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as iterator:
+                entries = {entry.name: entry for entry in iterator}
+        except OSError:
+            # Unreadable directories (permissions, dangling symlinks) are
+            # no projects
+            continue
+
+        if "pyvenv.cfg" in entries:
+            continue
+
+        meta = entries.get("meta")
+        if meta is not None and meta.is_dir() and has_argument_specs(directory):
+            found.append(("role", directory))
+            continue
+
+        roles = entries.get("roles")
+        collection_roles = (
+            find_collection_roles(directory)
+            if roles is not None and roles.is_dir()
+            else {}
+        )
+        is_collection = bool(collection_roles)
+        if is_collection:
+            found.append(("collection", directory))
+            # Processed with the collection; not again if also reachable
+            # through a symlink elsewhere
+            collection_role_keys.update(map(_key, collection_roles.values()))
+
+        # Sorted for a stable walk; real directories claim their identity
+        # before symlinks to them
+        for name, entry in sorted(
+            entries.items(), key=lambda item: (item[1].is_symlink(), item[0])
+        ):
+            if name in DISCOVERY_PRUNED_DIRS or not entry.is_dir():
+                continue
+            if is_collection and name == "roles":
+                continue
+            path = directory / name
+            if _is_ignored(path.relative_to(root), patterns):
+                continue
+            try:
+                key = _key(path)
+            except OSError:
+                continue
+            if key not in visited and key not in collection_role_keys:
+                visited.add(key)
+                stack.append(path)
+
+    # Roles found on their own before the collection containing them
+    return sorted(
+        (
+            (project_type, path)
+            for project_type, path in found
+            if project_type == "collection" or _key(path) not in collection_role_keys
+        ),
+        key=lambda item: item[1],
+    )
+
+
+def _key(path: Path) -> tuple[int, int]:
+    """Return the identity of a directory (device and inode number)."""
+    path_stat = path.stat()
+    return path_stat.st_dev, path_stat.st_ino
+
+
+def _is_ignored(relative_path: Path, patterns: list[str]) -> bool:
+    """Return whether a directory matches one of the ignore patterns."""
+    return any(
+        fnmatch.fnmatch(relative_path.name, pattern)
+        or fnmatch.fnmatch(relative_path.as_posix(), pattern)
+        for pattern in patterns
+    )
+
+
+@dataclass(frozen=True)
+class ProjectOwner:
+    """Role or collection a file belongs to."""
+
+    # "role" or "collection"
+    project_type: str
+    path: Path
+    # Collection role the file belongs to; None for standalone roles and
+    # for files of the collection itself (like its README)
+    role: str | None = None
+
+
+class OwnerLookup:
+    """Find the roles and collections owning (changed) files.
+
+    Walks up from each file to the nearest directory with a
+    ``meta/argument_specs.{yml,yaml}`` (role) or documented roles below
+    ``roles/`` (collection); a ``galaxy.yml`` without documented roles
+    ends the walk, too. Results are cached per directory, so files of the
+    same role need a single walk.
+    """
+
+    def __init__(self) -> None:
+        self._cache: dict[Path, ProjectOwner | None] = {}
+
+    def owner(self, path: Path) -> ProjectOwner | None:
+        """Return the owner of a file or directory, None if there is none.
+
+        The path does not need to exist (anymore), e.g. for deleted files.
+        """
+        path = path.absolute()
+        start = path if path.is_dir() else path.parent
+
+        walked: list[Path] = []
+        owner: ProjectOwner | None = None
+        for directory in (start, *start.parents):
+            if directory in self._cache:
+                owner = self._cache[directory]
+                break
+            walked.append(directory)
+            owner = self._directory_owner(directory)
+            if owner is not None or (directory / "galaxy.yml").is_file():
+                break
+
+        for directory in walked:
+            self._cache[directory] = owner
+        return owner
+
+    def _directory_owner(self, directory: Path) -> ProjectOwner | None:
+        """Return the owner if the directory is a role or collection."""
+        if has_argument_specs(directory):
+            if directory.parent.name == "roles":
+                # Roles below roles/ make their parent a collection (see
+                # detect_project_type())
+                return ProjectOwner(
+                    "collection", directory.parent.parent, role=directory.name
+                )
+            return ProjectOwner("role", directory)
+        if find_collection_roles(directory):
+            return ProjectOwner("collection", directory)
+        return None
+
+
+def changed_projects(paths: Iterable[Path]) -> dict[Path, set[str] | None]:
+    """Map changed files to the roles and collections to process.
+
+    Args:
+        paths: Changed files (or directories)
+
+    Returns:
+        Project path -> names of the collection roles to process, in
+        order of first appearance. None stands for standalone roles and
+        for collections whose own files changed (all roles are processed
+        then). Files outside of any project are ignored.
+    """
+    lookup = OwnerLookup()
+    projects: dict[Path, set[str] | None] = {}
+    for path in paths:
+        owner = lookup.owner(path)
+        if owner is None:
+            continue
+        if owner.project_type == "role" or owner.role is None:
+            projects[owner.path] = None
+            continue
+        roles = projects.setdefault(owner.path, set())
+        if roles is not None:
+            roles.add(owner.role)
+    return projects
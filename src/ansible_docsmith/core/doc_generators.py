@@ -3,22 +3,26 @@
 import re
 from abc import ABC, abstractmethod
 from collections.abc import Callable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
 from typing_extensions import override
 
-from ..constants import TABLE_DESCRIPTION_MAX_LENGTH
+from ..constants import README_MAX_NESTED_DEPTH, TABLE_DESCRIPTION_MAX_LENGTH
 from ..templates import TemplateManager
 from .exceptions import TemplateError
 from .markup import convert_ansible_markup, md_code_span, rst_inline_literal
+from .options import OptionIndex, build_option_indexes, group_nested_options
 from .text import (
     MD_ATOMIC_TOKENS,
     RST_ATOMIC_TOKENS,
-    HTMLStripper,
+    flatten_paragraphs,
     normalize_description,
     truncate_preserving_tokens,
 )
+from .timing import stage, timed
 
 
 def entry_point_anchor_prefix(specs: dict[str, Any], entry_point: str) -> str:
@@ -37,36 +41,82 @@ def entry_point_anchor_prefix(specs: dict[str, Any], entry_point: str) -> str:
 
 
 def build_option_anchors(
-    specs: dict[str, Any], anchor_namespace: str = ""
+    specs: dict[str, Any],
+    anchor_namespace: str = "",
+    option_indexes: dict[str, OptionIndex] | None = None,
 ) -> dict[str, "str | None"]:
-    """Map top-level option names of all entry points to README anchors.
+    """Map option paths of all entry points to README anchors.
 
-    Used to resolve O(name) markup references. Names defined by several
-    entry points resolve to the 'main' entry point; without a 'main'
-    definition they are ambiguous and map to None (not linked).
+    Used to resolve O(name) and O(parent.child) markup references; keys
+    are dotted option paths (OptionIndexEntry.path). Paths defined by
+    several entry points resolve to the 'main' entry point; without a
+    'main' definition they are ambiguous and map to None (not linked).
 
     Args:
         specs: Normalized argument specs
         anchor_namespace: Prefix for all anchors, used when the content
             is embedded into another document (like "<role>-" for MAIN
             embeds in collection READMEs)
+        option_indexes: Option indexes of the entry points (see
+            build_option_indexes()); built from the specs if None
     """
+    if option_indexes is None:
+        option_indexes = build_option_indexes(specs)
+    short_prefix = f"{anchor_namespace}variable-"
     anchors: dict[str, str | None] = {}
-    for entry_point, entry_spec in specs.items():
+    for entry_point in specs:
         prefix = anchor_namespace + entry_point_anchor_prefix(specs, entry_point)
-        for option_name in entry_spec.get("options") or {}:
-            anchor = f"{prefix}{option_name}"
-            if option_name not in anchors:
-                anchors[option_name] = anchor
-            elif prefix == f"{anchor_namespace}variable-":
+        for entry in option_indexes.get(entry_point, {}).values():
+            if entry.depth > README_MAX_NESTED_DEPTH:
+                # Deeper options have no README section to link to
+                continue
+            path = entry.path
+            anchor = f"{prefix}{entry.anchor}"
+            if path not in anchors:
+                anchors[path] = anchor
+            elif prefix == short_prefix:
                 # 'main' wins over other entry points
-                anchors[option_name] = anchor
-            elif anchors[option_name] != f"{anchor_namespace}variable-{option_name}":
+                anchors[path] = anchor
+            elif anchors[path] != f"{short_prefix}{entry.anchor}":
                 # Defined by several non-'main' entry points: ambiguous
-                anchors[option_name] = None
+                anchors[path] = None
     return anchors
 
 
+@dataclass
+class RenderContext:
+    """State of a single render of a documentation generator.
+
+    Generators are shared by concurrent renders (threads, asyncio tasks),
+    so the state of a render lives here instead of on the generator. The
+    filters find the context of the render calling them through a
+    context variable.
+    """
+
+    # Option paths of the role being rendered, mapped to their README
+    # anchors; used to turn O(name) and O(parent.child) markup into
+    # intra-README anchor links
+    role_options: dict[str, str | None] = field(default_factory=dict)
+    # Memo of filter results, keyed by filter name, the identity of the
+    # filtered value and the filter arguments. Each entry also keeps the
+    # value itself alive, so its id() cannot be reused by another object
+    # during the render.
+    filter_memo: dict[tuple[Any, ...], tuple[Any, str]] = field(default_factory=dict)
+
+
+# Context of the render in progress (None outside of renders, e.g. when
+# calling filters directly)
+_RENDER_CONTEXT: ContextVar[RenderContext | None] = ContextVar(
+    "docsmith_render_context", default=None
+)
+
+
+def _role_options() -> dict[str, str | None]:
+    """Return the option anchors of the render in progress (if any)."""
+    context = _RENDER_CONTEXT.get()
+    return context.role_options if context is not None else {}
+
+
 class BaseDocumentationGenerator(ABC):
     """Abstract base class for documentation generators."""
 
@@ -86,20 +136,45 @@ class BaseDocumentationGenerator(ABC):
         self.template_manager = TemplateManager(template_dir, template_file)
         self.template_name = template_name
 
-        # Top-level option names of the role being rendered, mapped to
-        # their README anchors; used to turn O(name) markup into
-        # intra-README anchor links. Set per render in
-        # generate_role_documentation().
-        self._role_options: dict[str, str | None] = {}
-
         # Add format-specific filters to the Jinja environment
         self._setup_filters()
 
     def _setup_filters(self) -> None:
-        """Setup format-specific filters."""
+        """Setup format-specific filters, memoized per render."""
         filters = self._get_filters()
         for name, filter_func in filters.items():
-            self.template_manager.add_filter(name, filter_func)
+            self.template_manager.add_filter(
+                name, self._memoized_filter(name, filter_func)
+            )
+
+    def _memoized_filter(
+        self, name: str, filter_func: Callable[..., str]
+    ) -> Callable[..., str]:
+        """Wrap a filter so repeated calls within a render are computed once.
+
+        The default templates format the same option in the summary table
+        and in the detailed section; custom templates calling filters
+        repeatedly benefit the same way.
+        """
+
+        def memoized(value: Any, *args: Any, **kwargs: Any) -> str:
+            context = _RENDER_CONTEXT.get()
+            if context is None:
+                # Called outside of a render: nothing to share results with
+                return filter_func(value, *args, **kwargs)
+            try:
+                key = (name, id(value), args, tuple(sorted(kwargs.items())))
+                cached = context.filter_memo.get(key)
+            except TypeError:
+                # Unhashable filter arguments: not cacheable
+                return filter_func(value, *args, **kwargs)
+            if cached is not None:
+                return cached[1]
+            result = filter_func(value, *args, **kwargs)
+            context.filter_memo[key] = (value, result)
+            return result
+
+        return memoized
 
     @abstractmethod
     def _get_filters(self) -> dict[str, Callable[[Any], str]]:
@@ -121,6 +196,7 @@ class BaseDocumentationGenerator(ABC):
         role_name: str,
         role_path: Path,
         anchor_namespace: str = "",
+        option_indexes: dict[str, OptionIndex] | None = None,
     ) -> str:
         """Generate complete role documentation.
 
@@ -132,8 +208,13 @@ class BaseDocumentationGenerator(ABC):
                 internal links; used when the content is embedded into
                 another document (like "<role>-" for MAIN embeds in
                 collection READMEs)
+            option_indexes: Option indexes of the entry points as returned
+                by ArgumentSpecParser.validate_structure(); built from the
+                specs if None
         """
 
+        render_context = RenderContext()
+        token = _RENDER_CONTEXT.set(render_context)
         try:
             # The templates render all entry points; the first one is kept
             # available as "primary" for backwards-compatible custom
@@ -141,8 +222,20 @@ class BaseDocumentationGenerator(ABC):
             primary_entry_point = next(iter(specs.keys()))
             primary_spec = specs[primary_entry_point]
 
-            # Known top-level options for O(name) anchor linking in filters
-            self._role_options = build_option_anchors(specs, anchor_namespace)
+            if option_indexes is None:
+                option_indexes = build_option_indexes(specs)
+
+            # Known options for O(name) anchor linking in filters
+            render_context.role_options = build_option_anchors(
+                specs, anchor_namespace, option_indexes
+            )
+
+            # Nested options of every top-level option, flattened in
+            # rendering order (entry point -> option name -> entries)
+            nested_options = {
+                entry_point: group_nested_options(option_indexes.get(entry_point, {}))
+                for entry_point in specs
+            }
 
             context = {
                 "role_name": role_name,
@@ -154,18 +247,22 @@ class BaseDocumentationGenerator(ABC):
                 "entry_points": list(specs.keys()),
                 "options": primary_spec.get("options", {}),
                 "has_options": bool(primary_spec.get("options", {})),
+                "nested_options": nested_options,
             }
 
             # Render template using template manager with format type
-            return self.template_manager.render_template(
-                self.template_name,
-                self._get_template_subdir(),
-                self._get_format_type(),
-                **context,
-            )
+            with stage("jinja"):
+                return self.template_manager.render_template(
+                    self.template_name,
+                    self._get_template_subdir(),
+                    self._get_format_type(),
+                    **context,
+                )
 
         except Exception as e:
             raise TemplateError(f"Failed to generate documentation: {e}") from e
+        finally:
+            _RENDER_CONTEXT.reset(token)
 
     @abstractmethod
     def _ansible_escape_filter(self, value: Any) -> str:
@@ -208,9 +305,9 @@ class BaseDocumentationGenerator(ABC):
     def _format_description_filter(self, description: Any) -> str:
         """Format description for README display, handling both strings and lists."""
         text = normalize_description(description)
-        return convert_ansible_markup(text, self._get_format_type(), self._role_options)
+        return convert_ansible_markup(text, self._get_format_type(), _role_options())
 
-    @abstractmethod
+    @timed("table_description")
     def _format_table_description_filter(
         self,
         description: Any,
@@ -220,6 +317,9 @@ class BaseDocumentationGenerator(ABC):
     ) -> str:
         """Format description for table display, handling multiline strings properly.
 
+        Markup conversion, HTML stripping, paragraph flattening,
+        truncation and cell escaping; each step is a single pass.
+
         Args:
             description: The description content to format
             variable_name: Optional variable name for creating anchor links
@@ -227,8 +327,46 @@ class BaseDocumentationGenerator(ABC):
             anchor_prefix: Prefix for the truncation anchor link target
                 (entry points other than 'main' use a scoped prefix).
         """
+        text = normalize_description(description)
+        if not text:
+            return ""
+
+        # Convert Ansible markup (C(...), O(...), ...) to the target format
+        text = convert_ansible_markup(text, self._get_format_type(), _role_options())
+
+        # Strip HTML and join the paragraphs into a single table line
+        result = flatten_paragraphs(text, self._table_paragraph_separator())
+
+        # Truncate at max length and add ellipses (with link if possible).
+        # If max_length is 0 or less, truncation is disabled.
+        if max_length > 0 and len(result) > max_length:
+            truncated = truncate_preserving_tokens(
+                result, max_length, self._table_atomic_tokens()
+            )
+            link_target = f"{anchor_prefix}{variable_name}" if variable_name else None
+            result = f"{truncated} {self._table_ellipsis(link_target)}"
+
+        return self._escape_table_cell(result)
+
+    @abstractmethod
+    def _table_paragraph_separator(self) -> str:
+        """Return the separator for paragraphs inside a table cell."""
+        pass
+
+    @abstractmethod
+    def _table_atomic_tokens(self) -> re.Pattern[str]:
+        """Return the token pattern that truncation must not split."""
         pass
 
+    @abstractmethod
+    def _table_ellipsis(self, link_target: str | None) -> str:
+        """Return the truncation marker, linked to link_target if given."""
+        pass
+
+    def _escape_table_cell(self, text: str) -> str:
+        """Escape table cell delimiters in text (no-op by default)."""
+        return text
+
 
 class MarkdownDocumentationGenerator(BaseDocumentationGenerator):
     """Generate Markdown documentation from argument specs."""
@@ -270,65 +408,26 @@ class MarkdownDocumentationGenerator(BaseDocumentationGenerator):
         return md_code_span(text, table)
 
     @override
-    def _format_table_description_filter(
-        self,
-        description: Any,
-        variable_name: str | None = None,
-        max_length: int = TABLE_DESCRIPTION_MAX_LENGTH,
-        anchor_prefix: str = "variable-",
-    ) -> str:
-        """Format description for Markdown table display with HTML stripping.
+    def _table_paragraph_separator(self) -> str:
+        """Join paragraphs with <br><br> for proper table display."""
+        return "<br><br>"
 
-        Args:
-            description: The description content to format
-            variable_name: Optional variable name for creating anchor links
-            max_length: Maximum length before truncation. Use 0 to disable.
-            anchor_prefix: Prefix for the truncation anchor link target
-        """
-        text = normalize_description(description)
-        if not text:
-            return ""
-
-        # Step 0: Convert Ansible markup (C(...), O(...), ...) to Markdown
-        text = convert_ansible_markup(text, "markdown", self._role_options)
-
-        # Step 1: Strip all HTML tags using proper HTML parser
-        text = HTMLStripper.strip_tags(text)
-
-        # Step 2 & 3: Process multiline descriptions for table display
-        # First, normalize line endings
-        text = text.replace("\r\n", "\n").replace("\r", "\n")
-
-        # Split on double newlines to identify paragraphs
-        paragraphs = text.split("\n\n")
-
-        # Process each paragraph: replace single newlines with spaces
-        processed_paragraphs = []
-        for paragraph in paragraphs:
-            if paragraph.strip():
-                # Replace single newlines within paragraph with spaces
-                processed_paragraph = paragraph.replace("\n", " ")
-                # Clean up multiple spaces
-                processed_paragraph = " ".join(processed_paragraph.split())
-                processed_paragraphs.append(processed_paragraph)
-
-        # Join paragraphs with <br><br> for proper table display
-        result = "<br><br>".join(processed_paragraphs)
-
-        # Step 4 & 5: Truncate at max length and add ellipses with link if needed
-        # If max_length is 0 or less, disable truncation
-        if max_length > 0 and len(result) > max_length:
-            truncated = truncate_preserving_tokens(result, max_length, MD_ATOMIC_TOKENS)
+    @override
+    def _table_atomic_tokens(self) -> re.Pattern[str]:
+        """Never split Markdown links or inline code spans."""
+        return MD_ATOMIC_TOKENS
 
-            # Add ellipses with link
-            if variable_name:
-                link_target = f"{anchor_prefix}{variable_name}"
-                result = f"{truncated} […](#{link_target})"
-            else:
-                result = f"{truncated} […]"
+    @override
+    def _table_ellipsis(self, link_target: str | None) -> str:
+        """Markdown ellipsis, linking to the variable's section."""
+        return f"[…](#{link_target})" if link_target else "[…]"
 
-        # Escape unescaped pipes so description text cannot break the table row
-        return re.sub(r"(?<!\\)\|", r"\\|", result)
+    @override
+    def _escape_table_cell(self, text: str) -> str:
+        """Escape unescaped pipes so text cannot break the table row."""
+        if "|" not in text:
+            return text
+        return re.sub(r"(?<!\\)\|", r"\\|", text)
 
 
 class RSTDocumentationGenerator(BaseDocumentationGenerator):
@@ -374,65 +473,19 @@ class RSTDocumentationGenerator(BaseDocumentationGenerator):
         return rst_inline_literal(text)
 
     @override
-    def _format_table_description_filter(
-        self,
-        description: Any,
-        variable_name: str | None = None,
-        max_length: int = TABLE_DESCRIPTION_MAX_LENGTH,
-        anchor_prefix: str = "variable-",
-    ) -> str:
-        """Format description for reStructuredText table display with HTML stripping.
-
-        Args:
-            description: The description content to format
-            variable_name: Optional variable name for creating anchor links
-            max_length: Maximum length before truncation. Use 0 to disable.
-        """
-        text = normalize_description(description)
-        if not text:
-            return ""
-
-        # Step 0: Convert Ansible markup (C(...), O(...), ...) to RST
-        text = convert_ansible_markup(text, "rst", self._role_options)
+    def _table_paragraph_separator(self) -> str:
+        """Join paragraphs with | for RST table line continuation."""
+        return " | "
 
-        # Step 1: Strip all HTML tags using proper HTML parser
-        text = HTMLStripper.strip_tags(text)
-
-        # Step 2 & 3: Process multiline descriptions for RST table display
-        # Replace line breaks with spaces for single-line table cells
-        text = text.replace("\r\n", "\n").replace("\r", "\n")
-
-        # For RST tables, we need to handle multiline content differently
-        # Replace paragraph breaks with | (pipe) for RST table continuation
-        paragraphs = text.split("\n\n")
-        processed_paragraphs = []
-
-        for paragraph in paragraphs:
-            if paragraph.strip():
-                # Replace single newlines within paragraph with spaces
-                processed_paragraph = paragraph.replace("\n", " ")
-                # Clean up multiple spaces
-                processed_paragraph = " ".join(processed_paragraph.split())
-                processed_paragraphs.append(processed_paragraph)
-
-        # Join paragraphs with | for RST table line continuation
-        result = " | ".join(processed_paragraphs)
-
-        # Step 4 & 5: Truncate at max length and add ellipses with link if needed
-        # If max_length is 0 or less, disable truncation
-        if max_length > 0 and len(result) > max_length:
-            truncated = truncate_preserving_tokens(
-                result, max_length, RST_ATOMIC_TOKENS
-            )
-
-            # Add ellipses with link (RST format)
-            if variable_name:
-                link_target = f"{anchor_prefix}{variable_name}"
-                result = f"{truncated} `[…] <#{link_target}>`__"
-            else:
-                result = f"{truncated} […]"
+    @override
+    def _table_atomic_tokens(self) -> re.Pattern[str]:
+        """Never split RST hyperlinks or inline literals."""
+        return RST_ATOMIC_TOKENS
 
-        return result
+    @override
+    def _table_ellipsis(self, link_target: str | None) -> str:
+        """RST ellipsis, linking to the variable's section."""
+        return f"`[…] <#{link_target}>`__" if link_target else "[…]"
 
     def _csv_escape_filter(self, value: Any) -> str:
         """Escape double quotes in strings for CSV format.
@@ -35,3 +35,9 @@ class FileOperationError(AnsibleDocSmithError):
     """Raised when file operations fail."""
 
     pass
+
+
+class GitError(AnsibleDocSmithError):
+    """Raised when a git command fails."""
+
+    pass
@@ -0,0 +1,149 @@
+"""Executors for processing roles in parallel.
+
+Roles are independent of each other, so the roles of a collection (and
+several role paths) can be processed at the same time:
+
+- Threads share the processors' parsers, generators and loaded templates
+  (see ComponentCache). On free-threaded Python builds (no GIL), they run
+  truly in parallel without any copying or worker startup.
+- Processes run in parallel on every Python build. Each role is sent to a
+  worker as a picklable RoleTask; every worker loads its own parsers and
+  templates once (ComponentCache.shared()) and sends the results back.
+"""
+
+import os
+import sys
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from ..constants import EXECUTOR_TYPES
+from .parser import SpecLimits
+from .processor import ComponentCache, ProcessingResults, RoleProcessor
+from .sources import FileSource, TreeSource
+
+
+def free_threaded() -> bool:
+    """Return whether Python runs without the GIL (like CPython 3.13t)."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def resolve_executor_type(executor_type: str) -> str:
+    """Return the executor type to use ("thread" or "process").
+
+    Raises:
+        ValueError: If the type is none of EXECUTOR_TYPES
+    """
+    executor_type = executor_type.lower()
+    if executor_type not in EXECUTOR_TYPES:
+        raise ValueError(
+            f"Executor must be one of {', '.join(map(repr, EXECUTOR_TYPES))}"
+        )
+    if executor_type == "auto":
+        return "thread" if free_threaded() else "process"
+    return executor_type
+
+
+def create_executor(executor_type: str, jobs: int | None = None) -> Executor:
+    """Create an executor for processing roles in parallel.
+
+    Args:
+        executor_type: One of EXECUTOR_TYPES
+        jobs: Number of worker threads or processes; the number of CPUs
+            if None
+
+    Raises:
+        ValueError: If the type is unknown or jobs is less than 1
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1")
+    if resolve_executor_type(executor_type) == "thread":
+        return ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="docsmith")
+    return ProcessPoolExecutor(max_workers=jobs)
+
+
+@dataclass(frozen=True)
+class RoleTask:
+    """A role to process in a worker process (picklable)."""
+
+    role_path: Path
+    dry_run: bool
+    template_readme: Path | None
+    toc_bullet_style: str | None
+    format_type: str
+    defaults_comments_nested: bool
+    spec_limits: SpecLimits | None
+    fail_fast: bool
+    source: FileSource
+    generate_readme: bool
+    update_defaults: bool
+    collect_timings: bool = False
+    collect_spans: bool = False
+
+    def run(self) -> ProcessingResults:
+        """Process the role with the worker's shared components."""
+        return RoleProcessor(
+            dry_run=self.dry_run,
+            template_readme=self.template_readme,
+            toc_bullet_style=self.toc_bullet_style,
+            format_type=self.format_type,
+            role_path=self.role_path,
+            defaults_comments_nested=self.defaults_comments_nested,
+            spec_limits=self.spec_limits,
+            fail_fast=self.fail_fast,
+            components=ComponentCache.shared(),
+            source=self.source,
+            collect_timings=self.collect_timings,
+            collect_spans=self.collect_spans,
+        ).process_role(
+            self.role_path,
+            generate_readme=self.generate_readme,
+            update_defaults=self.update_defaults,
+        )
+
+
+def submit_role(
+    executor: Executor,
+    processor: RoleProcessor,
+    role_path: Path,
+    generate_readme: bool = True,
+    update_defaults: bool = True,
+) -> "Future[ProcessingResults]":
+    """Schedule processing a role like processor.process_role() does.
+
+    Thread pools run the processor itself, sharing its components. Other
+    executors (process pools) get a RoleTask with the processor's options
+    instead, including its source: file system sources are cheap to send,
+    of read-only sources (git, tarballs) only a view of the role directory
+    is copied to the worker.
+    """
+    if isinstance(executor, ThreadPoolExecutor):
+        return executor.submit(
+            processor.process_role,
+            role_path,
+            generate_readme=generate_readme,
+            update_defaults=update_defaults,
+        )
+    task = RoleTask(
+        role_path=role_path,
+        dry_run=processor.dry_run,
+        template_readme=processor.template_readme,
+        toc_bullet_style=processor.toc_bullet_style,
+        format_type=processor.format_type,
+        defaults_comments_nested=processor.defaults_comments_nested,
+        spec_limits=processor.spec_limits,
+        fail_fast=processor.fail_fast,
+        source=(
+            processor.source.view(role_path)
+            if isinstance(processor.source, TreeSource)
+            else processor.source
+        ),
+        generate_readme=generate_readme,
+        update_defaults=update_defaults,
+        collect_timings=processor.collect_timings,
+        collect_spans=processor.collect_spans,
+    )
+    return executor.submit(task.run)
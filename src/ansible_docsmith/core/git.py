@@ -0,0 +1,107 @@
+"""Access to the local git repository.
+
+Only plain, local git commands are used (no network access), so change
+detection works offline and in shallow CI clones that contain the
+requested ref.
+"""
+
+import fnmatch
+import subprocess
+from pathlib import Path
+
+from ..constants import GIT_DEPENDENCY_PIN_FILES
+from .exceptions import GitError
+
+
+def run_git(args: list[str], cwd: Path) -> str:
+    """Run a git command and return its output.
+
+    Raises:
+        GitError: If git is not installed or the command fails
+    """
+    try:
+        completed = subprocess.run(
+            ["git", *args],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            check=False,
+        )
+    except FileNotFoundError as e:
+        raise GitError("git is not installed or not in PATH") from e
+
+    if completed.returncode != 0:
+        message = completed.stderr.strip() or f"exit code {completed.returncode}"
+        raise GitError(f"'git {' '.join(args)}' failed: {message}")
+    return completed.stdout
+
+
+def repository_root(path: Path) -> Path:
+    """Return the top-level directory of the repository containing path."""
+    return Path(run_git(["rev-parse", "--show-toplevel"], path).strip())
+
+
+def changed_files(path: Path, since: str) -> list[Path]:
+    """Return the files of a repository changed since a git ref.
+
+    Includes committed, staged and unstaged changes as well as untracked
+    (not ignored) files. Renamed files are listed with their old and new
+    path, deleted files with their old path.
+
+    Args:
+        path: Any directory inside the repository
+        since: Git ref (branch, tag, commit) to compare the working tree to
+
+    Returns:
+        Absolute paths of the changed files, sorted
+
+    Raises:
+        GitError: If path is not inside a git repository, the ref is
+            unknown or git fails otherwise
+    """
+    root = repository_root(path)
+    try:
+        run_git(["rev-parse", "--verify", "--quiet", f"{since}^{{commit}}"], root)
+    except GitError as e:
+        raise GitError(f"Unknown git ref '{since}'") from e
+
+    names = run_git(["diff", "--name-only", "--no-renames", "-z", since], root)
+    untracked = run_git(["ls-files", "--others", "--exclude-standard", "-z"], root)
+    return sorted({root / name for name in (names + untracked).split("\0") if name})
+
+
+def docsmith_pin_changed(path: Path, since: str, files: list[Path]) -> bool:
+    """Return whether the pinned DocSmith version changed since a git ref.
+
+    Checks the changed dependency pin files (see GIT_DEPENDENCY_PIN_FILES)
+    for diff hunks mentioning DocSmith. The hunks include a few lines of
+    context, which catches lock files listing the package name and its
+    version on adjacent lines, too.
+
+    Args:
+        path: Any directory inside the repository
+        since: Git ref to compare the working tree to
+        files: Changed files, as returned by changed_files()
+    """
+    pin_files = [
+        str(file)
+        for file in files
+        if any(
+            fnmatch.fnmatch(file.name, pattern) for pattern in GIT_DEPENDENCY_PIN_FILES
+        )
+    ]
+    if not pin_files:
+        return False
+
+    diff = run_git(["diff", "--no-renames", since, "--", *pin_files], path)
+    # Content and context lines of the current hunk (file headers excluded)
+    hunk: list[str] = []
+    for line in [*diff.splitlines(), "@@"]:
+        if line.startswith(("@@", "diff ")):
+            if any("docsmith" in hunk_line.lower() for hunk_line in hunk):
+                return True
+            hunk = []
+        elif line[:1] in (" ", "+", "-") and not line.startswith(("+++", "---")):
+            hunk.append(line)
+    return False
@@ -19,10 +19,12 @@ from collections.abc import Callable, Collection, Mapping
 from antsibull_docs_parser import dom
 from antsibull_docs_parser.parser import Context, Whitespace, parse
 
+from .timing import timed
+
 # Role options for O(...) anchor linking: either a plain collection of
 # top-level option names (anchor scheme "variable-<name>") or a mapping
-# of option names to explicit anchors (None marks ambiguous names that
-# must not be linked).
+# of dotted option paths like "name" or "parent.child" to explicit
+# anchors (None marks ambiguous paths that must not be linked).
 RoleOptions = Collection[str] | Mapping[str, "str | None"]
 
 # Fast gate: only text matching this can contain Ansible markup. Chunks
@@ -103,10 +105,11 @@ def _render_md_part(part: dom.AnyPart, role_options: RoleOptions) -> str:
         return md_code_span(part.text)
     if part.type == dom.PartType.OPTION_NAME:
         display = md_code_span(_option_display(part))
-        # Link only plain top-level options of this role; DocSmith's README
-        # sections provide a matching anchor for those.
-        if part.plugin is None and part.link == [part.name]:
-            anchor = _option_anchor(role_options, part.name)
+        # Link only options of this role; DocSmith's README sections
+        # provide a matching anchor for those (nested options only with
+        # an anchor mapping, see RoleOptions)
+        if part.plugin is None:
+            anchor = _option_anchor(role_options, ".".join(part.link))
             if anchor:
                 return f"[{display}](#{anchor})"
         return display
@@ -240,6 +243,7 @@ def lint_ansible_markup(text: str) -> list[str]:
     return errors
 
 
+@timed("markup")
 def convert_ansible_markup(
     text: str,
     target: str,
@@ -250,11 +254,12 @@ def convert_ansible_markup(
     Args:
         text: Input text, may freely mix Ansible markup with Markdown.
         target: Output format, "markdown" or "rst".
-        role_options: Top-level option names of the current role. When
-            given (Markdown only), ``O(name)`` references to these options
+        role_options: Option names of the current role. When given
+            (Markdown only), ``O(name)`` references to these options
             become links to DocSmith's README anchors: either a collection
-            of names (anchor scheme ``variable-<name>``) or a mapping of
-            names to explicit anchors (``None`` values are not linked).
+            of top-level names (anchor scheme ``variable-<name>``) or a
+            mapping of dotted option paths to explicit anchors, which also
+            links ``O(parent.child)`` (``None`` values are not linked).
 
     Returns:
         Text with Ansible markup rewritten. Text without markup is
@@ -0,0 +1,114 @@
+"""Rendering role documentation from file contents held in memory.
+
+render_role() takes the contents of ``meta/argument_specs.yml``, the
+``defaults/`` files and the README and returns their updated contents,
+without reading or writing any role files. It runs the same processing as
+``ansible-docsmith generate --dry-run`` on a MemorySource.
+
+All calls share one set of parsers and generators (see
+ComponentCache.shared()), created and with their templates loaded on the
+first call. They keep no per-call state, so render_role() is safe to call
+from many threads at once, e.g. in a documentation preview service.
+"""
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .parser import SpecLimits
+from .processor import ComponentCache, RoleProcessor
+from .sources import MemorySource
+
+# Virtual directory the role files are placed in; never accessed
+_MEMORY_ROOT = Path("/ansible-docsmith-memory")
+
+
+@dataclass(frozen=True)
+class RenderedRole:
+    """Updated contents and diagnostics of an in-memory render."""
+
+    # Updated README content; None if no README was generated
+    readme: str | None
+    # defaults/ file name (like "main.yml") -> updated content, for all
+    # given defaults files (unchanged ones with their original content)
+    defaults: dict[str, str] = field(default_factory=dict)
+    errors: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+    notices: list[str] = field(default_factory=list)
+
+
+def render_role(
+    argument_specs: str,
+    defaults: Mapping[str, str] | None = None,
+    readme: str | None = None,
+    *,
+    role_name: str = "role",
+    format_type: str = "markdown",
+    toc_bullet_style: str | None = None,
+    defaults_comments_nested: bool = True,
+    generate_readme: bool = True,
+    update_defaults: bool = True,
+    spec_limits: SpecLimits | None = None,
+) -> RenderedRole:
+    """Render the documentation of a role given as file contents.
+
+    Args:
+        argument_specs: Content of meta/argument_specs.yml
+        defaults: defaults/ file name (like "main.yml") -> content
+        readme: Current README content; None to create a new README
+        role_name: Name of the role, as used in the README
+        format_type: README format, "markdown" or "rst"
+        toc_bullet_style: Bullet style of the README TOC ("*" or "-");
+            detected from the README if None
+        defaults_comments_nested: Document nested options in the comments
+            of the defaults files
+        generate_readme: Render the README
+        update_defaults: Add comments to the defaults files
+        spec_limits: Limits for parsing the argument specs
+
+    Returns:
+        The updated contents; errors (like invalid specs or README
+        markers) are reported in RenderedRole.errors instead of raised
+
+    Raises:
+        ValueError: If format_type or role_name is invalid
+    """
+    if format_type not in ("markdown", "rst"):
+        raise ValueError("Format must be 'markdown' or 'rst'")
+    if not role_name or "/" in role_name or role_name in (".", ".."):
+        raise ValueError(f"Invalid role name '{role_name}'")
+
+    role_path = _MEMORY_ROOT / role_name
+    readme_name = "README.rst" if format_type == "rst" else "README.md"
+    defaults = dict(defaults or {})
+    files = {"meta/argument_specs.yml": argument_specs}
+    files.update((f"defaults/{name}", content) for name, content in defaults.items())
+    if readme is not None:
+        files[readme_name] = readme
+
+    results = RoleProcessor(
+        toc_bullet_style=toc_bullet_style,
+        format_type=format_type,
+        role_path=role_path,
+        defaults_comments_nested=defaults_comments_nested,
+        spec_limits=spec_limits,
+        components=ComponentCache.shared(),
+        source=MemorySource(role_path, files),
+    ).process_role(
+        role_path, generate_readme=generate_readme, update_defaults=update_defaults
+    )
+
+    new_contents = {
+        path.relative_to(role_path).as_posix(): new_content
+        for path, _old_content, new_content in results.file_diffs
+    }
+    return RenderedRole(
+        readme=new_contents.get(readme_name),
+        defaults={
+            name: new_contents.get(f"defaults/{name}", content)
+            for name, content in defaults.items()
+        },
+        errors=list(results.errors),
+        warnings=[*results.validation_warnings, *results.warnings],
+        notices=list(results.validation_notices),
+    )
@@ -0,0 +1,130 @@
+"""Flattened index of (nested) option specs.
+
+Argument specs nest options ("dict attributes") below other options.
+Validators, renderers and anchor resolution all need to visit every
+option together with its path, nesting depth and README anchor. Instead
+of walking the tree recursively in each consumer, the tree is flattened
+once into an ordered mapping of option paths (tuples of option names) to
+entries:
+
+    {("tls",): <depth 0>, ("tls", "cert"): <depth 1>, ...}
+
+Option names may contain dots, so paths are never split from or keyed by
+their dotted form.
+
+The order is depth-first pre-order, i.e. the order in which the options
+appear in the spec file, with every option directly followed by its
+nested options.
+"""
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class OptionIndexEntry:
+    """One option of a flattened option tree."""
+
+    # Option name (last path segment)
+    name: str
+    # Option names from the top-level option, e.g. ("tls", "cert", "path")
+    names: tuple[str, ...]
+    # Dotted path as used by O(...) references and in messages, e.g.
+    # "tls.cert.path"; ambiguous if option names contain dots
+    path: str
+    # Option spec (normalized or raw, depending on the indexed tree)
+    spec: dict[str, Any]
+    # Nesting depth; 0 for top-level options
+    depth: int
+    # README anchor relative to the entry point's variable anchor prefix,
+    # e.g. "tls-sub-cert-sub-path" (see the README templates)
+    anchor: str
+    # Names of the parent option, None for top-level options
+    parent: tuple[str, ...] | None
+
+
+OptionIndex = dict[tuple[str, ...], OptionIndexEntry]
+
+
+def build_option_index(options: Any, depth: int = 0) -> OptionIndex:
+    """Flatten an option tree into an ordered names -> entry mapping.
+
+    Works on normalized and raw (unnormalized) specs alike: option specs
+    that are not mappings, and "options" values that are not mappings,
+    are skipped, so malformed specs never raise here. Option mappings that
+    contain themselves (cycles) are not descended into again.
+
+    Args:
+        options: Mapping of option names to option specs
+        depth: Depth of the given options; subtrees indexed on their own
+            (like the nested options of one variable) start at 1
+    """
+    index: OptionIndex = {}
+    if not isinstance(options, dict):
+        return index
+
+    # Explicit stack of (parent entry, options mapping, remaining children)
+    # in pre-order; the ids of the mappings on the stack guard against cycles
+    stack: list[
+        tuple[OptionIndexEntry | None, dict[Any, Any], Iterator[tuple[Any, Any]]]
+    ] = [(None, options, iter(options.items()))]
+    on_stack = {id(options)}
+    while stack:
+        parent, mapping, children = stack[-1]
+        child = next(children, None)
+        if child is None:
+            stack.pop()
+            on_stack.discard(id(mapping))
+            continue
+
+        name, spec = child
+        if not isinstance(spec, dict):
+            continue
+        entry = OptionIndexEntry(
+            name=str(name),
+            names=(*parent.names, str(name)) if parent else (str(name),),
+            path=f"{parent.path}.{name}" if parent else str(name),
+            spec=spec,
+            depth=parent.depth + 1 if parent else depth,
+            anchor=f"{parent.anchor}-sub-{name}" if parent else str(name),
+            parent=parent.names if parent else None,
+        )
+        index[entry.names] = entry
+
+        nested = spec.get("options")
+        if isinstance(nested, dict) and nested and id(nested) not in on_stack:
+            stack.append((entry, nested, iter(nested.items())))
+            on_stack.add(id(nested))
+
+    return index
+
+
+def build_option_indexes(specs: dict[str, Any]) -> dict[str, OptionIndex]:
+    """Index the options of every entry point of (normalized) specs.
+
+    ArgumentSpecParser.validate_structure() returns these indexes next to
+    the specs, so README rendering and defaults comments share them.
+    """
+    return {
+        entry_point: build_option_index(entry_spec.get("options") or {})
+        for entry_point, entry_spec in specs.items()
+        if isinstance(entry_spec, dict)
+    }
+
+
+def group_nested_options(index: OptionIndex) -> dict[str, list[OptionIndexEntry]]:
+    """Group nested entries by their top-level option, keeping the order.
+
+    Returns:
+        Mapping of every top-level option name to the (possibly empty)
+        list of all its nested options in pre-order.
+    """
+    groups: dict[str, list[OptionIndexEntry]] = {}
+    current: list[OptionIndexEntry] = []
+    for entry in index.values():
+        if entry.parent is None:
+            current = groups.setdefault(entry.name, [])
+        else:
+            current.append(entry)
+    return groups
@@ -1,29 +1,127 @@
 """Parser for Ansible argument_specs.yml files."""
 
+import threading
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
 from ruamel.yaml import YAML
+from ruamel.yaml.constructor import ConstructorError, RoundTripConstructor
 from ruamel.yaml.error import YAMLError
+from typing_extensions import override
 
+from ..constants import SPEC_MAX_FILE_SIZE, SPEC_MAX_NESTED_DEPTH, SPEC_MAX_OPTIONS
 from .exceptions import ParseError, ValidationError
+from .options import build_option_indexes
+from .sources import FILE_SYSTEM, FileSource
+from .timing import timed
 
 
-class ArgumentSpecParser:
-    """Parser for argument_specs.yml with validation."""
+@dataclass(frozen=True)
+class SpecLimits:
+    """Limits applied while parsing an argument spec file.
+
+    Specs exceeding any limit are rejected with a ParseError before (file
+    size) or while (depth, option count) they are normalized.
+    """
+
+    # Maximum nesting depth of options; top-level options have depth 0
+    max_depth: int = SPEC_MAX_NESTED_DEPTH
+    # Maximum number of options over all entry points, nested ones included
+    max_options: int = SPEC_MAX_OPTIONS
+    # Maximum size of the spec file in bytes
+    max_file_size: int = SPEC_MAX_FILE_SIZE
+
+
+class NonRecursiveConstructor(RoundTripConstructor):
+    """Round-trip constructor rejecting recursive YAML aliases.
+
+    ruamel.yaml loads an alias inside the very node it refers to (like
+    ``options: &o {a: {options: *o}}``) as None, which would only surface
+    later as a misleading "must be a dictionary" error.
+    """
+
+    @override
+    def construct_object(self, node: Any, deep: bool = False) -> Any:
+        if node in self.recursive_objects and node not in self.constructed_objects:
+            raise ConstructorError(
+                None,
+                None,
+                "found recursive alias (the anchored node contains itself)",
+                node.start_mark,
+            )
+        return super().construct_object(node, deep)
 
-    def __init__(self) -> None:
+
+class ThreadLocalYAML(threading.local):
+    """Round-trip YAML loader, one instance per thread.
+
+    ruamel.yaml keeps the state of the document being loaded on the YAML
+    object, so a shared parser or generator must not load with a single
+    instance from several threads at once.
+    """
+
+    def __init__(self, constructor: type[RoundTripConstructor] | None = None) -> None:
+        """Create the loader of the current thread.
+
+        Args:
+            constructor: Constructor class replacing ruamel.yaml's default
+                round-trip constructor
+        """
         self.yaml = YAML()
+        if constructor is not None:
+            self.yaml.Constructor = constructor
         self.yaml.preserve_quotes = True
         self.yaml.explicit_start = True
         self.yaml.indent(mapping=2, sequence=4, offset=2)
 
-    def parse_file(self, file_path: Path) -> dict[str, Any]:
+
+class ArgumentSpecParser:
+    """Parser for argument_specs.yml with validation."""
+
+    def __init__(self, limits: SpecLimits | None = None) -> None:
+        self.limits = limits or SpecLimits()
+        self._yaml = ThreadLocalYAML(NonRecursiveConstructor)
+
+    @property
+    def yaml(self) -> YAML:
+        """Return the YAML loader of the current thread."""
+        return self._yaml.yaml
+
+    def parse_file(
+        self, file_path: Path, source: FileSource | None = None
+    ) -> dict[str, Any]:
         """Parse argument_specs.yml file with comprehensive error handling."""
+        return self.parse_file_with_original(file_path, source)[0]
+
+    @timed("yaml")
+    def parse_file_with_original(
+        self, file_path: Path, source: FileSource | None = None
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Parse argument_specs.yml, returning normalized and raw specs.
+
+        The raw (unnormalized) specs preserve unknown keys and which keys
+        were set explicitly, as several validation checks need. Returning
+        both saves loading the YAML file a second time.
+
+        Args:
+            file_path: Path of the argument_specs.yml file
+            source: Source to read the file from (default: file system)
+
+        Returns:
+            Tuple of (normalized specs, raw "argument_specs" mapping)
+        """
+        source = source or FILE_SYSTEM
 
         try:
-            with open(file_path, encoding="utf-8") as file:
-                data = self.yaml.load(file)
+            file_size = source.size(file_path)
+            if file_size > self.limits.max_file_size:
+                raise ParseError(
+                    f"File too large: {file_path} ({file_size} bytes, "
+                    f"limit is {self.limits.max_file_size} bytes)"
+                )
+
+            data = self.yaml.load(source.read_text(file_path))
 
             if not data:
                 raise ParseError(f"Empty or invalid YAML file: {file_path}")
@@ -31,12 +129,19 @@ class ArgumentSpecParser:
             if "argument_specs" not in data:
                 raise ParseError(f"Missing 'argument_specs' key in {file_path}")
 
-            return self._normalize_specs(data["argument_specs"])
+            original_specs = data["argument_specs"]
+            return self._normalize_specs(original_specs), original_specs
 
+        except ParseError:
+            raise
         except FileNotFoundError as e:
             raise ParseError(f"File not found: {file_path}") from e
         except YAMLError as e:
             raise ParseError(f"YAML parsing error in {file_path}: {e}") from e
+        except RecursionError as e:
+            # Raised by the (recursive) YAML composer for absurdly deep
+            # documents, before any of the limits can be applied
+            raise ParseError(f"YAML structure nested too deeply in {file_path}") from e
         except Exception as e:
             raise ParseError(f"Unexpected error parsing {file_path}: {e}") from e
 
@@ -44,6 +149,9 @@ class ArgumentSpecParser:
         """Normalize and validate argument specs structure."""
 
         normalized = {}
+        # Option budget and normalized subtrees shared by all entry points
+        remaining = [self.limits.max_options]
+        shared: dict[int, dict[str, Any]] = {}
 
         for entry_point, spec in specs.items():
             if not isinstance(spec, dict):
@@ -51,12 +159,15 @@ class ArgumentSpecParser:
                     f"Entry point '{entry_point}' must be a dictionary"
                 )
 
+            options = self._normalize_options(
+                spec.get("options", {}), remaining, shared
+            )
             normalized[entry_point] = {
                 "short_description": spec.get("short_description", ""),
                 "description": self._normalize_description(spec.get("description", [])),
                 "author": self._normalize_author(spec.get("author", [])),
                 "version_added": spec.get("version_added", ""),
-                "options": self._normalize_options(spec.get("options", {})),
+                "options": options,
             }
 
         return normalized
@@ -79,43 +190,181 @@ class ArgumentSpecParser:
             return [str(item) for item in author]
         return []
 
-    def _normalize_options(self, options: dict[str, Any]) -> dict[str, Any]:
-        """Normalize options with full parameter specifications."""
+    def _normalize_options(
+        self,
+        options: dict[str, Any],
+        remaining: list[int] | None = None,
+        shared: dict[int, dict[str, Any]] | None = None,
+    ) -> dict[str, Any]:
+        """Normalize options with full parameter specifications.
+
+        Nested options are processed with an explicit stack instead of
+        recursion, so the Python recursion limit never applies. Option
+        mappings reached more than once (YAML aliases like ``*tls_opts``
+        load as the very same object) are normalized once, and every use
+        shares the normalized result. Afterwards, the limits are checked
+        against the tree as it is documented, i.e. with all uses expanded.
+
+        Args:
+            options: Mapping of option names to raw option specs
+            remaining: Single-item list holding the number of options that
+                may still be documented; shared between calls to apply the
+                limit across entry points. Defaults to the full limit.
+            shared: Raw option mapping id -> normalized mapping, shared
+                between calls to share subtrees across entry points
+
+        Raises:
+            ValidationError: If an option spec is not a mapping
+            ParseError: If a limit is exceeded or the options contain
+                themselves (only possible for option dicts built in code;
+                the YAML loader already rejects recursive aliases)
+        """
+        if remaining is None:
+            remaining = [self.limits.max_options]
+        if shared is None:
+            shared = {}
+        if not isinstance(options, dict):
+            raise ValidationError("Options must be a dictionary")
+
+        normalized: dict[str, Any] = {}
+        shared[id(options)] = normalized
+
+        # Frames of (raw options, normalized target, parent path); the raw
+        # mappings stay alive during the parse, so their ids are stable
+        stack: list[tuple[dict[str, Any], dict[str, Any], str]]
+        stack = [(options, normalized, "")]
+        while stack:
+            raw_options, target, parent = stack.pop()
+
+            for param_name, param_spec in raw_options.items():
+                path = f"{parent}.{param_name}" if parent else str(param_name)
+                if not isinstance(param_spec, dict):
+                    raise ValidationError(f"Parameter '{path}' must be a dictionary")
+
+                nested = param_spec.get("options", {})
+                if not isinstance(nested, dict):
+                    raise ValidationError(
+                        f"Options of parameter '{path}' must be a dictionary"
+                    )
+
+                nested_normalized = shared.get(id(nested)) if nested else None
+                if nested_normalized is None:
+                    # Filled when the frame pushed here is processed; keeps
+                    # the key order identical to a recursive implementation
+                    nested_normalized = {}
+                    if nested:
+                        shared[id(nested)] = nested_normalized
+                        stack.append((nested, nested_normalized, path))
+
+                target[param_name] = {
+                    "type": param_spec.get("type", "str"),
+                    "required": param_spec.get("required", False),
+                    "default": param_spec.get("default"),
+                    "description": param_spec.get("description", ""),
+                    "choices": param_spec.get("choices", []),
+                    "elements": param_spec.get("elements"),
+                    "options": nested_normalized,
+                    "version_added": param_spec.get("version_added"),
+                }
+
+        self._check_limits(normalized, remaining)
+        return normalized
 
-        normalized = {}
+    def _check_limits(self, options: dict[str, Any], remaining: list[int]) -> None:
+        """Check normalized options against the depth and option count limits.
 
-        for param_name, param_spec in options.items():
-            if not isinstance(param_spec, dict):
-                raise ValidationError(f"Parameter '{param_name}' must be a dictionary")
-
-            normalized[param_name] = {
-                "type": param_spec.get("type", "str"),
-                "required": param_spec.get("required", False),
-                "default": param_spec.get("default"),
-                "description": param_spec.get("description", ""),
-                "choices": param_spec.get("choices", []),
-                "elements": param_spec.get("elements"),
-                "options": self._normalize_options(param_spec.get("options", {})),
-                "version_added": param_spec.get("version_added"),
-            }
+        Shared subtrees count once per use, as they are documented once per
+        use; their size is computed only once, though (post-order walk with
+        an explicit stack, memoized by mapping identity).
 
-        return normalized
+        Args:
+            options: Normalized options of one entry point
+            remaining: See _normalize_options(); reduced by the option count
 
-    def validate_structure(self, role_path: Path) -> dict[str, Any]:
+        Raises:
+            ParseError: If a limit is exceeded or the options contain
+                themselves (see _normalize_options())
+        """
+        # Normalized mapping id -> (number of options, deepest option depth)
+        measured: dict[int, tuple[int, int]] = {}
+        in_progress: set[int] = set()
+
+        # Frames of (options, path of their parent, children measured?)
+        stack: list[tuple[dict[str, Any], str, bool]] = [(options, "", False)]
+        while stack:
+            mapping, parent, children_done = stack.pop()
+            if id(mapping) in measured:
+                continue
+
+            children = [
+                (f"{parent}.{name}" if parent else str(name), spec["options"])
+                for name, spec in mapping.items()
+                if spec["options"]
+            ]
+            if not children_done:
+                in_progress.add(id(mapping))
+                stack.append((mapping, parent, True))
+                for path, nested in children:
+                    if id(nested) in in_progress:
+                        raise ParseError(
+                            f"Options of parameter '{path}' contain themselves"
+                        )
+                    stack.append((nested, path, False))
+                continue
+
+            count, height = len(mapping), 0
+            for _path, nested in children:
+                nested_count, nested_height = measured[id(nested)]
+                count += nested_count
+                height = max(height, nested_height + 1)
+            measured[id(mapping)] = (count, height)
+            in_progress.discard(id(mapping))
+
+        count, height = measured[id(options)]
+        if height > self.limits.max_depth:
+            path = self._deepest_path(options, measured)
+            raise ParseError(
+                f"Options nested too deeply at '{path}' "
+                f"(limit is {self.limits.max_depth} levels)"
+            )
+
+        remaining[0] -= count
+        if remaining[0] < 0:
+            raise ParseError(f"Too many options (limit is {self.limits.max_options})")
+
+    def _deepest_path(
+        self, options: dict[str, Any], measured: dict[int, tuple[int, int]]
+    ) -> str:
+        """Return the path of the first option exceeding the depth limit."""
+        names: list[str] = []
+        mapping = options
+        while len(names) <= self.limits.max_depth:
+            for name, spec in mapping.items():
+                nested = spec["options"]
+                if nested and measured[id(nested)][1] + 1 == measured[id(mapping)][1]:
+                    names.append(str(name))
+                    mapping = nested
+                    break
+        return ".".join(names)
+
+    def validate_structure(
+        self, role_path: Path, source: FileSource | None = None
+    ) -> dict[str, Any]:
         """Validate role structure and return metadata."""
+        source = source or FILE_SYSTEM
 
         # Check for required directories
         required_dirs = ["meta"]
         for dir_name in required_dirs:
             dir_path = role_path / dir_name
-            if not dir_path.exists():
+            if not source.exists(dir_path):
                 raise ValidationError(f"Required directory missing: {dir_path}")
 
         # Find argument_specs file
         spec_file = None
         for ext in ["yml", "yaml"]:
             candidate = role_path / "meta" / f"argument_specs.{ext}"
-            if candidate.exists():
+            if source.exists(candidate):
                 spec_file = candidate
                 break
 
@@ -123,7 +372,7 @@ class ArgumentSpecParser:
             raise ValidationError("No argument_specs.yml found in meta/ directory")
 
         # Parse and validate specs
-        specs = self.parse_file(spec_file)
+        specs, original_specs = self.parse_file_with_original(spec_file, source)
 
         # Ensure at least one entry point exists
         if not specs:
@@ -131,6 +380,10 @@ class ArgumentSpecParser:
 
         return {
             "specs": specs,
+            # Flattened view of all (nested) options per entry point, shared
+            # by README rendering, anchor resolution and defaults comments
+            "option_indexes": build_option_indexes(specs),
+            "original_specs": original_specs,
             "spec_file": spec_file,
             "role_name": role_path.name,
             "role_path": role_path,
@@ -1,40 +1,48 @@
 """Main processor for ansible-docsmith operations."""
 
+import contextlib
 import logging
-from dataclasses import dataclass
+import threading
+from collections.abc import Collection, MutableSequence
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
-from ..constants import SPEC_VALID_ENTRYPOINT_KEYS, SPEC_VALID_OPTION_KEYS
 from .defaults_comments import DefaultsCommentGenerator
+from .diffs import CompactFileDiffs, FileDiff
 from .doc_generators import (
     BaseDocumentationGenerator,
     create_documentation_generator,
 )
 from .exceptions import ProcessingError, ValidationError
-from .markup import lint_ansible_markup
-from .parser import ArgumentSpecParser
+from .options import OptionIndex
+from .parser import ArgumentSpecParser, SpecLimits
 from .readme_updater import ReadmeUpdater
+from .sources import FILE_SYSTEM, FileSource
+from .timing import Span, collect_timings, stage, timed
+from .validators import SpecCheckContext, run_spec_checks
 
 LOGGER = logging.getLogger(__name__)
 
 
-def detect_format_from_role(role_path: Path) -> str:
+def detect_format_from_role(role_path: Path, source: FileSource | None = None) -> str:
     """Auto-detect format based on existing README files in role directory.
 
     Args:
         role_path: Path to the role directory
+        source: Source to read the role from (default: file system)
 
     Returns:
         'rst' if README.rst exists, 'markdown' if README.md exists or neither exists
     """
+    source = source or FILE_SYSTEM
     rst_readme = role_path / "README.rst"
     md_readme = role_path / "README.md"
 
     # If both exist, prefer RST (since it's more specific)
-    if rst_readme.exists():
+    if source.exists(rst_readme):
         return "rst"
-    elif md_readme.exists():
+    elif source.exists(md_readme):
         return "markdown"
     else:
         # Default to markdown if neither exists
@@ -48,10 +56,130 @@ class ProcessingResults:
     operations: list[tuple[Path, str, str]]  # (file, action, status)
     errors: list[str]
     warnings: list[str]
-    file_diffs: list[tuple[Path, str, str]]  # (file, old_content, new_content)
+    # (file, old_content, new_content); a list or, to keep memory low in
+    # large dry runs, CompactFileDiffs
+    file_diffs: MutableSequence[FileDiff]
     # Full README content after the update (also set in dry-run mode);
     # used for collection READMEs referencing role documentation
     readme_content: str | None = None
+    # Warnings and notices of the validation run before processing (errors
+    # end up in "errors"); reported by the "ci" command
+    validation_warnings: list[str] = field(default_factory=list)
+    validation_notices: list[str] = field(default_factory=list)
+    # Seconds spent per processing stage (like "validate" or "markup"), if
+    # collected (see RoleProcessor); not compared, as they differ from run
+    # to run
+    timings: dict[str, float] = field(default_factory=dict, compare=False)
+    # Spans of the role and its stages, if collected (see core.trace)
+    spans: list[Span] = field(default_factory=list, compare=False)
+
+    def merge(self, other: "ProcessingResults", prefix: str = "") -> None:
+        """Add the results of another run, prefixing its messages.
+
+        Args:
+            other: Results to add (its readme_content is not taken over)
+            prefix: Prefix for the errors, warnings and notices, like
+                "Role 'name': "
+        """
+        self.operations.extend(other.operations)
+        self.file_diffs.extend(other.file_diffs)
+        self.errors.extend(f"{prefix}{error}" for error in other.errors)
+        self.warnings.extend(f"{prefix}{warning}" for warning in other.warnings)
+        self.validation_warnings.extend(
+            f"{prefix}{warning}" for warning in other.validation_warnings
+        )
+        self.validation_notices.extend(
+            f"{prefix}{notice}" for notice in other.validation_notices
+        )
+        for name, seconds in other.timings.items():
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+        self.spans.extend(other.spans)
+
+    def changed_files(self) -> list[Path]:
+        """Return the files whose content would change (dry-run diffs)."""
+        if isinstance(self.file_diffs, CompactFileDiffs):
+            # Compares digests, without decompressing the contents
+            return self.file_diffs.changed_files()
+        return [
+            file_path
+            for file_path, old_content, new_content in self.file_diffs
+            if old_content != new_content
+        ]
+
+
+class ComponentCache:
+    """Parsers and generators shared by the processors of one run.
+
+    Creating a documentation generator loads and compiles its templates.
+    Processors of the same run (all roles of a collection, or all paths
+    given on the command line) share one instance per configuration
+    instead of creating them again for every role.
+    """
+
+    # Process-wide instance, see shared()
+    _shared: "ComponentCache | None" = None
+    _shared_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "ComponentCache":
+        """Return an instance shared by all callers in this process.
+
+        The parsers and generators keep no per-call state, so concurrent
+        renders (threads of a pool, asyncio tasks) can share them along
+        with their loaded templates.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def __init__(self) -> None:
+        self._parsers: dict[SpecLimits | None, ArgumentSpecParser] = {}
+        self._doc_generators: dict[
+            tuple[str, Path | None], BaseDocumentationGenerator
+        ] = {}
+        self._readme_updaters: dict[tuple[str, str | None], ReadmeUpdater] = {}
+        self._defaults_generators: dict[bool, DefaultsCommentGenerator] = {}
+        # Processors in several threads create each component only once
+        self._lock = threading.Lock()
+
+    def parser(self, limits: SpecLimits | None = None) -> ArgumentSpecParser:
+        with self._lock:
+            if limits not in self._parsers:
+                self._parsers[limits] = ArgumentSpecParser(limits=limits)
+            return self._parsers[limits]
+
+    def doc_generator(
+        self, format_type: str, template_file: Path | None = None
+    ) -> BaseDocumentationGenerator:
+        key = (format_type, template_file)
+        with self._lock:
+            if key not in self._doc_generators:
+                self._doc_generators[key] = create_documentation_generator(
+                    format_type=format_type, template_file=template_file
+                )
+            return self._doc_generators[key]
+
+    def readme_updater(
+        self, format_type: str, toc_bullet_style: str | None = None
+    ) -> ReadmeUpdater:
+        key = (format_type, toc_bullet_style)
+        with self._lock:
+            if key not in self._readme_updaters:
+                self._readme_updaters[key] = ReadmeUpdater(
+                    format_type=format_type, toc_bullet_style=toc_bullet_style
+                )
+            return self._readme_updaters[key]
+
+    def defaults_generator(
+        self, nested_options: bool = True
+    ) -> DefaultsCommentGenerator:
+        with self._lock:
+            if nested_options not in self._defaults_generators:
+                self._defaults_generators[nested_options] = DefaultsCommentGenerator(
+                    nested_options=nested_options
+                )
+            return self._defaults_generators[nested_options]
 
 
 class RoleProcessor:
@@ -65,15 +193,36 @@ class RoleProcessor:
         format_type: str = "auto",
         role_path: Path | None = None,
         defaults_comments_nested: bool = True,
+        spec_limits: SpecLimits | None = None,
+        fail_fast: bool = False,
+        components: ComponentCache | None = None,
+        source: FileSource | None = None,
+        collect_timings: bool = False,
+        collect_spans: bool = False,
     ):
-        self.dry_run = dry_run
+        # Files are read from (and written to) the source; read-only sources
+        # (like git objects) always run in dry-run mode
+        self.source = source or FILE_SYSTEM
+        self.dry_run = dry_run or self.source.read_only
+        # Parsers and generators, possibly shared with other processors
+        self.components = components or ComponentCache()
+        # Stop at the first error or, in dry-run mode, at the first file
+        # that would change; the remaining work cannot change the outcome
+        self.fail_fast = fail_fast
         self.template_readme = template_readme
         self.toc_bullet_style = toc_bullet_style
         self.role_path = role_path
+        self.defaults_comments_nested = defaults_comments_nested
+        self.spec_limits = spec_limits
+        # Add the time spent per stage to ProcessingResults.timings (see
+        # core.timing) and, for traces, their spans to .spans; off by
+        # default, as it costs a little time
+        self.collect_timings = collect_timings or collect_spans
+        self.collect_spans = collect_spans
 
         # Resolve format type
         if format_type.lower() == "auto" and role_path:
-            self.format_type = detect_format_from_role(role_path)
+            self.format_type = detect_format_from_role(role_path, self.source)
         elif format_type.lower() == "auto":
             # Defer format detection until role_path is known
             self.format_type = "auto"
@@ -81,101 +230,96 @@ class RoleProcessor:
             self.format_type = format_type.lower()
 
         # Initialize components
-        self.parser = ArgumentSpecParser()
-
-        # For auto format, defer generator initialization until format is resolved
-        if self.format_type == "auto":
-            self.doc_generator = None
-            self.readme_updater = None
-        else:
-            self.doc_generator = create_documentation_generator(
-                format_type=self.format_type, template_file=template_readme
-            )
-            self.readme_updater = ReadmeUpdater(
-                format_type=self.format_type, toc_bullet_style=toc_bullet_style
-            )
-
-        self.defaults_generator = DefaultsCommentGenerator(
-            nested_options=defaults_comments_nested
+        self.parser = self.components.parser(spec_limits)
+
+        # README generators of the configured format; with "auto", the
+        # format (and generators) are looked up per role
+        self.doc_generator: BaseDocumentationGenerator | None = None
+        self.readme_updater: ReadmeUpdater | None = None
+        if self.format_type != "auto":
+            self.doc_generator = self._doc_generator_for(self.format_type)
+            self.readme_updater = self._readme_updater_for(self.format_type)
+
+        self.defaults_generator = self.components.defaults_generator(
+            defaults_comments_nested
         )
 
-    def _resolve_auto_format(self, role_path: Path) -> None:
-        """Resolve auto format detection and initialize generators if needed."""
+    def readme_format(self, role_path: Path) -> str:
+        """Return the README format of a role ("markdown" or "rst").
+
+        This is the configured format or, with "auto", the one detected
+        from the role's README files. The processor itself is not changed,
+        so it can process roles of different formats, also concurrently.
+        """
         if self.format_type == "auto":
-            self.format_type = detect_format_from_role(role_path)
-            # Initialize generators now that format is resolved
-            self.doc_generator = create_documentation_generator(
-                format_type=self.format_type, template_file=self.template_readme
-            )
-            self.readme_updater = ReadmeUpdater(
-                format_type=self.format_type, toc_bullet_style=self.toc_bullet_style
-            )
+            return detect_format_from_role(role_path, self.source)
+        return self.format_type
 
-    def _require_doc_generator(self) -> BaseDocumentationGenerator:
-        """Return the documentation generator, ensuring it is initialized."""
-        if self.doc_generator is None:
-            raise ProcessingError("Documentation generator is not initialized")
-        return self.doc_generator
+    def _doc_generator_for(self, format_type: str) -> BaseDocumentationGenerator:
+        """Return the (shared) documentation generator of a format."""
+        return self.components.doc_generator(format_type, self.template_readme)
 
-    def _require_readme_updater(self) -> ReadmeUpdater:
-        """Return the README updater, ensuring it is initialized."""
-        if self.readme_updater is None:
-            raise ProcessingError("README updater is not initialized")
-        return self.readme_updater
+    def _readme_updater_for(self, format_type: str) -> ReadmeUpdater:
+        """Return the (shared) README updater of a format."""
+        return self.components.readme_updater(format_type, self.toc_bullet_style)
 
+    @timed("validate")
     def validate_role(
         self,
         role_path: Path,
         validate_readme: bool = True,
         validate_argument_specs: bool = True,
+        only_checks: Collection[str] | None = None,
+        skip_checks: Collection[str] | None = None,
     ) -> dict[str, Any]:
         """
         Validate role structure and return metadata with further check results
         (like consistency, unknown keys).
-        """
-        # Resolve auto format if needed
-        self._resolve_auto_format(role_path)
 
+        Args:
+            role_path: Path to the role directory
+            validate_readme: Check the README markers
+            validate_argument_specs: Run the argument spec checks
+            only_checks: Run only these argument spec checks (see
+                validators.SPEC_CHECKS); all if None or empty
+            skip_checks: Do not run these argument spec checks
+        """
         try:
             # Basic structure validation
-            role_data = self.parser.validate_structure(role_path)
+            role_data = self.parser.validate_structure(role_path, self.source)
             role_data.setdefault("errors", [])
             role_data.setdefault("warnings", [])
             role_data.setdefault("notices", [])
 
             if validate_argument_specs:
-                # Parse the raw (unnormalized) specs once; several validators
-                # need this view to distinguish explicitly set keys from
-                # normalization artifacts
-                original_specs = self._parse_original_specs(role_data["spec_file"])
-
-                # Add consistency validation
-                errors, warnings, notices = self._validate_defaults_consistency(
-                    role_path, role_data["specs"], original_specs
+                # The raw (unnormalized) specs, loaded along with the
+                # normalized ones; several checks need this view to
+                # distinguish explicitly set keys from normalization artifacts
+                original_specs = role_data["original_specs"]
+
+                # Consistency, unknown keys, mutually exclusive keys and
+                # Ansible markup, in one traversal of the specs
+                report = run_spec_checks(
+                    self._spec_check_context(
+                        role_path, role_data["specs"], original_specs
+                    ),
+                    only=only_checks,
+                    skip=skip_checks,
+                    fail_fast=self.fail_fast,
                 )
-                role_data["errors"].extend(errors)
-                role_data["warnings"].extend(warnings)
-                role_data["notices"].extend(notices)
-
-                # Add unknown keys validation
-                warnings = self._validate_unknown_keys(original_specs)
-                role_data["warnings"].extend(warnings)
-
-                # Add mutually exclusive keys validation
-                exclusive_errors = self._validate_mutually_exclusive_keys(
-                    original_specs
-                )
-                role_data["errors"].extend(exclusive_errors)
-
-                # Add Ansible markup linting
-                markup_warnings = self._validate_markup(original_specs)
-                role_data["warnings"].extend(markup_warnings)
-
-            if validate_readme:
+                role_data["errors"].extend(report.errors)
+                role_data["warnings"].extend(report.warnings)
+                role_data["notices"].extend(report.notices)
+                role_data["check_timings"] = report.timings
+                for name, seconds in report.timings.items():
+                    LOGGER.debug("Check '%s' took %.1f ms", name, seconds * 1000)
+
+            if validate_readme and not self._stop_validation(role_data):
                 # Add README marker validation
                 readme_errors = self._validate_readme_markers(role_path)
                 role_data["errors"].extend(readme_errors)
 
+            if validate_readme and not self._stop_validation(role_data):
                 # Add TOC marker validation
                 toc_errors, toc_notices = self._validate_readme_toc_markers(role_path)
                 role_data["errors"].extend(toc_errors)
@@ -200,69 +344,117 @@ class RoleProcessor:
     ) -> ProcessingResults:
         """Process the entire role for documentation generation."""
 
-        # Resolve auto format if needed
-        self._resolve_auto_format(role_path)
-
         results = ProcessingResults(
             operations=[], errors=[], warnings=[], file_diffs=[]
         )
 
-        try:
-            # Validate and parse role
-            role_data = self.validate_role(role_path, validate_readme=generate_readme)
-            specs = role_data["specs"]
-            role_name = role_data["role_name"]
-
-            # Generate README documentation
-            if generate_readme:
-                self._process_readme(role_path, specs, role_name, results)
+        with self._collect_timings(role_path, results):
+            try:
+                # Validate and parse role
+                role_data = self.validate_role(
+                    role_path, validate_readme=generate_readme
+                )
+                specs = role_data["specs"]
+                option_indexes = role_data["option_indexes"]
+                role_name = role_data["role_name"]
+                results.validation_warnings.extend(role_data["warnings"])
+                results.validation_notices.extend(role_data["notices"])
+
+                # Generate README documentation
+                if generate_readme:
+                    with stage("readme"):
+                        self._process_readme(
+                            role_path,
+                            specs,
+                            role_name,
+                            self.readme_format(role_path),
+                            results,
+                            option_indexes,
+                        )
 
-            # Update defaults with comments
-            if update_defaults:
-                self._process_defaults(role_path, specs, results)
+                # Update defaults with comments
+                if update_defaults and not self.outcome_known(results):
+                    with stage("defaults"):
+                        self._process_defaults(
+                            role_path, specs, results, option_indexes
+                        )
 
-        except (ValidationError, ProcessingError) as e:
-            results.errors.append(str(e))
-        except Exception as e:
-            results.errors.append(f"Unexpected error: {e}")
+            except (ValidationError, ProcessingError) as e:
+                results.errors.append(str(e))
+            except Exception as e:
+                results.errors.append(f"Unexpected error: {e}")
 
         return results
 
+    def _collect_timings(
+        self, role_path: Path, results: ProcessingResults
+    ) -> contextlib.AbstractContextManager[None]:
+        """Return the block collecting the timings (and spans) of a role."""
+        if self.collect_spans:
+            return collect_timings(
+                results.timings,
+                results.spans,
+                role_path.name,
+                "role",
+                {"path": str(role_path)},
+            )
+        if self.collect_timings:
+            return collect_timings(results.timings)
+        return contextlib.nullcontext()
+
+    def _stop_validation(self, role_data: dict[str, Any]) -> bool:
+        """Whether fail-fast mode skips the remaining validation steps."""
+        return self.fail_fast and bool(role_data["errors"])
+
+    def outcome_known(self, results: ProcessingResults) -> bool:
+        """Whether fail-fast mode skips the remaining processing steps.
+
+        This is the case after the first error or, in dry-run mode (like
+        ``generate --check``), after the first file that would change.
+        """
+        if not self.fail_fast:
+            return False
+        return bool(results.errors) or (self.dry_run and bool(results.changed_files()))
+
     def _process_readme(
         self,
         role_path: Path,
         specs: dict[str, Any],
         role_name: str,
+        format_type: str,
         results: ProcessingResults,
+        option_indexes: dict[str, OptionIndex] | None = None,
     ) -> None:
         """Generate/update README file."""
 
         # Determine README file extension based on format
-        readme_ext = "rst" if self.format_type == "rst" else "md"
+        readme_ext = "rst" if format_type == "rst" else "md"
         readme_path = role_path / f"README.{readme_ext}"
 
         try:
-            doc_generator = self._require_doc_generator()
-            readme_updater = self._require_readme_updater()
+            doc_generator = self._doc_generator_for(format_type)
+            readme_updater = self._readme_updater_for(format_type)
 
             # Generate documentation content
             doc_content = doc_generator.generate_role_documentation(
-                specs, role_name, role_path
+                specs, role_name, role_path, option_indexes=option_indexes
             )
 
             # Read original content for diff comparison
-            existed_before = readme_path.exists()
+            existed_before = self.source.exists(readme_path)
             original_content = ""
             if existed_before:
-                original_content = readme_path.read_text(encoding="utf-8")
+                original_content = self.source.read_text(readme_path)
 
             # Compute the new content once; write it unless in dry-run mode
-            new_content = readme_updater._get_updated_content(readme_path, doc_content)
+            new_content = readme_updater._get_updated_content(
+                readme_path, doc_content, self.source
+            )
             results.readme_content = new_content
             if self.dry_run:
                 results.file_diffs.append((readme_path, original_content, new_content))
             else:
-                readme_path.write_text(new_content, encoding="utf-8", newline="\n")
+                self.source.write_text(readme_path, new_content)
 
             action = "Updated" if existed_before else "Created"
             results.operations.append((readme_path, action, "✅"))
@@ -271,7 +463,11 @@ class RoleProcessor:
             results.errors.append(f"README generation failed: {e}")
 
     def _process_defaults(
-        self, role_path: Path, specs: dict[str, Any], results: ProcessingResults
+        self,
+        role_path: Path,
+        specs: dict[str, Any],
+        results: ProcessingResults,
+        option_indexes: dict[str, OptionIndex] | None = None,
     ) -> None:
         """Add inline comments to defaults files for all entry points."""
 
@@ -286,18 +482,20 @@ class RoleProcessor:
             return
 
         for entry_point, defaults_path in defaults_files.items():
+            if self.outcome_known(results):
+                break
             try:
                 # Create a spec dict containing only this entry point
                 entry_point_specs = {entry_point: specs[entry_point]}
                 updated_content = self.defaults_generator.add_comments(
-                    defaults_path, entry_point_specs
+                    defaults_path, entry_point_specs, self.source, option_indexes
                 )
 
                 if updated_content:
                     # Read original content for diff comparison
                     original_content = ""
-                    if defaults_path.exists():
-                        original_content = defaults_path.read_text(encoding="utf-8")
+                    if self.source.exists(defaults_path):
+                        original_content = self.source.read_text(defaults_path)
 
                     # Store diff information for dry-run display
                     if self.dry_run:
@@ -306,9 +504,7 @@ class RoleProcessor:
                         )
                     else:
                         # Write updated content directly (no backup)
-                        defaults_path.write_text(
-                            updated_content, encoding="utf-8", newline="\n"
-                        )
+                        self.source.write_text(defaults_path, updated_content)
 
                     results.operations.append((defaults_path, "Comments added", "✅"))
                 else:
@@ -328,33 +524,19 @@ class RoleProcessor:
         for entry_point in specs.keys():
             for ext in ["yml", "yaml"]:
                 defaults_path = role_path / "defaults" / f"{entry_point}.{ext}"
-                if defaults_path.exists():
+                if self.source.exists(defaults_path):
                     defaults_files[entry_point] = defaults_path
                     break
 
         return defaults_files
 
-    def _extract_variables_from_defaults(self, defaults_path: Path) -> set[str]:
-        """Extract variable names from a defaults YAML file."""
-        try:
-            with open(defaults_path, encoding="utf-8") as file:
-                data = self.parser.yaml.load(file)
-                if data and isinstance(data, dict):
-                    return set(data.keys())
-        except Exception:
-            # Parsing errors are reported by the dedicated validators
-            LOGGER.debug(
-                "Could not read defaults file %s", defaults_path, exc_info=True
-            )
-        return set()
-
+    @timed("yaml")
     def _extract_defaults_values_from_file(self, defaults_path: Path) -> dict[str, Any]:
         """Extract variable names and their values from a defaults YAML file."""
         try:
-            with open(defaults_path, encoding="utf-8") as file:
-                data = self.parser.yaml.load(file)
-                if data and isinstance(data, dict):
-                    return data
+            data = self.parser.yaml.load(self.source.read_text(defaults_path))
+            if data and isinstance(data, dict):
+                return data
         except Exception:
             # Parsing errors are reported by the dedicated validators
             LOGGER.debug(
@@ -362,326 +544,44 @@ class RoleProcessor:
             )
         return {}
 
-    def _validate_unknown_keys(self, original_specs: dict[str, Any]) -> list[str]:
-        """Validate that only known keys are used in argument_specs.
-
-        Args:
-            original_specs: Raw (unnormalized) argument specs as returned
-                by _parse_original_specs(), which preserve unknown keys.
-        """
-        warnings: list[str] = []
-        if not original_specs:
-            return warnings
-
-        # Warnings might also indicate DocSmith is outdated if the official
-        # format spec was extended (even though it was stable for years). In
-        # doubt, check the sources named at the constant definitions.
-        for entry_point, spec in original_specs.items():
-            if not isinstance(spec, dict):
-                continue
-
-            # Check role-level keys
-            unknown_role_keys = set(spec.keys()) - SPEC_VALID_ENTRYPOINT_KEYS
-            if unknown_role_keys:
-                warnings.append(
-                    f"Entry point '{entry_point}': Unknown keys in argument_specs: "
-                    f"{sorted(unknown_role_keys)}. This might be an error in your "
-                    f"role."
-                )
-
-            # Check option-level keys (including nested options)
-            options = spec.get("options", {})
-            if isinstance(options, dict):
-                self._check_unknown_option_keys(entry_point, options, warnings, path="")
-
-        return warnings
-
-    def _validate_markup(self, original_specs: dict[str, Any]) -> list[str]:
-        """Lint Ansible markup in all descriptions of the argument specs.
-
-        Invalid markup (like ``M()`` without a FQCN) is left verbatim by
-        the generators; these warnings point role authors at the mistake.
-
-        Args:
-            original_specs: Raw (unnormalized) argument specs as returned
-                by _parse_original_specs().
-        """
-        warnings = []
-
-        def _lint(texts: Any, location: str) -> None:
-            if isinstance(texts, str):
-                texts = [texts]
-            if not isinstance(texts, list):
-                return
-            for item in texts:
-                for message in lint_ansible_markup(str(item)):
-                    warnings.append(f"{location}: Invalid Ansible markup: {message}")
-
-        def _walk_options(options: dict[str, Any], entry_point: str, path: str) -> None:
-            for var_name, var_spec in options.items():
-                if not isinstance(var_spec, dict):
-                    continue
-                display_name = f"{path}{var_name}"
-                _lint(
-                    var_spec.get("description"),
-                    f"Entry point '{entry_point}', variable '{display_name}'",
-                )
-                nested = var_spec.get("options")
-                if isinstance(nested, dict):
-                    _walk_options(nested, entry_point, f"{display_name}.")
-
-        for entry_point, spec in original_specs.items():
-            if not isinstance(spec, dict):
-                continue
-            for key in ("short_description", "description"):
-                _lint(spec.get(key), f"Entry point '{entry_point}' ({key})")
-            options = spec.get("options", {})
-            if isinstance(options, dict):
-                _walk_options(options, entry_point, path="")
-
-        return warnings
-
-    def _check_unknown_option_keys(
-        self, entry_point: str, options: dict[str, Any], warnings: list[str], path: str
-    ) -> None:
-        """Recursively warn about unknown keys in (nested) option specs."""
-        for var_name, var_spec in options.items():
-            if not isinstance(var_spec, dict):
-                continue
-
-            display_name = f"{path}{var_name}"
-            unknown_var_keys = set(var_spec.keys()) - SPEC_VALID_OPTION_KEYS
-            if unknown_var_keys:
-                warnings.append(
-                    f"Entry point '{entry_point}', variable '{display_name}': "
-                    f"Unknown keys: {sorted(unknown_var_keys)}. This might "
-                    f"be an error in your role."
-                )
-
-            nested = var_spec.get("options")
-            if isinstance(nested, dict):
-                self._check_unknown_option_keys(
-                    entry_point, nested, warnings, path=f"{display_name}."
-                )
-
-    def _parse_original_specs(self, spec_file: Path) -> dict[str, Any]:
-        """
-        Parse the original specs file without normalization to check for
-        default keys.
-        """
-        try:
-            with open(spec_file, encoding="utf-8") as file:
-                data = self.parser.yaml.load(file)
-                specs = data.get("argument_specs", {})
-                return specs if isinstance(specs, dict) else {}
-        except Exception:
-            LOGGER.debug("Could not parse specs file %s", spec_file, exc_info=True)
-            return {}
-
-    def _validate_mutually_exclusive_keys(
-        self, original_specs: dict[str, Any]
-    ) -> list[str]:
-        """Validate that default and required: true are not used together.
-
-        Args:
-            original_specs: Raw (unnormalized) argument specs as returned
-                by _parse_original_specs().
-        """
-        errors: list[str] = []
-        if not original_specs:
-            return errors
-
-        for entry_point, spec in original_specs.items():
-            if not isinstance(spec, dict):
-                continue
-
-            options = spec.get("options", {})
-            if not isinstance(options, dict):
-                continue
-
-            for var_name, var_spec in options.items():
-                if not isinstance(var_spec, dict):
-                    continue
-
-                # Check for the conflict: both default and required: true
-                has_default = "default" in var_spec
-                is_required = var_spec.get("required") is True
-
-                if has_default and is_required:
-                    errors.append(
-                        f"Entry point '{entry_point}': Variable '{var_name}' has "
-                        f"both 'default' and 'required: true' which are mutually "
-                        f"exclusive. Remove either the default value or set "
-                        f"required to false."
-                    )
-
-        return errors
-
-    def _validate_defaults_consistency(
+    def _spec_check_context(
         self,
         role_path: Path,
         specs: dict[str, Any],
-        original_specs: dict[str, Any] | None = None,
-    ) -> tuple[list[str], list[str], list[str]]:
-        """Validate consistency between defaults files and argument_specs.
-
-        Args:
-            role_path: Path to the role directory
-            specs: Normalized argument specs
-            original_specs: Raw (unnormalized) argument specs. Used to
-                distinguish explicitly set keys (like "default") from
-                normalization artifacts; the normalized specs are used as
-                fallback when not provided.
-        """
-        errors = []
-        warnings = []
-        notices = []
-
-        defaults_files = self._find_defaults_files(role_path, specs)
-
-        for entry_point, spec in specs.items():
-            spec_vars = set(spec.get("options", {}).keys())
-            defaults_vars = set()
-
-            # Raw option specs preserve which keys were explicitly set
-            original_options = None
-            if original_specs:
-                entry = original_specs.get(entry_point, {})
-                if isinstance(entry, dict):
-                    original_options = entry.get("options", {}) or {}
-
-            if entry_point in defaults_files:
-                # Parse defaults file to get variables
-                defaults_vars = self._extract_variables_from_defaults(
-                    defaults_files[entry_point]
-                )
-
-                # ERROR: Variables in defaults but not in specs
-                undefined_vars = defaults_vars - spec_vars
-                if undefined_vars:
-                    errors.append(
-                        f"Entry point '{entry_point}': Variables present in defaults/"
-                        f"{entry_point}.yml but missing from argument_specs.yml: "
-                        f"{sorted(undefined_vars)}"
-                    )
-
-            # ERROR: Variables with defaults in specs but missing from defaults file
-            # Check which variables have explicit defaults (not
-            # parser-added None)
-            spec_with_defaults = set()
-            if original_options is not None:
-                for name, var_spec in original_options.items():
-                    if isinstance(var_spec, dict) and "default" in var_spec:
-                        spec_with_defaults.add(name)
-            else:
-                # Fallback: treat variables with non-None defaults as having explicit
-                # defaults
-                for name, var_spec in spec.get("options", {}).items():
-                    if (
-                        isinstance(var_spec, dict)
-                        and "default" in var_spec
-                        and var_spec["default"] is not None
-                    ):
-                        spec_with_defaults.add(name)
-            missing_defaults = spec_with_defaults - defaults_vars
-            if missing_defaults:
-                defaults_file = f"defaults/{entry_point}.yml"
-                errors.append(
-                    f"Entry point '{entry_point}': Variables have defaults in "
-                    f"argument_specs.yml but are missing from {defaults_file}: "
-                    f"{sorted(missing_defaults)}"
-                )
-
-            # NOTICE: Variables in specs but not in defaults (potential oversight)
-            # Skip variables that are required (no need for defaults)
-            if defaults_vars:
-                missing_in_defaults = spec_vars - defaults_vars
-                if missing_in_defaults:
-                    # Filter out required variables - they don't need defaults
-                    non_required_missing = set()
-                    source_options = (
-                        original_options
-                        if original_options is not None
-                        else spec.get("options", {})
-                    )
-                    for var_name in missing_in_defaults:
-                        var_spec = source_options.get(var_name, {})
-                        if not (
-                            isinstance(var_spec, dict)
-                            and var_spec.get("required") is True
-                        ):
-                            non_required_missing.add(var_name)
-
-                    if non_required_missing:
-                        notices.append(
-                            f"Entry point '{entry_point}': Variables in "
-                            f"argument_specs.yml but not in defaults/{entry_point}.yml "
-                            f"(may be intentional): {sorted(non_required_missing)}"
-                        )
-
-                # WARNING: Default value mismatches between specs and defaults files
-                if entry_point in defaults_files:
-                    defaults_values = self._extract_defaults_values_from_file(
-                        defaults_files[entry_point]
-                    )
-
-                    # Get spec defaults from original file (not normalized)
-                    spec_defaults = {}
-                    if original_options is not None:
-                        for name, var_spec in original_options.items():
-                            if isinstance(var_spec, dict) and "default" in var_spec:
-                                spec_defaults[name] = var_spec["default"]
-                    else:
-                        # Fallback: use processed specs
-                        for name, var_spec in spec.get("options", {}).items():
-                            if (
-                                isinstance(var_spec, dict)
-                                and "default" in var_spec
-                                and var_spec["default"] is not None
-                            ):
-                                spec_defaults[name] = var_spec["default"]
-
-                    # Compare values for variables that exist in both places
-                    for var_name in spec_defaults:
-                        if var_name in defaults_values:
-                            spec_value = spec_defaults[var_name]
-                            defaults_value = defaults_values[var_name]
-                            if spec_value != defaults_value:
-                                warnings.append(
-                                    f"Entry point '{entry_point}': Default value "
-                                    f"mismatch for variable '{var_name}': "
-                                    f"argument_specs.yml defines {spec_value!r} but "
-                                    f"defaults/{entry_point}.yml defines "
-                                    f"{defaults_value!r}"
-                                )
-
-        return errors, warnings, notices
+        original_specs: dict[str, Any] | None,
+    ) -> SpecCheckContext:
+        """Build the context the argument spec checks run on."""
+        return SpecCheckContext(
+            role_path=role_path,
+            specs=specs,
+            original_specs=original_specs,
+            defaults_files=self._find_defaults_files(role_path, specs),
+            load_defaults=self._extract_defaults_values_from_file,
+        )
 
     def _validate_readme_markers(self, role_path: Path) -> list[str]:
         """Validate that existing README file contains required markers."""
         errors: list[str] = []
 
-        # Resolve auto format if needed
-        self._resolve_auto_format(role_path)
-
         # Check for README files in order of preference based on format
-        readme_ext = "rst" if self.format_type == "rst" else "md"
+        format_type = self.readme_format(role_path)
+        readme_ext = "rst" if format_type == "rst" else "md"
         readme_path = role_path / f"README.{readme_ext}"
 
         # If format-specific file doesn't exist, check the other format
-        if not readme_path.exists():
+        if not self.source.exists(readme_path):
             alt_ext = "md" if readme_ext == "rst" else "rst"
             alt_readme_path = role_path / f"README.{alt_ext}"
-            if alt_readme_path.exists():
+            if self.source.exists(alt_readme_path):
                 readme_path = alt_readme_path
 
-        if not readme_path.exists():
+        if not self.source.exists(readme_path):
             # No README exists - that's fine, generate will create one
             return errors
 
         try:
-            content = readme_path.read_text(encoding="utf-8")
-            readme_updater = self._require_readme_updater()
+            content = self.source.read_text(readme_path)
+            readme_updater = self._readme_updater_for(format_type)
             start_marker = readme_updater.start_marker
             end_marker = readme_updater.end_marker
 
@@ -721,25 +621,23 @@ class RoleProcessor:
         errors: list[str] = []
         notices: list[str] = []
 
-        # Resolve auto format if needed
-        self._resolve_auto_format(role_path)
-
         # Use same logic as _validate_readme_markers for file detection
-        readme_ext = "rst" if self.format_type == "rst" else "md"
+        format_type = self.readme_format(role_path)
+        readme_ext = "rst" if format_type == "rst" else "md"
         readme_path = role_path / f"README.{readme_ext}"
 
-        if not readme_path.exists():
+        if not self.source.exists(readme_path):
             alt_ext = "md" if readme_ext == "rst" else "rst"
             alt_readme_path = role_path / f"README.{alt_ext}"
-            if alt_readme_path.exists():
+            if self.source.exists(alt_readme_path):
                 readme_path = alt_readme_path
 
-        if not readme_path.exists():
+        if not self.source.exists(readme_path):
             return errors, notices
 
         try:
-            content = readme_path.read_text(encoding="utf-8")
-            readme_updater = self._require_readme_updater()
+            content = self.source.read_text(readme_path)
+            readme_updater = self._readme_updater_for(format_type)
             toc_start_marker = readme_updater.toc_start_marker
             toc_end_marker = readme_updater.toc_end_marker
 
@@ -16,6 +16,8 @@ from ..constants import (
     MARKER_README_TOCFULL_START,
 )
 from .exceptions import FileOperationError
+from .sources import FILE_SYSTEM, FileSource
+from .timing import timed
 from .toc import create_toc_generator
 
 # Matches any DocSmith marker, capturing type, optional role name and
@@ -106,10 +108,14 @@ class ReadmeUpdater:
         except Exception as e:
             raise FileOperationError(f"Failed to update README: {e}") from e
 
-    def _get_updated_content(self, readme_path: Path, new_content: str) -> str:
+    @timed("readme_update")
+    def _get_updated_content(
+        self, readme_path: Path, new_content: str, source: FileSource | None = None
+    ) -> str:
         """Get the updated content without writing to file."""
-        if readme_path.exists():
-            content = readme_path.read_text(encoding="utf-8")
+        source = source or FILE_SYSTEM
+        if source.exists(readme_path):
+            content = source.read_text(readme_path)
             # Update main content
             content = self._replace_between_markers(
                 content, new_content, self.start_marker, self.end_marker
@@ -155,14 +161,12 @@ class ReadmeUpdater:
         # Extract content between MAIN markers to generate TOC from
         main_content = self._extract_main_content(content)
 
-        # Detect bullet style from content outside the managed sections
-        external_content = self._extract_external_content(content)
-        if external_content and not self.toc_generator.bullet_style:
-            detected_style = self.toc_generator._detect_bullet_style(external_content)
-            self.toc_generator.bullet_style = detected_style
+        bullet_style = self._detect_bullet_style(content)
 
         # Generate TOC only from the main content (generated by the tool)
-        toc_content = self.toc_generator.generate_toc(main_content)
+        toc_content = self.toc_generator.generate_toc(
+            main_content, bullet_style=bullet_style
+        )
 
         # Update TOC section
         return self._replace_between_markers(
@@ -187,21 +191,34 @@ class ReadmeUpdater:
         ):
             return content
 
-        # Detect bullet style from content outside the managed sections
-        external_content = self._extract_external_content(content)
-        if external_content and not self.toc_generator.bullet_style:
-            detected_style = self.toc_generator._detect_bullet_style(external_content)
-            self.toc_generator.bullet_style = detected_style
+        bullet_style = self._detect_bullet_style(content)
 
         # The whole document is the input; the old TOC/TOC-FULL sections
         # contain only list items (no headings), so they cannot pollute
         # the result
-        toc_content = self.toc_generator.generate_toc(content)
+        toc_content = self.toc_generator.generate_toc(
+            content, bullet_style=bullet_style
+        )
 
         return self._replace_between_markers(
             content, toc_content, self.tocfull_start_marker, self.tocfull_end_marker
         )
 
+    def _detect_bullet_style(self, content: str) -> str | None:
+        """Return the bullet style for the TOCs of a README.
+
+        The configured style wins; otherwise it is detected from the
+        content outside the managed sections (None if there is none).
+        Detected styles apply to this README only, as updaters are shared
+        by all READMEs of a run.
+        """
+        if self.toc_generator.bullet_style:
+            return self.toc_generator.bullet_style
+        external_content = self._extract_external_content(content)
+        if not external_content:
+            return None
+        return self.toc_generator._detect_bullet_style(external_content)
+
     def _extract_main_content(self, content: str) -> str:
         """Extract content between MAIN markers for TOC generation."""
         if self.start_marker not in content or self.end_marker not in content:
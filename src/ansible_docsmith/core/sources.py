@@ -0,0 +1,495 @@
+"""Sources the processors read role and collection files from.
+
+By default, files are read from (and written to) the file system. Other
+sources provide the files of a role or collection without a checkout or
+extraction, e.g. straight from git objects, collection tarballs or
+memory. They are read-only: the processors only run in dry-run mode on
+them and report new contents as diffs.
+
+All methods take the same paths the processors use (like
+``role_path / "meta" / "argument_specs.yml"``).
+"""
+
+import copy
+import fnmatch
+import os
+import subprocess
+import tarfile
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Collection, Mapping
+from pathlib import Path, PurePosixPath
+from typing import Self
+
+from typing_extensions import override
+
+from ..constants import SPEC_MAX_FILE_SIZE, TARBALL_READ_MEMBERS, TARBALL_SUFFIXES
+from .exceptions import FileOperationError, GitError
+from .git import repository_root, run_git
+from .timing import timed
+
+
+class FileSource(ABC):
+    """Read (and possibly write) access to role and collection files."""
+
+    # Whether write_text() is unsupported; processors then run in dry-run
+    # mode
+    read_only: bool = False
+
+    @abstractmethod
+    def is_file(self, path: Path) -> bool:
+        """Return whether path is a file."""
+
+    @abstractmethod
+    def is_dir(self, path: Path) -> bool:
+        """Return whether path is a directory."""
+
+    @abstractmethod
+    def list_dirs(self, path: Path) -> list[str]:
+        """Return the names of the subdirectories of a directory, sorted.
+
+        Raises:
+            FileNotFoundError: If path is no directory
+        """
+
+    @abstractmethod
+    def size(self, path: Path) -> int:
+        """Return the size of a file in bytes.
+
+        Raises:
+            FileNotFoundError: If path is no file
+        """
+
+    @abstractmethod
+    def read_text(self, path: Path) -> str:
+        """Return the (UTF-8) content of a file.
+
+        Raises:
+            FileNotFoundError: If path is no file
+        """
+
+    def exists(self, path: Path) -> bool:
+        """Return whether path is a file or directory."""
+        return self.is_file(path) or self.is_dir(path)
+
+    def write_text(self, path: Path, content: str) -> None:
+        """Write the content of a file (with Unix line endings).
+
+        Raises:
+            FileOperationError: If the source is read-only
+        """
+        raise FileOperationError(f"Cannot write {path}: {self} is read-only")
+
+    def close(self) -> None:  # noqa: B027 (optional to override)
+        """Release resources held by the source (if any)."""
+
+
+class FileSystemSource(FileSource):
+    """Files on the file system (the default source)."""
+
+    @override
+    def is_file(self, path: Path) -> bool:
+        return os.path.isfile(path)
+
+    @override
+    def is_dir(self, path: Path) -> bool:
+        return os.path.isdir(path)
+
+    @override
+    def exists(self, path: Path) -> bool:
+        return os.path.exists(path)
+
+    @override
+    def list_dirs(self, path: Path) -> list[str]:
+        try:
+            with os.scandir(path) as entries:
+                return sorted(entry.name for entry in entries if entry.is_dir())
+        except NotADirectoryError as e:
+            raise FileNotFoundError(str(path)) from e
+
+    @override
+    def size(self, path: Path) -> int:
+        return path.stat().st_size
+
+    @override
+    @timed("read")
+    def read_text(self, path: Path) -> str:
+        return path.read_text(encoding="utf-8")
+
+    @override
+    @timed("write")
+    def write_text(self, path: Path, content: str) -> None:
+        path.write_text(content, encoding="utf-8", newline="\n")
+
+    @override
+    def __str__(self) -> str:
+        return "file system"
+
+    @override
+    def __reduce__(self) -> str:
+        # Unpickled (e.g. in worker processes) as the shared instance
+        return "FILE_SYSTEM"
+
+
+# Shared instance used whenever no source is given
+FILE_SYSTEM = FileSystemSource()
+
+
+class TreeSource(FileSource):
+    """Read-only source over an index of the files below a root directory.
+
+    Subclasses register the files (with their sizes) through _add_file()
+    and read their contents in _read().
+    """
+
+    read_only = True
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        # Root-relative name -> size of all files, and all directories
+        # ("" is the root)
+        self._files: dict[str, int] = {}
+        self._dirs: dict[str, set[str]] = {"": set()}
+
+    def _add_file(self, name: str, size: int) -> None:
+        """Register a file and all of its parent directories."""
+        self._files[name] = size
+        self._add_parents(name)
+
+    def _add_dir(self, name: str) -> None:
+        """Register a (possibly empty) directory and its parents."""
+        self._dirs.setdefault(name, set())
+        self._add_parents(name)
+
+    def _add_parents(self, name: str) -> None:
+        """Register all parent directories of a file or directory."""
+        parts = PurePosixPath(name).parts
+        for depth in range(len(parts) - 1):
+            parent = "/".join(parts[:depth])
+            self._dirs.setdefault(parent, set()).add(parts[depth])
+            self._dirs.setdefault("/".join(parts[: depth + 1]), set())
+
+    def _name(self, path: Path) -> str | None:
+        """Return the root-relative name of a path (None if outside)."""
+        try:
+            relative = Path(os.path.abspath(path)).relative_to(self.root)
+        except ValueError:
+            try:
+                relative = path.resolve().relative_to(self.root)
+            except ValueError:
+                return None
+        name = relative.as_posix()
+        return "" if name == "." else name
+
+    def _file_name(self, path: Path) -> str:
+        """Return the root-relative name of a file.
+
+        Raises:
+            FileNotFoundError: If path is no file
+        """
+        name = self._name(path)
+        if name is None or name not in self._files:
+            raise FileNotFoundError(str(path))
+        return name
+
+    @abstractmethod
+    def _read(self, name: str) -> str:
+        """Return the content of a registered file."""
+
+    def view(self, path: Path) -> Self:
+        """Return a copy of the source with only the files below path.
+
+        Worker processes get a view of the role directory with every role
+        instead of the index (and contents) of the whole tree.
+
+        Raises:
+            FileNotFoundError: If path is no directory of the source
+        """
+        name = self._name(path)
+        if name is None or name not in self._dirs:
+            raise FileNotFoundError(str(path))
+        prefix = f"{name}/" if name else ""
+
+        view = copy.copy(self)
+        view._files = {
+            file: size for file, size in self._files.items() if file.startswith(prefix)
+        }
+        view._dirs = {
+            directory: children
+            for directory, children in self._dirs.items()
+            if directory == name or directory.startswith(prefix)
+        }
+        # The directories leading to path only contain the next one of them
+        parts = PurePosixPath(name).parts
+        for depth in range(len(parts)):
+            view._dirs["/".join(parts[:depth])] = {parts[depth]}
+        view._keep_files(view._files.keys())
+        return view
+
+    def _keep_files(self, names: Collection[str]) -> None:
+        """Drop the data kept for files other than names (see view())."""
+
+    @override
+    def is_file(self, path: Path) -> bool:
+        return self._name(path) in self._files
+
+    @override
+    def is_dir(self, path: Path) -> bool:
+        return self._name(path) in self._dirs
+
+    @override
+    def list_dirs(self, path: Path) -> list[str]:
+        name = self._name(path)
+        if name is None or name not in self._dirs:
+            raise FileNotFoundError(str(path))
+        return sorted(self._dirs[name])
+
+    @override
+    def size(self, path: Path) -> int:
+        return self._files[self._file_name(path)]
+
+    @override
+    @timed("read")
+    def read_text(self, path: Path) -> str:
+        return self._read(self._file_name(path))
+
+
+class GitSource(TreeSource):
+    """Files of a git commit, read without a checkout.
+
+    The tree of the commit is listed once (``git ls-tree``); file contents
+    are read on demand through a single long-lived ``git cat-file
+    --batch`` process and kept in memory, as the processors read some
+    files several times. Call close() (or use the source as a context
+    manager) to end the process.
+
+    Paths are resolved against the current directory and must be inside
+    the repository's working tree location; the working tree itself is
+    never read.
+    """
+
+    def __init__(self, ref: str, path: Path | None = None) -> None:
+        """Open a git commit as source.
+
+        Args:
+            ref: Git ref (branch, tag, commit) to read files from
+            path: Any directory of the repository (default: the current
+                directory)
+
+        Raises:
+            GitError: If path is not inside a git repository or the ref
+                is unknown
+        """
+        super().__init__(repository_root(path or Path.cwd()))
+        self.ref = ref
+        try:
+            self.commit = run_git(
+                ["rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"], self.root
+            ).strip()
+        except GitError as e:
+            raise GitError(f"Unknown git ref '{ref}'") from e
+
+        # Object ids of all files
+        self._objects: dict[str, str] = {}
+        listing = run_git(
+            ["ls-tree", "-r", "-z", "--long", "--full-tree", self.commit], self.root
+        )
+        for record in listing.split("\0"):
+            if not record:
+                continue
+            info, name = record.split("\t", 1)
+            _mode, object_type, object_id, size = info.split()
+            if object_type != "blob":
+                # Submodules (commits) are no files of this repository
+                continue
+            self._objects[name] = object_id
+            self._add_file(name, int(size))
+
+        self._contents: dict[str, str] = {}
+        self._process: subprocess.Popen[bytes] | None = None
+        # Serializes the requests to the cat-file process (threads)
+        self._lock = threading.Lock()
+
+    @override
+    def __getstate__(self) -> dict[str, object]:
+        # Worker processes start their own cat-file process on demand
+        state = self.__dict__.copy()
+        state.update(_contents={}, _process=None, _lock=None)
+        return state
+
+    def __setstate__(self, state: dict[str, object]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @override
+    def _keep_files(self, names: Collection[str]) -> None:
+        self._objects = {name: self._objects[name] for name in names}
+
+    @override
+    def _read(self, name: str) -> str:
+        with self._lock:
+            if name not in self._contents:
+                data = self._read_object(self._objects[name])
+                self._contents[name] = data.decode("utf-8")
+            return self._contents[name]
+
+    def _read_object(self, object_id: str) -> bytes:
+        """Read an object through the cat-file process."""
+        if self._process is None:
+            self._process = subprocess.Popen(
+                ["git", "cat-file", "--batch"],
+                cwd=self.root,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+            )
+        stdin, stdout = self._process.stdin, self._process.stdout
+        if stdin is None or stdout is None:  # pragma: no cover
+            raise GitError("git cat-file is not running")
+
+        stdin.write(f"{object_id}\n".encode())
+        stdin.flush()
+        header = stdout.readline().decode().split()
+        if len(header) != 3:
+            raise GitError(f"Cannot read git object {object_id}")
+        data = stdout.read(int(header[2]))
+        stdout.read(1)  # Trailing newline
+        return data
+
+    @override
+    def close(self) -> None:
+        """End the cat-file process."""
+        with self._lock:
+            if self._process is not None:
+                if self._process.stdin is not None:
+                    self._process.stdin.close()
+                self._process.wait()
+                if self._process.stdout is not None:
+                    self._process.stdout.close()
+                self._process = None
+
+    def __enter__(self) -> "GitSource":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @override
+    def __str__(self) -> str:
+        return f"git ref '{self.ref}'"
+
+
+class MemorySource(TreeSource):
+    """Files held in memory, e.g. by services embedding DocSmith.
+
+    Nothing is read from or written to disk; the root directory does not
+    need to exist.
+    """
+
+    def __init__(self, root: Path, files: Mapping[str, str]) -> None:
+        """Create a source from file contents.
+
+        Args:
+            root: Virtual root directory of the files
+            files: Root-relative POSIX path (like "meta/argument_specs.yml")
+                -> content
+        """
+        super().__init__(Path(os.path.abspath(root)))
+        self._contents = dict(files)
+        for name, content in self._contents.items():
+            self._add_file(name, len(content.encode("utf-8")))
+
+    @override
+    def _keep_files(self, names: Collection[str]) -> None:
+        self._contents = {name: self._contents[name] for name in names}
+
+    @override
+    def _read(self, name: str) -> str:
+        return self._contents[name]
+
+    @override
+    def __str__(self) -> str:
+        return "memory"
+
+
+def is_tarball(path: Path) -> bool:
+    """Return whether path is a (collection) tarball file."""
+    return path.name.endswith(TARBALL_SUFFIXES) and path.is_file()
+
+
+class TarballSource(TreeSource):
+    """Files of a collection tarball, read without extraction.
+
+    The tarball is streamed once: all members are listed, but only the
+    contents DocSmith needs (see TARBALL_READ_MEMBERS) are kept in memory.
+    The tarball path itself is the root directory of the collection, like
+    ``ns-name-1.0.0.tar.gz/roles/<role>`` for its roles; members are
+    expected at the top level, as ``ansible-galaxy collection build``
+    creates them.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Read a tarball.
+
+        Args:
+            path: Tarball file (plain or compressed)
+
+        Raises:
+            FileOperationError: If the tarball cannot be read
+        """
+        super().__init__(Path(os.path.abspath(path)))
+        self.path = path
+        self._contents: dict[str, bytes] = {}
+        try:
+            with tarfile.open(path, "r|*") as tar:
+                for member in tar:
+                    self._add_member(tar, member)
+        except (OSError, tarfile.TarError) as e:
+            raise FileOperationError(f"Cannot read tarball {path}: {e}") from e
+
+    def _add_member(self, tar: tarfile.TarFile, member: tarfile.TarInfo) -> None:
+        """Register a member and keep its content if needed."""
+        parts = PurePosixPath(member.name).parts
+        if parts[:1] == (".",):
+            parts = parts[1:]
+        if not parts or parts[0] == "/" or ".." in parts:
+            # Members outside of the collection root are no files of it
+            return
+        name = "/".join(parts)
+
+        if member.isdir():
+            self._add_dir(name)
+        elif member.isfile():
+            self._add_file(name, member.size)
+            if member.size <= SPEC_MAX_FILE_SIZE and any(
+                _match_member(parts, pattern) for pattern in TARBALL_READ_MEMBERS
+            ):
+                content = tar.extractfile(member)
+                if content is not None:
+                    self._contents[name] = content.read()
+
+    @override
+    def _keep_files(self, names: Collection[str]) -> None:
+        self._contents = {
+            name: content for name, content in self._contents.items() if name in names
+        }
+
+    @override
+    def _read(self, name: str) -> str:
+        if name not in self._contents:
+            raise FileOperationError(
+                f"Cannot read {self.root / name}: not loaded from {self}"
+            )
+        return self._contents[name].decode("utf-8")
+
+    @override
+    def __str__(self) -> str:
+        return f"tarball '{self.path.name}'"
+
+
+def _match_member(parts: tuple[str, ...], pattern: str) -> bool:
+    """Return whether a member path matches a TARBALL_READ_MEMBERS pattern."""
+    pattern_parts = pattern.split("/")
+    return len(parts) == len(pattern_parts) and all(
+        fnmatch.fnmatchcase(part, pattern_part)
+        for part, pattern_part in zip(parts, pattern_parts, strict=True)
+    )
@@ -44,16 +44,35 @@ def truncate_preserving_tokens(
 
     Accumulates whole tokens (words, links, code spans) until the length
     limit is reached, so truncation can never produce broken inline markup
-    such as half a link.
+    such as half a link. Runs in linear time: tokens are matched lazily
+    and the length is tracked instead of re-measuring the joined result.
     """
-    result = ""
-    for token in token_pattern.findall(text):
-        candidate = f"{result} {token}" if result else token
-        if len(candidate) > max_length:
+    tokens: list[str] = []
+    length = 0
+    for match in token_pattern.finditer(text):
+        token = match.group(0)
+        # One separating space before every token but the first
+        new_length = length + len(token) + (1 if tokens else 0)
+        if new_length > max_length:
             break
-        result = candidate
+        tokens.append(token)
+        length = new_length
     # A single oversized token: fall back to a hard character cut
-    return result if result else text[:max_length].rstrip()
+    return " ".join(tokens) if tokens else text[:max_length].rstrip()
+
+
+def flatten_paragraphs(text: str, separator: str) -> str:
+    """Collapse text into a single line for table cells.
+
+    HTML tags are stripped, line endings normalized and whitespace runs
+    inside each paragraph collapsed to single spaces; the paragraphs
+    (separated by blank lines in the input) are joined with separator.
+    """
+    text = HTMLStripper.strip_tags(text)
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    paragraphs = (" ".join(paragraph.split()) for paragraph in text.split("\n\n"))
+    return separator.join(paragraph for paragraph in paragraphs if paragraph)
 
 
 class HTMLStripper(HTMLParser):
@@ -80,6 +99,10 @@ class HTMLStripper(HTMLParser):
         """Strip HTML tags from text and return clean text."""
         if not html_text:
             return ""
+        # Fast path: without tags or entity references, parsing and
+        # unescaping cannot change the text
+        if "<" not in html_text and "&" not in html_text:
+            return html_text
 
         stripper = cls()
         try:
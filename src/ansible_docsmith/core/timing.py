@@ -0,0 +1,209 @@
+"""Lightweight timing of processing stages (see --timings).
+
+Hot paths mark their stages with ``with stage("markup"):`` or the
+@timed("markup") decorator. Unless a collect_timings() block is active in
+the current context (thread or task), both do nothing but look up a
+context variable, so the instrumentation costs next to nothing.
+
+Timings are exclusive: the time of a stage nested in another one (like
+Ansible markup conversion while rendering a template) only counts for
+the inner stage. Time outside of any stage counts as "other", so the
+timings of a block add up to its duration.
+
+Blocks can also record a Span per stage, plus one for the block itself,
+e.g. to export them as a trace (see core.trace).
+"""
+
+import contextlib
+import functools
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator, Mapping
+from contextvars import ContextVar
+from types import TracebackType
+from typing import NamedTuple, ParamSpec, TypeVar
+
+from typing_extensions import override
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+# Stage of the time spent outside of any other stage
+OTHER_STAGE = "other"
+
+
+class Span(NamedTuple):
+    """A stage or block as it ran, with the process and thread it ran in.
+
+    Times are time.perf_counter() readings. It uses a system-wide
+    monotonic clock on Linux, macOS and Windows, so the spans of worker
+    processes line up with the ones of the main process.
+    """
+
+    name: str
+    category: str  # "stage", or the kind of block (like "role")
+    start: float
+    end: float
+    pid: int
+    tid: int
+    args: Mapping[str, str] | None = None
+
+
+class StageTimer:
+    """Adds the time spent per stage to a dict, excluding nested stages.
+
+    If a list of spans is given, a Span of every stage is added to it,
+    too (including nested ones).
+    """
+
+    def __init__(
+        self, timings: dict[str, float], spans: list[Span] | None = None
+    ) -> None:
+        self.timings = timings
+        self.spans = spans
+        self.pid = os.getpid()
+        self.tid = threading.get_native_id()
+        self._stack = [OTHER_STAGE]
+        self._starts: list[float] = []
+        self._last = time.perf_counter()
+
+    def _account(self) -> float:
+        """Add the time since the last change to the current stage."""
+        now = time.perf_counter()
+        current = self._stack[-1]
+        self.timings[current] = self.timings.get(current, 0.0) + now - self._last
+        self._last = now
+        return now
+
+    def enter(self, name: str) -> None:
+        """Start a (nested) stage."""
+        now = self._account()
+        self._stack.append(name)
+        if self.spans is not None:
+            self._starts.append(now)
+
+    def exit(self) -> None:
+        """End the current stage."""
+        now = self._account()
+        name = self._stack.pop()
+        if self.spans is not None:
+            self.spans.append(
+                Span(name, "stage", self._starts.pop(), now, self.pid, self.tid)
+            )
+
+    def pause(self) -> None:
+        """Stop timing, e.g. while a nested block collects its own timings."""
+        self._account()
+
+    def resume(self) -> None:
+        """Continue timing after pause()."""
+        self._last = time.perf_counter()
+
+
+_TIMER: ContextVar[StageTimer | None] = ContextVar("docsmith_timer", default=None)
+_DISABLED = contextlib.nullcontext()
+
+
+class _Stage(contextlib.AbstractContextManager[None]):
+    """Times a stage with the active timer."""
+
+    __slots__ = ("name", "timer")
+
+    def __init__(self, timer: StageTimer, name: str) -> None:
+        self.timer = timer
+        self.name = name
+
+    @override
+    def __enter__(self) -> None:
+        self.timer.enter(self.name)
+
+    @override
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.timer.exit()
+
+
+def stage(name: str) -> contextlib.AbstractContextManager[None]:
+    """Return a context manager timing a stage (a no-op unless collecting)."""
+    timer = _TIMER.get()
+    if timer is None:
+        return _DISABLED
+    return _Stage(timer, name)
+
+
+def timed(name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Decorator timing every call of a function as a stage."""
+
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            timer = _TIMER.get()
+            if timer is None:
+                return func(*args, **kwargs)
+            timer.enter(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timer.exit()
+
+        return wrapper
+
+    return decorator
+
+
+def timings_enabled() -> bool:
+    """Return whether stages are timed in the current context."""
+    return _TIMER.get() is not None
+
+
+@contextlib.contextmanager
+def collect_timings(
+    timings: dict[str, float],
+    spans: list[Span] | None = None,
+    name: str | None = None,
+    category: str = "block",
+    args: Mapping[str, str] | None = None,
+) -> Iterator[None]:
+    """Add the time spent per stage within the block to a dict.
+
+    Blocks can be nested; the time of an inner block only counts for its
+    own dict. Executor workers do not inherit the block: each processed
+    role collects its own timings (see RoleProcessor).
+
+    Args:
+        timings: Seconds per stage, added to
+        spans: List to add the Span of every stage to, if given
+        name: Name of a Span of the whole block, added to spans last
+        category: Category of the block's Span (like "role")
+        args: Details of the block's Span (like the role path)
+    """
+    outer = _TIMER.get()
+    if outer is not None:
+        outer.pause()
+    timer = StageTimer(timings, spans)
+    start = time.perf_counter()
+    token = _TIMER.set(timer)
+    try:
+        yield
+    finally:
+        timer.pause()
+        _TIMER.reset(token)
+        if spans is not None and name is not None:
+            spans.append(
+                Span(
+                    name,
+                    category,
+                    start,
+                    time.perf_counter(),
+                    timer.pid,
+                    timer.tid,
+                    args,
+                )
+            )
+        if outer is not None:
+            outer.resume()
@@ -9,6 +9,7 @@ from markdown_it.tree import SyntaxTreeNode
 from typing_extensions import override
 
 from .markdown_ast import parse_markdown
+from .timing import timed
 
 LOGGER = logging.getLogger(__name__)
 
@@ -66,13 +67,18 @@ class BaseTocGenerator(ABC):
         """
         pass
 
-    def generate_toc(self, content: str, link_prefix: str = "") -> str:
+    @timed("toc")
+    def generate_toc(
+        self, content: str, link_prefix: str = "", bullet_style: str | None = None
+    ) -> str:
         """Generate Table of Contents from content.
 
         Args:
             content: Content to analyze
             link_prefix: Prepended to every link target, before the "#"
                 (for ToCs pointing into another document)
+            bullet_style: Bullet style for this call; falls back to the
+                generator's bullet style, then to the one of content
 
         Returns:
             Generated TOC as string
@@ -82,7 +88,9 @@ class BaseTocGenerator(ABC):
             return ""
 
         # Auto-detect bullet style if not specified
-        bullet_style = self.bullet_style or self._detect_bullet_style(content)
+        bullet_style = (
+            bullet_style or self.bullet_style or self._detect_bullet_style(content)
+        )
 
         return self._generate_toc_lines(headings, bullet_style, link_prefix)
 
@@ -0,0 +1,105 @@
+"""Chrome Trace Event export of processing runs (see --trace).
+
+The spans of roles and their stages (see core.timing) are written in the
+Chrome Trace Event format, which Perfetto (https://ui.perfetto.dev) and
+chrome://tracing open. Every span becomes a complete ("X") event with
+the process and thread it ran in, so parallel runs show how the roles
+were scheduled on the workers, where workers idled and which phases (like
+the collection README) waited for all others.
+"""
+
+import json
+import os
+import threading
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, TextIO
+
+from .timing import Span
+
+
+class TraceWriter:
+    """Writes spans to a trace file as they come in.
+
+    Events are written right away, so spans do not pile up in memory. The
+    file is complete once close() is called; it adds a span of the whole
+    run (from the creation of the writer).
+    """
+
+    def __init__(self, path: Path, name: str = "ansible-docsmith") -> None:
+        """Create the trace file.
+
+        Args:
+            path: The trace file (overwritten)
+            name: Process name of the main process in the trace
+
+        Raises:
+            OSError: If the file cannot be written
+        """
+        self.path = path
+        self._file: TextIO | None = path.open("w", encoding="utf-8")
+        # Timestamps are relative to the start of the run
+        self._start = time.perf_counter()
+        self._pid = os.getpid()
+        self._tid = threading.get_native_id()
+        self._pids = {self._pid}
+        self._events = 0
+        self._file.write('{"displayTimeUnit": "ms", "traceEvents": [\n')
+        self._process_name(self._pid, name)
+
+    def _write_event(self, event: dict[str, Any]) -> None:
+        if self._file is None:
+            raise ValueError("Trace is already closed")
+        if self._events:
+            self._file.write(",\n")
+        self._file.write(json.dumps(event, ensure_ascii=False))
+        self._events += 1
+
+    def _process_name(self, pid: int, name: str) -> None:
+        """Write the metadata event naming a process."""
+        self._write_event(
+            {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": name}}
+        )
+
+    def write_spans(self, spans: Iterable[Span]) -> None:
+        """Write spans as complete events (times in microseconds)."""
+        for span in spans:
+            if span.pid not in self._pids:
+                self._pids.add(span.pid)
+                self._process_name(span.pid, f"worker {span.pid}")
+            event: dict[str, Any] = {
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": round((span.start - self._start) * 1e6, 3),
+                "dur": round((span.end - span.start) * 1e6, 3),
+                "pid": span.pid,
+                "tid": span.tid,
+            }
+            if span.args:
+                event["args"] = dict(span.args)
+            self._write_event(event)
+
+    def close(self) -> None:
+        """Write the span of the whole run and finish the file.
+
+        Does nothing if the trace is already closed.
+        """
+        if self._file is None:
+            return
+        self.write_spans(
+            [
+                Span(
+                    "run",
+                    "run",
+                    self._start,
+                    time.perf_counter(),
+                    self._pid,
+                    self._tid,
+                )
+            ]
+        )
+        self._file.write("\n]}\n")
+        self._file.close()
+        self._file = None
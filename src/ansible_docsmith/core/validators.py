@@ -0,0 +1,398 @@
+"""Checks of a role's argument specs, sharing a single traversal.
+
+Every check is a visitor: it is called once per entry point and once per
+(nested) option of the raw argument specs, and may inspect the whole role
+before (``start()``) and after (``finish()``) the traversal. The checks
+are registered by name, so callers (like ``validate --only/--skip``) can
+select a subset of them:
+
+    report = run_spec_checks(context, only=["unknown-keys", "defaults"])
+
+The traversal walks the raw specs exactly once, no matter how many checks
+are selected; each check only pays for the visits it implements.
+"""
+
+import time
+from collections.abc import Callable, Collection
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, ClassVar
+
+from typing_extensions import override
+
+from ..constants import SPEC_VALID_ENTRYPOINT_KEYS, SPEC_VALID_OPTION_KEYS
+from .markup import lint_ansible_markup
+from .options import OptionIndexEntry, build_option_index
+
+
+@dataclass
+class SpecCheckContext:
+    """Role data shared by all checks of one run."""
+
+    role_path: Path
+    # Normalized argument specs
+    specs: dict[str, Any]
+    # Raw (unnormalized) argument specs, which preserve unknown keys and
+    # distinguish explicitly set keys from normalization artifacts; None
+    # if unavailable (checks fall back to the normalized specs)
+    original_specs: dict[str, Any] | None
+    # Entry point -> defaults file (like defaults/main.yml), if present
+    defaults_files: dict[str, Path] = field(default_factory=dict)
+    # Loads a defaults file into a mapping; empty if it cannot be read
+    load_defaults: Callable[[Path], dict[str, Any]] = lambda path: {}
+
+
+@dataclass
+class SpecCheckReport:
+    """Combined findings of all checks of one run.
+
+    Findings are grouped by check, in registration order, so the output
+    does not depend on the traversal order.
+    """
+
+    errors: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+    notices: list[str] = field(default_factory=list)
+    # Check name -> seconds spent in the check (all its visits)
+    timings: dict[str, float] = field(default_factory=dict)
+
+
+class SpecCheck:
+    """Base class of the argument spec checks.
+
+    Subclasses set ``name`` (and ``description``) and override the visits
+    they need; visits that are not overridden are never called.
+    """
+
+    name: ClassVar[str]
+    description: ClassVar[str]
+
+    def __init__(self, context: SpecCheckContext):
+        self.context = context
+        self.errors: list[str] = []
+        self.warnings: list[str] = []
+        self.notices: list[str] = []
+
+    def start(self) -> None:
+        """Called once before the traversal."""
+
+    def visit_entry_point(self, entry_point: str, spec: dict[str, Any]) -> None:
+        """Called once per entry point with its raw spec."""
+
+    def visit_option(self, entry_point: str, entry: OptionIndexEntry) -> None:
+        """Called once per (nested) option of an entry point, in pre-order."""
+
+    def finish(self) -> None:
+        """Called once after the traversal."""
+
+
+# Check name -> check class, in the order their findings are reported
+SPEC_CHECKS: dict[str, type[SpecCheck]] = {}
+
+
+def register_spec_check(check_class: type[SpecCheck]) -> type[SpecCheck]:
+    """Class decorator registering a check under its name."""
+    SPEC_CHECKS[check_class.name] = check_class
+    return check_class
+
+
+def select_spec_checks(
+    only: Collection[str] | None = None, skip: Collection[str] | None = None
+) -> list[str]:
+    """Resolve --only/--skip style selections to check names.
+
+    Args:
+        only: Run only these checks (all if None or empty)
+        skip: Do not run these checks
+
+    Returns:
+        Selected check names in registration order
+
+    Raises:
+        ValueError: If a name does not refer to a registered check
+    """
+    unknown = sorted(set(only or ()).union(skip or ()) - SPEC_CHECKS.keys())
+    if unknown:
+        raise ValueError(
+            f"Unknown check(s): {', '.join(unknown)}. "
+            f"Available checks: {', '.join(SPEC_CHECKS)}"
+        )
+    return [
+        name
+        for name in SPEC_CHECKS
+        if (not only or name in only) and name not in (skip or ())
+    ]
+
+
+def _overrides(check: SpecCheck, method: str) -> bool:
+    return getattr(type(check), method) is not getattr(SpecCheck, method)
+
+
+def run_spec_checks(
+    context: SpecCheckContext,
+    only: Collection[str] | None = None,
+    skip: Collection[str] | None = None,
+    fail_fast: bool = False,
+) -> SpecCheckReport:
+    """Run the selected checks over one traversal of the raw specs.
+
+    Args:
+        context: Role data to check
+        only: Run only these checks (all if None or empty)
+        skip: Do not run these checks
+        fail_fast: Stop all checks as soon as one of them reported an
+            error; the report then holds the findings up to that point
+
+    Raises:
+        ValueError: If a name does not refer to a registered check
+    """
+    checks = [SPEC_CHECKS[name](context) for name in select_spec_checks(only, skip)]
+    timings = dict.fromkeys((check.name for check in checks), 0.0)
+
+    def timed(check: SpecCheck, visit: Callable[..., None], *args: Any) -> None:
+        start = time.perf_counter()
+        visit(*args)
+        timings[check.name] += time.perf_counter() - start
+        if fail_fast and check.errors:
+            raise _StopChecks
+
+    entry_visitors = [c for c in checks if _overrides(c, "visit_entry_point")]
+    option_visitors = [c for c in checks if _overrides(c, "visit_option")]
+
+    try:
+        for check in checks:
+            timed(check, check.start)
+
+        if context.original_specs and (entry_visitors or option_visitors):
+            for entry_point, spec in context.original_specs.items():
+                if not isinstance(spec, dict):
+                    continue
+                for check in entry_visitors:
+                    timed(check, check.visit_entry_point, entry_point, spec)
+                if not option_visitors:
+                    continue
+                for entry in build_option_index(spec.get("options")).values():
+                    for check in option_visitors:
+                        timed(check, check.visit_option, entry_point, entry)
+
+        for check in checks:
+            timed(check, check.finish)
+    except _StopChecks:
+        pass
+
+    report = SpecCheckReport(timings=timings)
+    for check in checks:
+        report.errors.extend(check.errors)
+        report.warnings.extend(check.warnings)
+        report.notices.extend(check.notices)
+    return report
+
+
+class _StopChecks(Exception):
+    """Raised internally to end a fail-fast run at the first error."""
+
+
+@register_spec_check
+class DefaultsConsistencyCheck(SpecCheck):
+    """Compare entry-point defaults files with the argument specs."""
+
+    name = "defaults"
+    description = "defaults files match the variables and defaults of the specs"
+
+    @override
+    def finish(self) -> None:
+        context = self.context
+
+        for entry_point, spec in context.specs.items():
+            spec_vars = set(spec.get("options", {}).keys())
+            defaults_vars: set[str] = set()
+            defaults_values: dict[str, Any] = {}
+
+            # Raw option specs preserve which keys were explicitly set
+            original_options = None
+            if context.original_specs:
+                entry = context.original_specs.get(entry_point, {})
+                if isinstance(entry, dict):
+                    original_options = entry.get("options", {}) or {}
+
+            if entry_point in context.defaults_files:
+                # Load the defaults file once, for its variables and values
+                defaults_values = context.load_defaults(
+                    context.defaults_files[entry_point]
+                )
+                defaults_vars = set(defaults_values.keys())
+
+                # ERROR: Variables in defaults but not in specs
+                undefined_vars = defaults_vars - spec_vars
+                if undefined_vars:
+                    self.errors.append(
+                        f"Entry point '{entry_point}': Variables present in defaults/"
+                        f"{entry_point}.yml but missing from argument_specs.yml: "
+                        f"{sorted(undefined_vars)}"
+                    )
+
+            # Variables with explicit defaults in the specs (not the
+            # parser-added None), with their values
+            spec_defaults: dict[str, Any] = {}
+            if original_options is not None:
+                for name, var_spec in original_options.items():
+                    if isinstance(var_spec, dict) and "default" in var_spec:
+                        spec_defaults[name] = var_spec["default"]
+            else:
+                # Fallback: treat variables with non-None defaults as having
+                # explicit defaults
+                for name, var_spec in spec.get("options", {}).items():
+                    if (
+                        isinstance(var_spec, dict)
+                        and "default" in var_spec
+                        and var_spec["default"] is not None
+                    ):
+                        spec_defaults[name] = var_spec["default"]
+
+            # ERROR: Variables with defaults in specs but missing from defaults file
+            missing_defaults = set(spec_defaults) - defaults_vars
+            if missing_defaults:
+                defaults_file = f"defaults/{entry_point}.yml"
+                self.errors.append(
+                    f"Entry point '{entry_point}': Variables have defaults in "
+                    f"argument_specs.yml but are missing from {defaults_file}: "
+                    f"{sorted(missing_defaults)}"
+                )
+
+            if not defaults_vars:
+                continue
+
+            # NOTICE: Variables in specs but not in defaults (potential
+            # oversight). Required variables do not need defaults.
+            source_options = (
+                original_options
+                if original_options is not None
+                else spec.get("options", {})
+            )
+            non_required_missing = set()
+            for var_name in spec_vars - defaults_vars:
+                var_spec = source_options.get(var_name, {})
+                if not (
+                    isinstance(var_spec, dict) and var_spec.get("required") is True
+                ):
+                    non_required_missing.add(var_name)
+            if non_required_missing:
+                self.notices.append(
+                    f"Entry point '{entry_point}': Variables in "
+                    f"argument_specs.yml but not in defaults/{entry_point}.yml "
+                    f"(may be intentional): {sorted(non_required_missing)}"
+                )
+
+            # WARNING: Default value mismatches between specs and defaults files
+            for var_name, spec_value in spec_defaults.items():
+                if var_name in defaults_values:
+                    defaults_value = defaults_values[var_name]
+                    if spec_value != defaults_value:
+                        self.warnings.append(
+                            f"Entry point '{entry_point}': Default value "
+                            f"mismatch for variable '{var_name}': "
+                            f"argument_specs.yml defines {spec_value!r} but "
+                            f"defaults/{entry_point}.yml defines "
+                            f"{defaults_value!r}"
+                        )
+
+
+@register_spec_check
+class UnknownKeysCheck(SpecCheck):
+    """Warn about unknown (likely misspelled) keys in the argument specs."""
+
+    name = "unknown-keys"
+    description = "only known keys are used for entry points and options"
+
+    # Warnings might also indicate DocSmith is outdated if the official
+    # format spec was extended (even though it was stable for years). In
+    # doubt, check the sources named at the constant definitions.
+
+    @override
+    def visit_entry_point(self, entry_point: str, spec: dict[str, Any]) -> None:
+        unknown_role_keys = set(spec.keys()) - SPEC_VALID_ENTRYPOINT_KEYS
+        if unknown_role_keys:
+            self.warnings.append(
+                f"Entry point '{entry_point}': Unknown keys in argument_specs: "
+                f"{sorted(unknown_role_keys)}. This might be an error in your "
+                f"role."
+            )
+
+    @override
+    def visit_option(self, entry_point: str, entry: OptionIndexEntry) -> None:
+        unknown_var_keys = set(entry.spec.keys()) - SPEC_VALID_OPTION_KEYS
+        if unknown_var_keys:
+            self.warnings.append(
+                f"Entry point '{entry_point}', variable '{entry.path}': "
+                f"Unknown keys: {sorted(unknown_var_keys)}. This might "
+                f"be an error in your role."
+            )
+
+
+@register_spec_check
+class ExclusiveKeysCheck(SpecCheck):
+    """Reject variables that combine a default with ``required: true``."""
+
+    name = "exclusive-keys"
+    description = "variables do not set both 'default' and 'required: true'"
+
+    @override
+    def visit_option(self, entry_point: str, entry: OptionIndexEntry) -> None:
+        if entry.depth > 0:
+            return
+
+        # Check for the conflict: both default and required: true
+        if "default" in entry.spec and entry.spec.get("required") is True:
+            self.errors.append(
+                f"Entry point '{entry_point}': Variable '{entry.name}' has "
+                f"both 'default' and 'required: true' which are mutually "
+                f"exclusive. Remove either the default value or set "
+                f"required to false."
+            )
+
+
+@register_spec_check
+class MarkupCheck(SpecCheck):
+    """Lint Ansible markup in all descriptions of the argument specs.
+
+    Invalid markup (like ``M()`` without a FQCN) is left verbatim by the
+    generators; these warnings point role authors at the mistake.
+    """
+
+    name = "markup"
+    description = "descriptions contain valid Ansible markup"
+
+    def __init__(self, context: SpecCheckContext):
+        super().__init__(context)
+        # Description id -> (description, lint messages); descriptions of
+        # subtrees shared via YAML aliases are the same object for each use
+        self._linted: dict[int, tuple[Any, list[str]]] = {}
+
+    @override
+    def visit_entry_point(self, entry_point: str, spec: dict[str, Any]) -> None:
+        for key in ("short_description", "description"):
+            self._lint(spec.get(key), f"Entry point '{entry_point}' ({key})")
+
+    @override
+    def visit_option(self, entry_point: str, entry: OptionIndexEntry) -> None:
+        self._lint(
+            entry.spec.get("description"),
+            f"Entry point '{entry_point}', variable '{entry.path}'",
+        )
+
+    def _lint(self, texts: Any, location: str) -> None:
+        cached = self._linted.get(id(texts))
+        if cached is None:
+            items = [texts] if isinstance(texts, str) else texts
+            messages = (
+                [
+                    message
+                    for item in items
+                    for message in lint_ansible_markup(str(item))
+                ]
+                if isinstance(items, list)
+                else []
+            )
+            cached = self._linted[id(texts)] = (texts, messages)
+        for message in cached[1]:
+            self.warnings.append(f"{location}: Invalid Ansible markup: {message}")
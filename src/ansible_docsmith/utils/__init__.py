@@ -1,7 +1,10 @@
 """Utilities for ansible-docsmith."""
 
 from .logging import setup_logging
+from .output import Output, strip_markup
 
 __all__ = [
+    "Output",
     "setup_logging",
+    "strip_markup",
 ]
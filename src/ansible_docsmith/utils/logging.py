@@ -1,17 +1,38 @@
 """Logging configuration for ansible-docsmith."""
 
 import logging
+import sys
 
-from rich.console import Console
-from rich.logging import RichHandler
+from typing_extensions import override
 
 
-def setup_logging(verbose: bool = False) -> None:
+class _PlainHandler(logging.StreamHandler):  # type: ignore[type-arg]
+    """Stream handler writing to stderr after flushing stdout.
+
+    Keeps log messages in order with the (buffered) plain console output
+    when both streams end up in the same log.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(sys.stderr)
+
+    @override
+    def emit(self, record: logging.LogRecord) -> None:
+        sys.stdout.flush()
+        super().emit(record)
+
+
+def setup_logging(verbose: bool = False, rich: bool = True) -> None:
     """Configure the package logger with a Rich handler.
 
     Called once at the application entry point. Modules obtain their own
     loggers via ``logging.getLogger(__name__)``, which propagate to this
     configured ``ansible_docsmith`` package logger.
+
+    Args:
+        verbose: Log debug messages, with the logger names
+        rich: Log through Rich; plain "LEVEL: message" lines otherwise
+            (without importing Rich)
     """
 
     # Configure the package-root logger
@@ -19,24 +40,33 @@ def setup_logging(verbose: bool = False) -> None:
     logger.setLevel(logging.DEBUG if verbose else logging.INFO)
 
     # Remove existing handlers
-    for handler in logger.handlers[:]:
-        logger.removeHandler(handler)
-
-    # Create rich handler
-    console = Console(stderr=True)
-    handler = RichHandler(
-        console=console,
-        show_time=False,
-        show_path=verbose,
-        markup=True,
-        rich_tracebacks=True,
-    )
+    for old_handler in logger.handlers[:]:
+        logger.removeHandler(old_handler)
+
+    # Create rich (or plain) handler
+    handler: logging.Handler
+    if rich:
+        from rich.console import Console
+        from rich.logging import RichHandler
+
+        console = Console(stderr=True)
+        handler = RichHandler(
+            console=console,
+            show_time=False,
+            show_path=verbose,
+            markup=True,
+            rich_tracebacks=True,
+        )
+    else:
+        handler = _PlainHandler()
 
     # Set format
     if verbose:
         format_str = "%(name)s: %(message)s"
     else:
         format_str = "%(message)s"
+    if not rich:
+        format_str = "%(levelname)s: " + format_str
 
     formatter = logging.Formatter(format_str)
     handler.setFormatter(formatter)
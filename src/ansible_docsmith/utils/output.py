@@ -0,0 +1,126 @@
+"""Console output of the CLI commands (see --output).
+
+In "rich" mode, messages are rendered with Rich: console markup, tables
+and colored diffs. "plain" writes the same lines as plain text straight
+to stdout, without building any Rich objects, and "quiet" only the lines
+reporting problems (errors, warnings and failed results). "json-lines"
+writes machine-readable records instead, one JSON object per line (see
+record()); problems are reported as plain lines on stderr then. Rich is
+only imported once something is rendered with it, so the other modes do
+not load it at all.
+"""
+
+import json
+import re
+import sys
+from typing import TYPE_CHECKING, Any
+
+from ..constants import OUTPUT_MODES
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+# The console markup tags of the CLI messages (styles and links). Other
+# bracketed text, like Markdown links in warnings, is kept.
+_MARKUP_TAG = re.compile(
+    r"\[(?:/|/?link(?:=[^\]]*)?"
+    r"|/?(?:(?:bold|dim|italic|red|green|yellow|blue|cyan|magenta) ?)+)\]"
+)
+
+
+def strip_markup(message: str) -> str:
+    """Remove the console markup tags from a message."""
+    return _MARKUP_TAG.sub("", message)
+
+
+class Output:
+    """Console output in one of OUTPUT_MODES."""
+
+    def __init__(self, mode: str = "rich") -> None:
+        self.mode = "rich"
+        self._console: Console | None = None
+        self.configure(mode)
+
+    def configure(self, mode: str) -> None:
+        """Switch to another output mode.
+
+        Raises:
+            ValueError: If the mode is none of OUTPUT_MODES
+        """
+        mode = mode.lower()
+        if mode not in OUTPUT_MODES:
+            raise ValueError(
+                f"Output must be one of {', '.join(map(repr, OUTPUT_MODES))}"
+            )
+        self.mode = mode
+
+    @property
+    def rich(self) -> bool:
+        """Whether output is rendered with Rich."""
+        return self.mode == "rich"
+
+    @property
+    def quiet(self) -> bool:
+        """Whether only problems are reported."""
+        return self.mode == "quiet"
+
+    @property
+    def json_lines(self) -> bool:
+        """Whether results are written as JSON records (see record())."""
+        return self.mode == "json-lines"
+
+    @property
+    def rich_console(self) -> "Console":
+        """The Rich console to print tables and other renderables with."""
+        if self._console is None:
+            from rich.console import Console
+
+            self._console = Console()
+        return self._console
+
+    def print(
+        self,
+        message: str = "",
+        style: str | None = None,
+        highlight: bool | None = None,
+        *,
+        problem: bool = False,
+    ) -> None:
+        """Print a line of console markup (like "[red]Error[/red]").
+
+        Args:
+            message: The line, with console markup
+            style: Style of the whole line (rich mode)
+            highlight: Whether Rich highlights numbers, paths etc.
+            problem: Whether the line reports a problem; other lines are
+                not printed in quiet and json-lines mode
+        """
+        if self.json_lines:
+            if problem:
+                sys.stdout.flush()
+                sys.stderr.write(strip_markup(message.lstrip("\n")) + "\n")
+        elif self.quiet:
+            if problem:
+                self.write(strip_markup(message.lstrip("\n")))
+        elif self.rich:
+            self.rich_console.print(message, style=style, highlight=highlight)
+        else:
+            self.write(strip_markup(message))
+
+    def write(self, line: str) -> None:
+        """Write a line as it is, without markup (plain and quiet mode).
+
+        Lines go to the buffered stdout stream; it is flushed before log
+        messages (see setup_logging()) and when the program ends.
+        """
+        sys.stdout.write(line + "\n")
+
+    def record(self, record: dict[str, Any]) -> None:
+        """Write a JSON record as one line (json-lines mode only).
+
+        Every record is flushed right away, so consumers can process it
+        while the run goes on.
+        """
+        if self.json_lines:
+            sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+            sys.stdout.flush()
@@ -1,8 +1,9 @@
 """Pytest configuration for ansible-docsmith tests."""
 
 import shutil
+import subprocess
 import tempfile
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
 from pathlib import Path
 
 import pytest
@@ -58,3 +59,32 @@ def sample_role_with_specs_and_defaults(
     defaults_file = sample_role_with_specs / "defaults" / "main.yml"
     defaults_file.write_text(fixture_defaults.read_text(encoding="utf-8"))
     return sample_role_with_specs
+
+
+@pytest.fixture
+def git() -> Callable[..., None]:
+    """Return a helper running git commands in a repository."""
+    if shutil.which("git") is None:
+        pytest.skip("needs git")
+
+    def run(repo: Path, *args: str) -> None:
+        subprocess.run(
+            ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+            cwd=repo,
+            check=True,
+            capture_output=True,
+        )
+
+    return run
+
+
+@pytest.fixture
+def git_repo(temp_dir: Path, git: Callable[..., None]) -> Path:
+    """Git repository holding the example collection and a DocSmith pin."""
+    repo = temp_dir.resolve() / "repo"
+    shutil.copytree(Path(__file__).parent / "fixtures" / "example-collection", repo)
+    (repo / "requirements.txt").write_text("ansible-docsmith==2.0.0\nrich\n")
+    git(repo, "init", "--quiet")
+    git(repo, "add", ".")
+    git(repo, "commit", "--quiet", "-m", "Initial")
+    return repo
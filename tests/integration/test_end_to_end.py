@@ -408,6 +408,81 @@ class TestEndToEnd:
         result = runner.invoke(app, ["validate", str(role_path), "--strict"])
         assert result.exit_code == 1
 
+    def test_validate_only_and_skip_checks(self, temp_dir: Path) -> None:
+        """--only/--skip select the argument spec checks that run."""
+        runner = CliRunner()
+        role_path = self._create_clean_role(temp_dir, "Bad M(ref) here.")
+
+        for args in (["--skip", "markup"], ["--only", "defaults,unknown-keys"]):
+            result = runner.invoke(app, ["validate", str(role_path), "--strict", *args])
+            assert result.exit_code == 0
+            assert "Invalid Ansible markup" not in result.stdout
+
+        result = runner.invoke(app, ["validate", str(role_path), "--only", "markup"])
+        assert result.exit_code == 0
+        assert "Invalid Ansible markup" in result.stdout
+
+        result = runner.invoke(app, ["validate", str(role_path), "--skip", "nope"])
+        assert result.exit_code == 1
+        assert "Unknown check(s): nope" in result.stdout
+
+    def test_ci_combines_validation_and_check(self, temp_dir: Path) -> None:
+        """ci fails on stale documentation and on warnings (--strict default)."""
+        runner = CliRunner()
+        role_path = self._create_clean_role(temp_dir, "Bad M(ref) here.")
+        readme_before = (role_path / "README.md").read_text(encoding="utf-8")
+
+        result = runner.invoke(app, ["ci", str(role_path)])
+        assert result.exit_code == 1
+        assert "not up to date" in result.stdout
+        assert "Invalid Ansible markup" in result.stdout
+        assert "validation warning(s)" in result.stdout
+        # Nothing is written
+        assert (role_path / "README.md").read_text(encoding="utf-8") == readme_before
+
+        result = runner.invoke(app, ["generate", str(role_path)])
+        assert result.exit_code == 0
+
+        result = runner.invoke(app, ["ci", str(role_path)])
+        assert result.exit_code == 1
+        assert "not up to date" not in result.stdout
+
+        result = runner.invoke(app, ["ci", str(role_path), "--no-strict"])
+        assert result.exit_code == 0
+        assert "Invalid Ansible markup" in result.stdout
+        assert "documentation is up to date" in result.stdout
+
+    def test_multiple_paths_and_globs(self, temp_dir: Path) -> None:
+        """Several paths and glob patterns give one summary and exit code."""
+        runner = CliRunner()
+        roles = [
+            self._create_clean_role(temp_dir / "roles" / name, "Fine.")
+            for name in ("a", "b")
+        ]
+        pattern = str(temp_dir / "roles" / "*" / "clean-role")
+
+        result = runner.invoke(app, ["generate", pattern])
+        assert result.exit_code == 0
+        assert "Processing 2 paths" in result.stdout
+        assert all("Clean role" in (r / "README.md").read_text() for r in roles)
+
+        result = runner.invoke(app, ["validate", pattern, str(roles[0]), "--strict"])
+        assert result.exit_code == 0
+        assert "✅ Validation passed!" in result.stdout
+
+        (roles[1] / "README.md").write_text("# No markers\n", encoding="utf-8")
+        result = runner.invoke(app, ["validate", *map(str, roles)])
+        assert result.exit_code == 1
+        assert "missing required markers" in result.output
+        assert "✅ Validation passed!" not in result.output
+
+        result = runner.invoke(app, ["ci", str(roles[0])])
+        assert result.exit_code == 0
+
+        result = runner.invoke(app, ["generate", str(temp_dir / "nope-*")])
+        assert result.exit_code == 2
+        assert "No directory matches" in result.output
+
     def test_generate_command_with_actual_files(
         self, sample_role_with_specs_and_defaults: Path
     ) -> None:
@@ -0,0 +1,130 @@
+"""Tests for the asyncio API (core/aio.py)."""
+
+import asyncio
+import shutil
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from ansible_docsmith.core.aio import process_collection_async, process_role_async
+from ansible_docsmith.core.collection import CollectionProcessor
+from ansible_docsmith.core.processor import ProcessingResults, RoleProcessor
+
+FIXTURE = Path(__file__).parent.parent / "fixtures" / "example-collection"
+
+
+def _diffs(results: ProcessingResults) -> dict[Path, str]:
+    return {path: new for path, _old, new in results.file_diffs}
+
+
+class TestProcessAsync:
+    """Processing roles and collections without blocking the event loop."""
+
+    def test_role_matches_sync_processing(self) -> None:
+        role = FIXTURE / "roles" / "first"
+
+        results = asyncio.run(process_role_async(role, dry_run=True))
+
+        expected = RoleProcessor(dry_run=True).process_role(role)
+        assert _diffs(results) == _diffs(expected)
+        assert results.operations == expected.operations
+
+    @pytest.mark.parametrize("executor_type", [ThreadPoolExecutor, ProcessPoolExecutor])
+    def test_collection_matches_sync_processing(
+        self, executor_type: type[ThreadPoolExecutor | ProcessPoolExecutor]
+    ) -> None:
+        done: list[str] = []
+
+        with executor_type(max_workers=2) as executor:
+            results = asyncio.run(
+                process_collection_async(
+                    FIXTURE,
+                    dry_run=True,
+                    executor=executor,
+                    progress=lambda name, _results: done.append(name),
+                )
+            )
+
+        expected = CollectionProcessor(FIXTURE, dry_run=True).process_collection()
+        assert _diffs(results) == _diffs(expected)
+        assert results.errors == expected.errors
+        assert sorted(done) == ["first", "second"]
+
+    def test_writes_changes(self, temp_dir: Path) -> None:
+        collection = temp_dir / "collection"
+        shutil.copytree(FIXTURE, collection)
+        expected = CollectionProcessor(
+            collection, dry_run=True, selected_roles=["second"]
+        ).process_collection()
+
+        results = asyncio.run(
+            process_collection_async(collection, selected_roles=["second"])
+        )
+
+        assert not results.errors
+        assert not results.file_diffs
+        assert expected.file_diffs
+        for path, _old, new in expected.file_diffs:
+            assert path.read_text() == new
+        first_readme = collection / "roles" / "first" / "README.md"
+        assert (
+            first_readme.read_text()
+            == (FIXTURE / "roles" / "first" / "README.md").read_text()
+        )
+
+    def test_cancellation(self, temp_dir: Path) -> None:
+        collection = temp_dir / "collection"
+        shutil.copytree(FIXTURE, collection)
+        readmes = {
+            name: (collection / "roles" / name / "README.md").read_text()
+            for name in ("first", "second")
+        }
+
+        async def run() -> None:
+            task = asyncio.current_task()
+            assert task is not None
+            await process_collection_async(
+                collection,
+                max_concurrent_roles=1,
+                progress=lambda _name, _results: task.cancel(),
+            )
+
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(run())
+
+        # The first role was written, the second one never started
+        assert (collection / "roles" / "first" / "README.md").read_text() != (
+            readmes["first"]
+        )
+        assert (collection / "roles" / "second" / "README.md").read_text() == (
+            readmes["second"]
+        )
+
+    def test_unreadable_files_are_reported(self, temp_dir: Path) -> None:
+        collection = temp_dir / "collection"
+        shutil.copytree(FIXTURE, collection)
+        broken = collection / "roles" / "first" / "README.md"
+        broken.write_bytes(b"# \xff\xfe not UTF-8\n")
+        second_readme = collection / "roles" / "second" / "README.md"
+        original = second_readme.read_text()
+
+        results = asyncio.run(
+            process_collection_async(collection, selected_roles=["first", "second"])
+        )
+
+        assert len(results.errors) == 1
+        assert results.errors[0].startswith(f"Role 'first': Cannot read {broken}")
+        # The role is left alone; the others are still processed
+        assert broken.read_bytes() == b"# \xff\xfe not UTF-8\n"
+        assert second_readme.read_text() != original
+
+    def test_unknown_selected_roles_are_reported(self) -> None:
+        results = asyncio.run(
+            process_collection_async(
+                FIXTURE, dry_run=True, selected_roles=["first", "nope"]
+            )
+        )
+
+        assert results.errors == [f"Role 'nope' not found in {FIXTURE}"]
+        assert FIXTURE / "roles" / "first" / "README.md" in results.changed_files()
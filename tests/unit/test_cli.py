@@ -1,11 +1,22 @@
 """Tests for CLI functionality."""
 
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+import typer
 from typer.testing import CliRunner
 
-from ansible_docsmith.cli import app
+from ansible_docsmith.cli import _expand_paths, app
+from ansible_docsmith.utils.output import strip_markup
 
 runner = CliRunner()
 
+COLLECTION = Path(__file__).parent.parent / "fixtures" / "example-collection"
+
 
 def test_version() -> None:
     """Test version command."""
@@ -19,3 +30,209 @@ def test_help() -> None:
     result = runner.invoke(app, ["--help"])
     assert result.exit_code == 0
     assert "ansible-docsmith" in result.stdout.lower()
+
+
+def test_expand_paths(tmp_path: Path) -> None:
+    """Glob patterns are expanded and paths are deduplicated."""
+    for name in ("b", "a"):
+        (tmp_path / "roles" / name).mkdir(parents=True)
+    (tmp_path / "roles" / "file.txt").write_text("")
+
+    roles = tmp_path / "roles"
+    assert _expand_paths([str(roles / "*")]) == [roles / "a", roles / "b"]
+
+    # Directories matched more than once are only returned once
+    assert _expand_paths([str(roles / "b"), str(roles / "a" / ".." / "*")]) == [
+        roles / "b",
+        roles / "a" / ".." / "a",
+    ]
+
+    with pytest.raises(typer.BadParameter, match="does not exist"):
+        _expand_paths([str(tmp_path / "missing")])
+
+
+def test_output_modes() -> None:
+    """Plain output has no markup or tables; quiet output only problems."""
+    assert strip_markup("[bold green]Role:[/bold green] [docs](x) [/]") == (
+        "Role: [docs](x) "
+    )
+
+    result = runner.invoke(
+        app, ["generate", "--check", "--output", "plain", str(COLLECTION)]
+    )
+    assert result.exit_code == 1
+    assert "Processing Results (DRY RUN):\n  README.md | Updated | ✅" in result.stdout
+    assert "[red]" not in result.stdout
+    assert "┃" not in result.stdout
+    assert '\n+## Role variables<a id="variables"></a>\n' in result.stdout
+
+    result = runner.invoke(app, ["ci", "--output", "quiet", str(COLLECTION)])
+    assert result.exit_code == 1
+    assert result.stdout == (
+        "❌ CI check failed:\n"
+        "  • documentation is not up to date (5 file(s) would change)\n"
+    )
+
+    result = runner.invoke(app, ["validate", "--output", "quiet", str(COLLECTION)])
+    assert result.exit_code == 0
+    assert result.stdout == ""
+
+    result = runner.invoke(app, ["validate", "--output", "fancy", str(COLLECTION)])
+    assert result.exit_code == 2
+    assert "Output must be one of" in result.output
+
+
+def test_plain_output_does_not_import_rich() -> None:
+    """Rich is not loaded at all in plain and quiet mode."""
+    code = (
+        "import sys\n"
+        "from ansible_docsmith.cli import app\n"
+        f"for mode in ('plain', 'quiet'):\n"
+        f"    try: app(['ci', '--output', mode, {str(COLLECTION)!r}])\n"
+        "    except SystemExit: pass\n"
+        "print(any(name.split('.')[0] == 'rich' for name in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.splitlines()[-1] == "False"
+
+
+def test_timings_output() -> None:
+    """--timings shows the time per stage and the slowest roles."""
+    result = runner.invoke(
+        app, ["ci", "--output", "quiet", "--timings", str(COLLECTION)]
+    )
+    lines = result.stdout.splitlines()
+    index = lines.index("Slowest roles:")
+    assert sorted(line.rsplit(":", 1)[0] for line in lines[index + 1 : index + 3]) == [
+        f"  {COLLECTION / 'roles' / 'first'}",
+        f"  {COLLECTION / 'roles' / 'second'}",
+    ]
+    assert lines.count("Slowest roles:") == 1
+    assert any(line.startswith("Timings (") for line in lines)
+    assert any(line.startswith("  jinja: ") for line in lines)
+    assert any(line.startswith("  diff: ") for line in lines)
+
+    # Not timed without the option
+    result = runner.invoke(app, ["ci", "--output", "quiet", str(COLLECTION)])
+    assert "Timings" not in result.stdout
+
+
+def test_trace_output(tmp_path: Path) -> None:
+    """--trace writes the spans of every role and stage as trace events."""
+    trace_path = tmp_path / "trace.json"
+    result = runner.invoke(
+        app,
+        [
+            "ci",
+            "--output",
+            "plain",
+            "--jobs",
+            "2",
+            "--executor",
+            "thread",
+            "--trace",
+            str(trace_path),
+            str(COLLECTION),
+        ],
+    )
+    assert result.exit_code == 1
+    assert f"Trace written to {trace_path}" in result.stdout
+
+    events = json.loads(trace_path.read_text(encoding="utf-8"))["traceEvents"]
+    assert events[0] == {
+        "name": "process_name",
+        "ph": "M",
+        "pid": os.getpid(),
+        "args": {"name": "ansible-docsmith"},
+    }
+    spans = {
+        event["name"]: event
+        for event in events
+        if event["ph"] == "X" and event["cat"] != "stage"
+    }
+    assert set(spans) == {"first", "second", "collection README", "run"}
+    assert spans["first"]["args"] == {"path": str(COLLECTION / "roles" / "first")}
+    for role in ("first", "second"):
+        assert spans[role]["pid"] == os.getpid()
+        assert spans[role]["tid"] != spans["run"]["tid"]
+        # The collection README waits for all roles
+        assert (
+            spans[role]["ts"] + spans[role]["dur"] <= spans["collection README"]["ts"]
+        )
+    stages = [event for event in events if event.get("cat") == "stage"]
+    assert {"validate", "jinja", "collection_readme"} <= {
+        event["name"] for event in stages
+    }
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in stages)
+
+    result = runner.invoke(
+        app, ["ci", "--trace", str(tmp_path / "missing" / "t.json"), str(COLLECTION)]
+    )
+    assert result.exit_code == 2
+    assert "Cannot write" in result.output
+
+
+def test_json_lines_output() -> None:
+    """One JSON record per role and collection README, then a summary."""
+    result = runner.invoke(
+        app,
+        [
+            "ci",
+            "--output",
+            "json-lines",
+            "--jobs",
+            "2",
+            "--executor",
+            "thread",
+            str(COLLECTION),
+        ],
+    )
+    assert result.exit_code == 1
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+
+    assert [record["type"] for record in records] == [
+        "role",
+        "role",
+        "collection",
+        "summary",
+    ]
+    roles = {record["role"]: record for record in records[:2]}
+    assert roles["first"]["collection"] == str(COLLECTION)
+    assert roles["first"]["changed_files"] == [
+        str(COLLECTION / "roles" / "first" / "README.md"),
+        str(COLLECTION / "roles" / "first" / "defaults" / "main.yml"),
+    ]
+    assert {"validate", "readme", "defaults", "jinja"} <= set(roles["first"]["timings"])
+    assert records[2]["changed_files"] == [str(COLLECTION / "README.md")]
+    assert records[3]["status"] == "failed"
+    assert records[3]["changed_files"] == 5
+    slowest = records[3]["slowest_roles"]
+    assert {role["path"] for role in slowest} == {
+        str(COLLECTION / "roles" / "first"),
+        str(COLLECTION / "roles" / "second"),
+    }
+    assert slowest[0]["seconds"] >= slowest[1]["seconds"]
+    assert records[3]["elapsed"] > 0
+    # Diffs are compressed while merging, outside of the roles
+    assert records[3]["timings"]["diff"] > 0
+    assert "diff" not in roles["first"]["timings"]
+
+    result = runner.invoke(app, ["validate", "--output", "json-lines", str(COLLECTION)])
+    assert result.exit_code == 0
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [record["type"] for record in records] == [
+        "role",
+        "role",
+        "collection",
+        "summary",
+    ]
+    assert "check:markup" in records[0]["timings"]
+    assert records[-1] == {"type": "summary", "status": "passed"}
+
+    result = runner.invoke(
+        app,
+        ["ci", "--output", "json-lines", "--diff-format", "patch", str(COLLECTION)],
+    )
+    assert result.exit_code == 2
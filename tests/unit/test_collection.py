@@ -1,12 +1,17 @@
 """Tests for collection detection and processing (core/collection.py)."""
 
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import pytest
+
 from ansible_docsmith.core.collection import (
     CollectionProcessor,
     detect_project_type,
     find_collection_roles,
 )
+from ansible_docsmith.core.processor import ProcessingResults, RoleProcessor
 
 FIXTURE = Path(__file__).parent.parent / "fixtures" / "example-collection"
 
@@ -120,3 +125,169 @@ class TestCollectionValidation:
         assert summary["warnings"] == []
         assert summary["notices"] == []
         assert list(summary["roles"].keys()) == ["first", "second"]
+
+
+class TestFailFast:
+    """--fail-fast stops scheduling roles once the outcome is known."""
+
+    def test_check_stops_at_first_stale_file(self) -> None:
+        # The fixture's managed sections are not generated yet, so every
+        # file would change
+        processor = CollectionProcessor(
+            collection_path=FIXTURE, dry_run=True, fail_fast=True
+        )
+        results = processor.process_collection()
+
+        first_readme = FIXTURE / "roles" / "first" / "README.md"
+        assert results.changed_files() == [first_readme]
+        assert [operation[0] for operation in results.operations] == [first_readme]
+
+    def test_validation_stops_at_first_failing_role(self, temp_dir: Path) -> None:
+        import shutil
+
+        collection = temp_dir / "example-collection"
+        shutil.copytree(FIXTURE, collection)
+        for role in ("first", "second"):
+            (collection / "roles" / role / "README.md").write_text("# No markers\n")
+
+        summary = CollectionProcessor(collection_path=collection).validate_collection()
+        assert len(summary["errors"]) == 2
+
+        processor = CollectionProcessor(collection_path=collection, fail_fast=True)
+        summary = processor.validate_collection()
+        assert len(summary["errors"]) == 1
+        assert summary["errors"][0].startswith("Role 'first'")
+
+
+class TestIterCollection:
+    """Streaming the results role by role."""
+
+    def test_yields_roles_then_collection_readme(self) -> None:
+        processor = CollectionProcessor(collection_path=FIXTURE, dry_run=True)
+        streamed = list(processor.iter_collection())
+
+        assert [role_name for role_name, _results in streamed] == [
+            "first",
+            "second",
+            None,
+        ]
+        first_readme = FIXTURE / "roles" / "first" / "README.md"
+        assert first_readme in streamed[0][1].changed_files()
+        assert streamed[2][1].changed_files() == [FIXTURE / "README.md"]
+
+        combined = processor.process_collection()
+        assert [
+            diff for _role_name, results in streamed for diff in results.file_diffs
+        ] == combined.file_diffs
+
+    def test_main_only_role_is_embedded(self, temp_dir: Path) -> None:
+        import shutil
+
+        collection = temp_dir / "example-collection"
+        shutil.copytree(FIXTURE, collection)
+        readme = collection / "README.md"
+        readme.write_text(
+            readme.read_text(encoding="utf-8").replace(
+                "<!-- ANSIBLE DOCSMITH TOC first START -->\n"
+                "<!-- ANSIBLE DOCSMITH TOC first END -->\n",
+                "",
+            ),
+            encoding="utf-8",
+        )
+
+        CollectionProcessor(collection_path=collection).process_collection()
+
+        content = readme.read_text(encoding="utf-8")
+        assert "TOC first" not in content
+        start = content.index("<!-- ANSIBLE DOCSMITH MAIN first START -->")
+        end = content.index("<!-- ANSIBLE DOCSMITH MAIN first END -->")
+        assert "first_" in content[start:end]
+
+    def test_executor_yields_every_role_once(self) -> None:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            processor = CollectionProcessor(
+                collection_path=FIXTURE, dry_run=True, executor=executor
+            )
+            streamed = dict(processor.iter_collection())
+            expected = dict(
+                CollectionProcessor(
+                    collection_path=FIXTURE, dry_run=True
+                ).iter_collection()
+            )
+
+            assert streamed == expected
+
+            # Stopping early is fine; unscheduled roles are cancelled
+            for role_name, _results in processor.iter_collection():
+                assert role_name in ("first", "second")
+                break
+
+    def test_fail_fast_ends_iteration(self) -> None:
+        processor = CollectionProcessor(
+            collection_path=FIXTURE, dry_run=True, fail_fast=True
+        )
+        assert [role_name for role_name, _ in processor.iter_collection()] == ["first"]
+
+    def test_fail_fast_in_collection_order(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        expected = CollectionProcessor(
+            collection_path=FIXTURE, dry_run=True, fail_fast=True
+        ).process_collection()
+
+        # "second" finishes (and fails) first, but "first" comes first
+        process_role = RoleProcessor.process_role
+
+        def slow_first(
+            processor: RoleProcessor, role_path: Path, **kwargs: bool
+        ) -> ProcessingResults:
+            if role_path.name == "first":
+                time.sleep(0.2)
+            return process_role(processor, role_path, **kwargs)
+
+        monkeypatch.setattr(RoleProcessor, "process_role", slow_first)
+        reported: list[str | None] = []
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = CollectionProcessor(
+                collection_path=FIXTURE,
+                dry_run=True,
+                fail_fast=True,
+                executor=executor,
+            ).process_collection(
+                progress=lambda role_name, _results: reported.append(role_name)
+            )
+
+        assert reported == ["second", "first"]
+        assert results == expected
+        assert results.changed_files() == [FIXTURE / "roles" / "first" / "README.md"]
+
+    def test_process_collection_progress(self) -> None:
+        expected = CollectionProcessor(
+            collection_path=FIXTURE, dry_run=True
+        ).process_collection()
+
+        reported: list[str | None] = []
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = CollectionProcessor(
+                collection_path=FIXTURE,
+                dry_run=True,
+                executor=executor,
+                collect_timings=True,
+            ).process_collection(
+                progress=lambda role_name, _results: reported.append(role_name)
+            )
+
+        # Reported as the roles are done, combined in collection order
+        assert sorted(reported[:2]) == ["first", "second"]
+        assert reported[2:] == [None]
+        assert results == expected
+        assert not expected.timings
+        assert {
+            "validate",
+            "readme",
+            "defaults",
+            "collection_readme",
+            "jinja",
+            "markup",
+            "yaml",
+        } <= set(results.timings)
@@ -0,0 +1,219 @@
+"""Tests for compact diff storage (core/diffs.py)."""
+
+import difflib
+import random
+import shutil
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from ansible_docsmith.cli import app
+from ansible_docsmith.core.collection import CollectionProcessor
+from ansible_docsmith.core.diffs import (
+    CompactFileDiff,
+    CompactFileDiffs,
+    diff_stat,
+    unified_diff,
+)
+from ansible_docsmith.core.processor import ProcessingResults
+
+FIXTURE = Path(__file__).parent.parent / "fixtures" / "example-collection"
+
+
+class TestCompactFileDiffs:
+    """File diffs stored as digests plus compressed contents."""
+
+    def test_round_trip(self) -> None:
+        large = "".join(f"line {number}: {'x' * 40}\n" for number in range(2000))
+        diffs = [
+            (Path("README.md"), "# Old\n", "# New\n\nÜmlauts\n"),
+            (Path("defaults/main.yml"), "---\n", "---\n"),
+            (Path("big.md"), large, large.replace("line 1999", "changed")),
+            (Path("empty.md"), "", "content\n"),
+        ]
+
+        compact = CompactFileDiffs(diffs)
+
+        assert list(compact) == diffs
+        assert compact == diffs
+        assert compact[2] == diffs[2]
+        assert compact[1:3] == diffs[1:3]
+        assert len(compact) == 4
+        assert compact.changed_files() == [
+            Path("README.md"),
+            Path("big.md"),
+            Path("empty.md"),
+        ]
+
+    def test_stores_changes_compactly(self) -> None:
+        old = "".join(
+            f"| `var_{number}` | Description {number} |\n" for number in range(500)
+        )
+        new = old.replace("var_250", "renamed")
+
+        diff = CompactFileDiff.from_contents(Path("README.md"), old, new)
+        assert diff.changed
+        assert len(diff.old_data) < len(old) / 4
+        # Compressed against the old content: mostly the change itself
+        assert diff.new_data is not None
+        assert len(diff.new_data) < len(diff.old_data) / 4
+
+        unchanged = CompactFileDiff.from_contents(Path("README.md"), old, old)
+        assert not unchanged.changed
+        assert unchanged.new_data is None
+        assert unchanged.contents() == (Path("README.md"), old, old)
+
+    def test_merge_keeps_diffs_compressed(self) -> None:
+        expected = CollectionProcessor(FIXTURE, dry_run=True).process_collection()
+        results = CollectionProcessor(FIXTURE, dry_run=True).process_collection(
+            compact_diffs=True
+        )
+
+        assert isinstance(results.file_diffs, CompactFileDiffs)
+        assert results.changed_files() == expected.changed_files()
+        assert list(results.file_diffs) == expected.file_diffs
+
+        combined = ProcessingResults(
+            operations=[], errors=[], warnings=[], file_diffs=CompactFileDiffs()
+        )
+        combined.merge(results)
+        assert isinstance(combined.file_diffs, CompactFileDiffs)
+        assert combined.file_diffs.compact_diffs() == results.file_diffs.compact_diffs()
+
+
+def _apply(old_content: str, diff_lines: list[str]) -> str:
+    """Apply a unified diff of one file (test helper)."""
+    old = old_content.splitlines(keepends=True)
+    new: list[str] = []
+    position = 0
+    for line in diff_lines[2:]:
+        if line.startswith("@@"):
+            start = int(line.split()[1][1:].split(",")[0])
+            # Empty ranges name the line before them
+            length = line.split()[1].split(",")[1:] or ["1"]
+            start = start if length != ["0"] else start + 1
+            new.extend(old[position : start - 1])
+            position = start - 1
+        elif line.startswith("\\"):
+            new[-1] = new[-1].removesuffix("\n")
+        elif line.startswith(("-", " ")):
+            if line[0] == " ":
+                new.append(old[position])
+            position += 1
+        else:
+            new.append(line[1:])
+    new.extend(old[position:])
+    return "".join(new)
+
+
+class TestUnifiedDiff:
+    """Unified diffs, with a near-linear algorithm for large files."""
+
+    def test_small_files_match_difflib(self) -> None:
+        old = "# Title\n\nintro\n\n## Variables\n\n- a\n- b\n"
+        new = "# Title\n\nnew intro\n\n## Variables\n\n- a\n- c\n- d\n"
+        expected = difflib.unified_diff(
+            old.splitlines(keepends=True),
+            new.splitlines(keepends=True),
+            "a/README.md",
+            "b/README.md",
+        )
+        assert list(unified_diff(old, new, "a/README.md", "b/README.md")) == list(
+            expected
+        )
+        assert list(unified_diff(old, old, "a", "b")) == []
+        assert diff_stat(old, new) == (3, 2)
+
+    def test_missing_newline_at_end_of_file(self) -> None:
+        assert list(unified_diff("a\nb", "a\nc\n", "a/f", "b/f")) == [
+            "--- a/f\n",
+            "+++ b/f\n",
+            "@@ -1,2 +1,2 @@\n",
+            " a\n",
+            "-b\n",
+            "\\ No newline at end of file\n",
+            "+c\n",
+        ]
+        assert diff_stat("a\nb", "a\nb\n") == (1, 1)
+        assert diff_stat("a\nb\n", "a\nb") == (1, 1)
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_large_rewrites(self, seed: int) -> None:
+        generator = random.Random(seed)
+        old_lines = [
+            f"| `var_{number}` | {generator.choice(['str', 'int', ''])} |\n"
+            for number in range(3000)
+        ]
+        new_lines = list(old_lines)
+        for _ in range(300):
+            index = generator.randrange(len(new_lines))
+            operation = generator.random()
+            if operation < 0.3:
+                del new_lines[index]
+            elif operation < 0.6:
+                new_lines.insert(index, f"inserted {generator.random()}\n")
+            else:
+                new_lines[index] = "\n"
+        old, new = "".join(old_lines), "".join(new_lines)
+
+        diff_lines = list(unified_diff(old, new, "a/README.md", "b/README.md"))
+
+        assert _apply(old, diff_lines) == new
+        added, removed = diff_stat(old, new)
+        assert added == sum(line[0] == "+" for line in diff_lines[2:])
+        assert removed == sum(line[0] == "-" for line in diff_lines[2:])
+
+    def test_cli_diff_formats(
+        self, temp_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        collection = temp_dir / "collection"
+        shutil.copytree(FIXTURE, collection)
+        monkeypatch.chdir(temp_dir)
+        runner = CliRunner()
+
+        result = runner.invoke(
+            app, ["generate", "--check", "--diff-format", "stat", "collection"]
+        )
+        assert result.exit_code == 1
+        assert "collection/roles/first/README.md | +" in result.stdout
+        assert "5 file(s) changed" in result.stdout
+        assert "@@" not in result.stdout
+
+        result = runner.invoke(
+            app, ["generate", "--check", "--diff-max-lines", "2", "collection"]
+        )
+        assert "more line(s) of this diff not shown" in result.stdout
+
+        result = runner.invoke(
+            app, ["ci", "--diff-output", "changes.patch", "collection"]
+        )
+        assert result.exit_code == 1
+        patch = (temp_dir / "changes.patch").read_text()
+        assert "--- a/collection/roles/first/README.md\n" in patch
+        assert "+++ b/collection/roles/first/README.md\n" in patch
+        assert "Modifications that would be made" not in result.stdout
+
+        # Created files are diffed against /dev/null
+        (collection / "roles" / "second" / "README.md").unlink()
+        result = runner.invoke(
+            app,
+            [
+                "generate",
+                "--check",
+                "--diff-output",
+                "created.patch",
+                "collection/roles/second",
+            ],
+        )
+        assert result.exit_code == 1
+        patch = (temp_dir / "created.patch").read_text()
+        assert patch.startswith(
+            "--- /dev/null\n+++ b/collection/roles/second/README.md\n@@ -0,0 +1,"
+        )
+
+        result = runner.invoke(
+            app, ["generate", "--dry-run", "--diff-format", "nope", "collection"]
+        )
+        assert result.exit_code == 2
+        assert "--diff-format" in result.output
@@ -0,0 +1,167 @@
+"""Tests for role and collection discovery (core/discovery.py)."""
+
+import shutil
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from ansible_docsmith.cli import app
+from ansible_docsmith.core.discovery import (
+    OwnerLookup,
+    ProjectOwner,
+    changed_projects,
+    discover_projects,
+)
+
+FIXTURE = Path(__file__).parent.parent / "fixtures" / "example-collection"
+
+
+def _make_role(path: Path) -> Path:
+    (path / "meta").mkdir(parents=True)
+    (path / "meta" / "argument_specs.yml").write_text(
+        "---\nargument_specs:\n  main:\n    short_description: Test\n"
+    )
+    return path
+
+
+def _monorepo(base: Path) -> Path:
+    """Create a monorepo with roles, a collection and noise to prune."""
+    repo = base / "repo"
+    _make_role(repo / "roles" / "web")
+    _make_role(repo / "roles" / "db")
+    collection = repo / "collections" / "ansible_collections" / "ns" / "tools"
+    _make_role(collection / "roles" / "cli")
+    (collection / "galaxy.yml").write_text("namespace: ns\nname: tools\n")
+    # Never walked
+    _make_role(repo / ".git" / "roles" / "hidden")
+    _make_role(repo / "node_modules" / "pkg" / "role")
+    _make_role(repo / "env" / "lib" / "role")
+    (repo / "env" / "pyvenv.cfg").write_text("home = /usr/bin\n")
+    # A role without argument specs is not found
+    (repo / "roles" / "plain" / "tasks").mkdir(parents=True)
+    return repo
+
+
+class TestDiscoverProjects:
+    """Walking a tree for roles and collections."""
+
+    def test_finds_roles_and_collections(self, temp_dir: Path) -> None:
+        repo = _monorepo(temp_dir)
+
+        # The top-level roles/ directory makes the repository itself a
+        # collection
+        assert discover_projects(repo) == [
+            ("collection", repo),
+            (
+                "collection",
+                repo / "collections" / "ansible_collections" / "ns" / "tools",
+            ),
+        ]
+
+    def test_root_may_be_a_project(self, temp_dir: Path) -> None:
+        role = _make_role(temp_dir / "role")
+        assert discover_projects(role) == [("role", role)]
+
+    def test_ignore_patterns(self, temp_dir: Path) -> None:
+        repo = _monorepo(temp_dir)
+
+        found = discover_projects(repo / "roles", ignore=["w*"])
+        assert found == [("role", repo / "roles" / "db")]
+
+        found = discover_projects(repo, ignore=["collections/*"])
+        assert found == [("collection", repo)]
+
+    def test_symlinked_roles_are_found_once(self, temp_dir: Path) -> None:
+        repo = _monorepo(temp_dir)
+        (repo / "links").mkdir()
+        (repo / "links" / "web").symlink_to(repo / "roles" / "web")
+        # A loop back to the repository root ends, too
+        (repo / "links" / "loop").symlink_to(repo)
+
+        (repo / "roles" / "alias").symlink_to(repo / "roles" / "web")
+
+        assert discover_projects(repo / "roles") == [
+            ("role", repo / "roles" / "db"),
+            ("role", repo / "roles" / "web"),
+        ]
+        # The linked role is processed as part of the collection
+        assert [path for _type, path in discover_projects(repo)] == [
+            repo,
+            repo / "collections" / "ansible_collections" / "ns" / "tools",
+        ]
+
+    def test_cli_recursive(self, temp_dir: Path) -> None:
+        repo = _monorepo(temp_dir)
+        runner = CliRunner()
+
+        result = runner.invoke(
+            app, ["generate", str(repo), "--recursive", "--no-defaults"]
+        )
+        assert result.exit_code == 0
+        assert "Processing 2 paths" in result.stdout
+        assert (repo / "roles" / "db" / "README.md").exists()
+        assert not (repo / "roles" / "plain" / "README.md").exists()
+
+        result = runner.invoke(app, ["validate", str(repo / "roles" / "plain"), "-r"])
+        assert result.exit_code == 2
+        assert "No roles or collections found" in result.output
+
+
+class TestChangedProjects:
+    """Mapping changed files to their roles and collections."""
+
+    def test_owner_lookup(self, temp_dir: Path) -> None:
+        collection = temp_dir / "collection"
+        shutil.copytree(FIXTURE, collection)
+        role = _make_role(temp_dir / "standalone")
+        lookup = OwnerLookup()
+
+        assert lookup.owner(
+            collection / "roles" / "first" / "defaults" / "main.yml"
+        ) == ProjectOwner("collection", collection, role="first")
+        assert lookup.owner(collection / "README.md") == ProjectOwner(
+            "collection", collection
+        )
+        # Deleted files belong to the directory they were in
+        assert lookup.owner(role / "tasks" / "deleted.yml") == ProjectOwner(
+            "role", role
+        )
+        assert lookup.owner(temp_dir / "unrelated.txt") is None
+
+    def test_changed_projects(self, temp_dir: Path) -> None:
+        collection = temp_dir / "collection"
+        shutil.copytree(FIXTURE, collection)
+        role = _make_role(temp_dir / "standalone")
+
+        first = collection / "roles" / "first"
+        assert changed_projects(
+            [first / "README.md", first / "meta" / "argument_specs.yml", role]
+        ) == {collection: {"first"}, role: None}
+        # A change of the collection itself processes all of its roles
+        assert changed_projects([first / "README.md", collection / "galaxy.yml"]) == {
+            collection: None
+        }
+
+    def test_cli_files_from(self, temp_dir: Path) -> None:
+        collection = temp_dir / "collection"
+        shutil.copytree(FIXTURE, collection)
+        runner = CliRunner()
+        changed = f"{collection / 'roles' / 'second' / 'defaults' / 'main.yml'}\n"
+
+        result = runner.invoke(
+            app, ["generate", "--check", "--files-from", "-"], input=changed
+        )
+        assert result.exit_code == 1
+        assert "second/README.md" in result.stdout
+        assert "first/README.md" not in result.stdout
+
+        result = runner.invoke(
+            app, ["validate", "--changed", str(collection / "roles" / "first")]
+        )
+        assert result.exit_code == 0
+        assert "Role: first" in result.stdout
+        assert "Role: second" not in result.stdout
+
+        result = runner.invoke(app, ["ci", "--changed", str(temp_dir / "other.txt")])
+        assert result.exit_code == 0
+        assert "No roles or collections affected" in result.stdout
@@ -0,0 +1,144 @@
+"""Tests for parallel role processing (core/executors.py) and --jobs."""
+
+import pickle
+import shutil
+from concurrent.futures import Executor, Future
+from pathlib import Path
+from typing import Any
+
+import pytest
+from typer.testing import CliRunner
+
+from ansible_docsmith import cli
+from ansible_docsmith.cli import _report_results as report_results
+from ansible_docsmith.cli import app
+from ansible_docsmith.core.collection import CollectionProcessor
+from ansible_docsmith.core.executors import (
+    create_executor,
+    free_threaded,
+    resolve_executor_type,
+    submit_role,
+)
+from ansible_docsmith.core.sources import FILE_SYSTEM, GitSource
+
+FIXTURE = Path(__file__).parent.parent / "fixtures" / "example-collection"
+
+
+class TestExecutors:
+    """Processing the roles of a collection in parallel."""
+
+    def test_resolve_executor_type(self) -> None:
+        assert resolve_executor_type("Thread") == "thread"
+        assert resolve_executor_type("process") == "process"
+        assert resolve_executor_type("auto") == (
+            "thread" if free_threaded() else "process"
+        )
+        with pytest.raises(ValueError, match="Executor must be one of"):
+            resolve_executor_type("fiber")
+        with pytest.raises(ValueError, match="at least 1"):
+            create_executor("thread", 0)
+
+    @pytest.mark.parametrize("executor_type", ["thread", "process"])
+    def test_matches_sequential_processing(self, executor_type: str) -> None:
+        expected = CollectionProcessor(FIXTURE, dry_run=True).process_collection()
+
+        with create_executor(executor_type, 2) as executor:
+            results = CollectionProcessor(
+                FIXTURE, dry_run=True, executor=executor
+            ).process_collection()
+
+        assert results == expected
+
+    @pytest.mark.parametrize("executor_type", ["thread", "process"])
+    def test_writes_files(self, temp_dir: Path, executor_type: str) -> None:
+        collection = temp_dir / "collection"
+        shutil.copytree(FIXTURE, collection)
+
+        with create_executor(executor_type, 2) as executor:
+            results = CollectionProcessor(
+                collection, executor=executor
+            ).process_collection()
+
+        assert not results.errors
+        check = CollectionProcessor(collection, dry_run=True).process_collection()
+        assert check.changed_files() == []
+
+    def test_fail_fast_stops_in_role_order(self) -> None:
+        expected = CollectionProcessor(
+            FIXTURE, dry_run=True, fail_fast=True
+        ).process_collection()
+
+        with create_executor("thread", 2) as executor:
+            results = CollectionProcessor(
+                FIXTURE, dry_run=True, fail_fast=True, executor=executor
+            ).process_collection()
+
+        assert results == expected
+
+    def test_sources_survive_pickling(self, git_repo: Path) -> None:
+        assert pickle.loads(pickle.dumps(FILE_SYSTEM)) is FILE_SYSTEM
+
+        readme = git_repo / "roles" / "first" / "README.md"
+        with GitSource("HEAD", git_repo) as source:
+            content = source.read_text(readme)
+            copy = pickle.loads(pickle.dumps(source))
+        try:
+            assert copy.read_text(readme) == content
+        finally:
+            copy.close()
+
+    def test_cli_jobs(self) -> None:
+        runner = CliRunner()
+
+        sequential = runner.invoke(app, ["generate", "--check", str(FIXTURE)])
+        for executor_type in ("thread", "process"):
+            result = runner.invoke(
+                app,
+                [
+                    "generate",
+                    "--check",
+                    "--jobs",
+                    "2",
+                    "--executor",
+                    executor_type,
+                    str(FIXTURE),
+                ],
+            )
+            assert result.exit_code == sequential.exit_code
+            assert result.stdout == sequential.stdout
+
+        result = runner.invoke(app, ["ci", "--executor", "fiber", str(FIXTURE)])
+        assert result.exit_code == 2
+        assert "Executor must be one of" in result.output
+
+    def test_cli_role_targets_are_scheduled_in_a_window(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        events: list[tuple[str, str]] = []
+
+        def submit(
+            executor: Executor, processor: Any, role_path: Path, **kwargs: Any
+        ) -> Future[Any]:
+            events.append(("submit", role_path.name))
+            return submit_role(executor, processor, role_path, **kwargs)
+
+        def report(record_type: str, path: Path, *args: Any, **kwargs: Any) -> None:
+            events.append(("report", path.name))
+            report_results(record_type, path, *args, **kwargs)
+
+        monkeypatch.setattr(cli, "PARALLEL_MAX_PENDING_ROLES", 1)
+        monkeypatch.setattr(cli, "submit_role", submit)
+        monkeypatch.setattr(cli, "_report_results", report)
+        roles = [str(FIXTURE / "roles" / name) for name in ("first", "second")]
+        result = CliRunner().invoke(
+            app,
+            ["generate", "--check", "--jobs", "2", "--executor", "thread", *roles],
+        )
+
+        assert result.exit_code == 1
+        assert events == [
+            ("submit", "first"),
+            ("report", "first"),
+            ("submit", "second"),
+            ("report", "second"),
+        ]
@@ -10,6 +10,7 @@ from ansible_docsmith import (
     MARKER_README_MAIN_START,
 )
 from ansible_docsmith.constants import TABLE_DESCRIPTION_MAX_LENGTH
+from ansible_docsmith.core import doc_generators
 from ansible_docsmith.core.defaults_comments import DefaultsCommentGenerator
 from ansible_docsmith.core.doc_generators import (
     MarkdownDocumentationGenerator,
@@ -17,8 +18,13 @@ from ansible_docsmith.core.doc_generators import (
     build_option_anchors,
     create_documentation_generator,
 )
+from ansible_docsmith.core.parser import ArgumentSpecParser
 from ansible_docsmith.core.readme_updater import ReadmeUpdater
-from ansible_docsmith.core.text import HTMLStripper
+from ansible_docsmith.core.text import (
+    MD_ATOMIC_TOKENS,
+    HTMLStripper,
+    truncate_preserving_tokens,
+)
 from ansible_docsmith.core.toc import (
     MarkdownTocGenerator,
     RSTTocGenerator,
@@ -123,6 +129,37 @@ class TestDocumentationGenerator:
 
         assert "no variables are defined for this role" in result.lower()
 
+    def test_nested_option_names_with_dots(self, sample_role_path: Path) -> None:
+        """Nested option names containing dots are not split into levels."""
+        parser = ArgumentSpecParser()
+        specs = parser._normalize_specs(
+            {
+                "main": {
+                    "options": {
+                        "cfg": {
+                            "type": "dict",
+                            "description": "Config",
+                            "options": {
+                                "net.ipv4": {"type": "str", "description": "IP"}
+                            },
+                        }
+                    }
+                }
+            }
+        )
+
+        result = MarkdownDocumentationGenerator().generate_role_documentation(
+            specs, "test-role", sample_role_path
+        )
+        assert "#### `cfg['net.ipv4']`" in result
+        assert "cfg['net']" not in result
+
+        result = RSTDocumentationGenerator().generate_role_documentation(
+            specs, "test-role", sample_role_path
+        )
+        assert "``cfg['net.ipv4']``" in result
+        assert "cfg['net']" not in result
+
     def test_ansible_escape_filter(self) -> None:
         """Test Ansible variable escaping."""
         generator = MarkdownDocumentationGenerator()
@@ -306,6 +343,11 @@ class TestHTMLStripper:
         result = HTMLStripper.strip_tags("<p></p><div></div>")
         assert result == ""
 
+    def test_strip_tags_fast_path_returns_input(self) -> None:
+        """Text without tags or entities is returned as is (no parsing)."""
+        text = "Plain text, no markup at all."
+        assert HTMLStripper.strip_tags(text) is text
+
     def test_malformed_html_fallback(self) -> None:
         """Test fallback behavior with malformed HTML."""
         # This should still work (HTMLParser is quite robust)
@@ -704,6 +746,86 @@ Third paragraph here."""
         assert " […]" not in result_no_limit
         assert result_no_limit == long_text
 
+    def test_truncation_keeps_whole_tokens_within_limit(self) -> None:
+        """Truncation fits as many whole tokens as possible, linearly."""
+        text = "aa [link](x) `co de` bb " * 2000
+
+        result = truncate_preserving_tokens(text, 30, MD_ATOMIC_TOKENS)
+        assert result == "aa [link](x) `co de` bb aa"
+
+        # A single oversized token falls back to a hard cut
+        assert truncate_preserving_tokens("x" * 50, 10, MD_ATOMIC_TOKENS) == "x" * 10
+
+
+class TestFilterMemo:
+    """Per-render memoization of the Jinja filters."""
+
+    def test_repeated_calls_are_computed_once(self) -> None:
+        generator = MarkdownDocumentationGenerator()
+        calls: list[Any] = []
+
+        def counting(value: Any, table: bool = False) -> str:
+            calls.append(value)
+            return f"<{value}>"
+
+        memoized = generator._memoized_filter("counting", counting)
+        default = {"key": "value"}  # unhashable values are keyed by identity
+        token = doc_generators._RENDER_CONTEXT.set(doc_generators.RenderContext())
+        try:
+            assert memoized(default) == memoized(default) == "<{'key': 'value'}>"
+            assert len(calls) == 1
+
+            # Different arguments and equal-but-distinct values are separate
+            memoized(default, True)
+            memoized({"key": "value"})
+            assert len(calls) == 3
+
+            # Unhashable arguments bypass the memo
+            memoized(default, table=[1])
+            memoized(default, table=[1])
+            assert len(calls) == 5
+        finally:
+            doc_generators._RENDER_CONTEXT.reset(token)
+
+        # Outside of a render, nothing is memoized
+        memoized(default)
+        memoized(default)
+        assert len(calls) == 7
+
+    def test_memo_is_cleared_after_render(
+        self, sample_role_with_specs: Path, monkeypatch: Any
+    ) -> None:
+        from ansible_docsmith.core.parser import ArgumentSpecParser
+
+        calls: list[str] = []
+        original = doc_generators.normalize_description
+
+        def counting(description: Any) -> str:
+            calls.append(description)
+            return original(description)
+
+        monkeypatch.setattr(doc_generators, "normalize_description", counting)
+
+        generator = MarkdownDocumentationGenerator()
+        specs = ArgumentSpecParser().parse_file(
+            sample_role_with_specs / "meta" / "argument_specs.yml"
+        )
+        generator.generate_role_documentation(
+            specs, "test-role", sample_role_with_specs
+        )
+        # The render context ends with the render
+        assert doc_generators._RENDER_CONTEXT.get() is None
+
+        # Each description is formatted once per filter, although the
+        # template shows it in both the table and the detailed section
+        first_render = len(calls)
+        generator.generate_role_documentation(
+            specs, "test-role", sample_role_with_specs
+        )
+        assert len(calls) == 2 * first_render
+        description = specs["main"]["options"]["acmesh_state"]["description"]
+        assert sum(call is description for call in calls) == 4
+
 
 class TestDefaultsCommentGenerator:
     """Test the DefaultsCommentGenerator class."""
@@ -941,6 +1063,38 @@ class TestDefaultsCommentGenerator:
         assert "hanging indents." in comment_lines[bullet_index + 1]
         assert all(len(line) <= 80 for line in comment_lines)
 
+    def test_shared_suboptions_are_formatted_once(
+        self, sample_role_path: Path, monkeypatch: Any
+    ) -> None:
+        """Subtrees shared via YAML aliases are formatted once per run."""
+        generator = DefaultsCommentGenerator()
+        calls: list[str] = []
+        original = generator._format_suboption
+
+        def counting(entry: Any) -> list[str]:
+            calls.append(entry.path)
+            return original(entry)
+
+        monkeypatch.setattr(generator, "_format_suboption", counting)
+
+        shared = {"port": {"type": "int", "description": "Port."}}
+        specs = {
+            "main": {
+                "options": {
+                    name: {"description": name, "type": "dict", "options": shared}
+                    for name in ("first", "second")
+                }
+            }
+        }
+        defaults_path = sample_role_path / "defaults" / "main.yml"
+        defaults_path.write_text("---\nfirst: {}\nsecond: {}\n")
+
+        result = generator.add_comments(defaults_path, specs)
+
+        assert result is not None
+        assert result.count("#   - port: Port.") == 2
+        assert calls == ["first.port"]
+
     def test_format_block_comment_formats_compound_default_as_yaml(self) -> None:
         """Test issue #17 list-of-dicts defaults render as wrapped YAML comments."""
         generator = DefaultsCommentGenerator()
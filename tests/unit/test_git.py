@@ -0,0 +1,95 @@
+"""Tests for git change detection (core/git.py) and --since."""
+
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from ansible_docsmith.cli import app
+from ansible_docsmith.core.exceptions import GitError
+from ansible_docsmith.core.git import changed_files, docsmith_pin_changed
+
+
+class TestChangedFiles:
+    """Files changed since a ref, as reported by git."""
+
+    def test_changed_files(self, git_repo: Path, git: Callable[..., None]) -> None:
+        assert changed_files(git_repo, "HEAD") == []
+
+        defaults = git_repo / "roles" / "second" / "defaults" / "main.yml"
+        defaults.write_text(defaults.read_text() + "# changed\n")
+        (git_repo / "roles" / "first" / "new.txt").write_text("untracked\n")
+        git(git_repo, "mv", "galaxy.yml", "galaxy.yaml")
+
+        assert changed_files(git_repo / "roles", "HEAD") == [
+            git_repo / "galaxy.yaml",
+            git_repo / "galaxy.yml",
+            git_repo / "roles" / "first" / "new.txt",
+            defaults,
+        ]
+
+    def test_unknown_ref(self, git_repo: Path) -> None:
+        with pytest.raises(GitError, match="Unknown git ref 'nope'"):
+            changed_files(git_repo, "nope")
+
+    def test_docsmith_pin_changed(
+        self, git_repo: Path, git: Callable[..., None]
+    ) -> None:
+        requirements = git_repo / "requirements.txt"
+        requirements.write_text("ansible-docsmith==2.0.0\nrich>=13\n")
+        # Context lines of the hunk mention DocSmith, too
+        assert docsmith_pin_changed(git_repo, "HEAD", [requirements])
+
+        requirements.write_text("ansible-docsmith==2.1.0\nrich\n" + "x\n" * 10)
+        git(git_repo, "commit", "--quiet", "-am", "Bump")
+        requirements.write_text("ansible-docsmith==2.1.0\nrich\n" + "x\n" * 10 + "y\n")
+        assert not docsmith_pin_changed(git_repo, "HEAD", [requirements])
+        assert not docsmith_pin_changed(git_repo, "HEAD", [git_repo / "README.md"])
+
+
+class TestSince:
+    """--since limits processing to roles changed since a ref."""
+
+    def test_processes_changed_roles_only(self, git_repo: Path) -> None:
+        runner = CliRunner()
+
+        result = runner.invoke(
+            app, ["generate", "--check", str(git_repo), "--since", "HEAD"]
+        )
+        assert result.exit_code == 0
+        assert "No roles or collections affected" in result.stdout
+
+        defaults = git_repo / "roles" / "second" / "defaults" / "main.yml"
+        defaults.write_text(defaults.read_text() + "# changed\n")
+        result = runner.invoke(
+            app, ["generate", "--check", str(git_repo), "--since", "HEAD"]
+        )
+        assert result.exit_code == 1
+        assert "second/README.md" in result.stdout
+        assert "first/README.md" not in result.stdout
+
+    def test_template_change_processes_all_roles(self, git_repo: Path) -> None:
+        template = git_repo / "template.md.j2"
+        template.write_text("# {{ role_name }}\n")
+        runner = CliRunner()
+
+        result = runner.invoke(
+            app,
+            [
+                "generate",
+                "--check",
+                str(git_repo),
+                "--since",
+                "HEAD",
+                "--template-readme",
+                str(template),
+            ],
+        )
+        assert "README template changed" in result.stdout
+        assert "first/README.md" in result.stdout
+
+    def test_unknown_ref(self, git_repo: Path) -> None:
+        result = CliRunner().invoke(app, ["validate", str(git_repo), "--since", "nope"])
+        assert result.exit_code == 2
+        assert "Unknown git ref" in result.output
@@ -2,9 +2,11 @@
 
 import pytest
 
+from ansible_docsmith.core import doc_generators
 from ansible_docsmith.core.defaults_comments import DefaultsCommentGenerator
 from ansible_docsmith.core.doc_generators import (
     MarkdownDocumentationGenerator,
+    RenderContext,
     RSTDocumentationGenerator,
 )
 from ansible_docsmith.core.markup import convert_ansible_markup, lint_ansible_markup
@@ -178,9 +180,15 @@ class TestMarkupInGeneratorFilters:
 
     def test_format_description_filter_markdown(self) -> None:
         generator = MarkdownDocumentationGenerator()
-        generator._role_options = {"foo_port": "variable-foo_port"}
-
-        result = generator._format_description_filter(["Set O(foo_port) to C(8080)."])
+        token = doc_generators._RENDER_CONTEXT.set(
+            RenderContext(role_options={"foo_port": "variable-foo_port"})
+        )
+        try:
+            result = generator._format_description_filter(
+                ["Set O(foo_port) to C(8080)."]
+            )
+        finally:
+            doc_generators._RENDER_CONTEXT.reset(token)
         assert result == "Set [`foo_port`](#variable-foo_port) to `8080`."
 
     def test_format_description_filter_rst(self) -> None:
@@ -0,0 +1,68 @@
+"""Tests for the in-memory rendering API (core/memory.py)."""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from ansible_docsmith import render_role
+from ansible_docsmith.core.processor import RoleProcessor
+
+ROLE = Path(__file__).parent.parent / "fixtures" / "example-collection" / "roles"
+
+
+def _role_files(name: str) -> tuple[str, dict[str, str], str]:
+    role = ROLE / name
+    return (
+        (role / "meta" / "argument_specs.yml").read_text(),
+        {"main.yml": (role / "defaults" / "main.yml").read_text()},
+        (role / "README.md").read_text(),
+    )
+
+
+class TestRenderRole:
+    """Rendering roles given as file contents."""
+
+    def test_matches_file_processing(self) -> None:
+        specs, defaults, readme = _role_files("first")
+
+        rendered = render_role(specs, defaults, readme, role_name="first")
+
+        results = RoleProcessor(dry_run=True).process_role(ROLE / "first")
+        expected = {path.name: new for path, _old, new in results.file_diffs}
+        assert rendered.readme == expected["README.md"]
+        assert rendered.defaults == {"main.yml": expected["main.yml"]}
+        assert not rendered.errors
+        assert any("TOC markers" in notice for notice in rendered.notices)
+
+    def test_new_readme_and_partial_render(self) -> None:
+        specs, defaults, _readme = _role_files("second")
+
+        rendered = render_role(specs, defaults, role_name="second", format_type="rst")
+        assert rendered.readme is not None
+        assert ".. ANSIBLE DOCSMITH MAIN START" in rendered.readme
+        assert "second_port" in rendered.readme
+
+        rendered = render_role(specs, defaults, generate_readme=False)
+        assert rendered.readme is None
+        assert "# - Type: int" in rendered.defaults["main.yml"]
+
+    def test_reports_errors(self) -> None:
+        rendered = render_role("argument_specs: [", {"main.yml": "---\n"})
+        assert rendered.readme is None
+        assert rendered.defaults == {"main.yml": "---\n"}
+        assert "YAML parsing error" in rendered.errors[0]
+
+        with pytest.raises(ValueError, match="Format must be"):
+            render_role("", format_type="auto")
+        with pytest.raises(ValueError, match="Invalid role name"):
+            render_role("", role_name="../etc")
+
+    def test_thread_safe(self) -> None:
+        roles = [_role_files(name) for name in ("first", "second")] * 8
+        expected = [render_role(*files) for files in roles]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            rendered = list(executor.map(lambda files: render_role(*files), roles))
+
+        assert rendered == expected
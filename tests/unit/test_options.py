@@ -0,0 +1,139 @@
+"""Tests for the flattened option index (core/options.py)."""
+
+from pathlib import Path
+
+from ansible_docsmith.core.doc_generators import build_option_anchors
+from ansible_docsmith.core.markup import convert_ansible_markup
+from ansible_docsmith.core.options import (
+    build_option_index,
+    group_nested_options,
+)
+from ansible_docsmith.core.parser import ArgumentSpecParser
+
+NESTED_OPTIONS = {
+    "tls": {
+        "type": "dict",
+        "options": {
+            "cert": {"type": "dict", "options": {"path": {"type": "str"}}},
+            "key": {"type": "str"},
+        },
+    },
+    "port": {"type": "int"},
+}
+
+
+class TestBuildOptionIndex:
+    """Flattening of (nested) option trees."""
+
+    def test_paths_in_pre_order(self) -> None:
+        index = build_option_index(NESTED_OPTIONS)
+        assert [entry.path for entry in index.values()] == [
+            "tls",
+            "tls.cert",
+            "tls.cert.path",
+            "tls.key",
+            "port",
+        ]
+
+    def test_entry_metadata(self) -> None:
+        index = build_option_index(NESTED_OPTIONS)
+
+        top = index[("tls",)]
+        assert (top.name, top.depth, top.anchor, top.parent) == ("tls", 0, "tls", None)
+
+        leaf = index[("tls", "cert", "path")]
+        assert leaf.name == "path"
+        assert leaf.path == "tls.cert.path"
+        assert leaf.depth == 2
+        assert leaf.anchor == "tls-sub-cert-sub-path"
+        assert leaf.parent == ("tls", "cert")
+        assert leaf.spec is NESTED_OPTIONS["tls"]["options"]["cert"]["options"]["path"]
+
+    def test_subtree_depth_offset(self) -> None:
+        index = build_option_index(NESTED_OPTIONS["tls"]["options"], depth=1)
+        assert [entry.depth for entry in index.values()] == [1, 2, 1]
+
+    def test_malformed_specs_are_skipped(self) -> None:
+        index = build_option_index(
+            {"broken": "not a dict", "ok": {"options": ["not", "a", "dict"]}}
+        )
+        assert list(index) == [("ok",)]
+        assert build_option_index(None) == {}
+
+    def test_dotted_option_names(self) -> None:
+        index = build_option_index(
+            {
+                "cfg": {
+                    "options": {
+                        "net.ipv4": {"type": "str"},
+                        "net": {"options": {"ipv4": {"type": "int"}}},
+                    }
+                }
+            }
+        )
+        # Same dotted path, but distinct options
+        assert list(index) == [
+            ("cfg",),
+            ("cfg", "net.ipv4"),
+            ("cfg", "net"),
+            ("cfg", "net", "ipv4"),
+        ]
+        assert index[("cfg", "net.ipv4")].spec["type"] == "str"
+        assert index[("cfg", "net", "ipv4")].spec["type"] == "int"
+
+    def test_group_nested_options(self) -> None:
+        groups = group_nested_options(build_option_index(NESTED_OPTIONS))
+        assert {
+            name: [e.path for e in entries] for name, entries in groups.items()
+        } == {
+            "tls": ["tls.cert", "tls.cert.path", "tls.key"],
+            "port": [],
+        }
+
+    def test_indexes_are_kept_out_of_specs(self, sample_role_path: Path) -> None:
+        spec_file = sample_role_path / "meta" / "argument_specs.yml"
+        spec_file.write_text(
+            "---\nargument_specs:\n  main:\n    options:\n      outer:\n"
+            "        type: dict\n        options:\n          inner:\n"
+            "            type: str\n"
+        )
+        role_data = ArgumentSpecParser().validate_structure(sample_role_path)
+        specs = role_data["specs"]
+
+        assert set(specs["main"]) == {
+            "short_description",
+            "description",
+            "author",
+            "version_added",
+            "options",
+        }
+        index = role_data["option_indexes"]["main"]
+        assert list(index) == [("outer",), ("outer", "inner")]
+        assert (
+            index[("outer", "inner")].spec
+            is specs["main"]["options"]["outer"]["options"]["inner"]
+        )
+
+
+class TestNestedOptionAnchors:
+    """O(parent.child) references resolve through the index."""
+
+    def test_nested_paths_get_anchors(self) -> None:
+        anchors = build_option_anchors({"main": {"options": NESTED_OPTIONS}})
+        assert anchors["tls.cert.path"] == "variable-tls-sub-cert-sub-path"
+        assert anchors["port"] == "variable-port"
+
+    def test_options_below_readme_depth_are_not_anchored(self) -> None:
+        deep: dict[str, dict[str, object]] = {"l4": {}}
+        for name in ("l3", "l2", "l1", "l0"):
+            deep = {name: {"options": deep}}
+        anchors = build_option_anchors({"main": {"options": deep}})
+        assert "l0.l1.l2.l3" in anchors
+        assert "l0.l1.l2.l3.l4" not in anchors
+
+    def test_nested_references_are_linked(self) -> None:
+        anchors = build_option_anchors({"main": {"options": NESTED_OPTIONS}})
+        result = convert_ansible_markup(
+            "See O(tls.cert) and O(tls.nope).", "markdown", anchors
+        )
+        assert result == "See [`tls.cert`](#variable-tls-sub-cert) and `tls.nope`."
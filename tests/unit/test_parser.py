@@ -1,11 +1,14 @@
 """Tests for ArgumentSpecParser."""
 
+import sys
 from pathlib import Path
+from typing import Any
 
 import pytest
 
 from ansible_docsmith.core.exceptions import ParseError, ValidationError
-from ansible_docsmith.core.parser import ArgumentSpecParser
+from ansible_docsmith.core.options import build_option_index
+from ansible_docsmith.core.parser import ArgumentSpecParser, SpecLimits
 
 
 class TestArgumentSpecParser:
@@ -221,3 +224,117 @@ argument_specs:
         assert "- item 2" in description.lower()
         # Should contain newlines
         assert "\n" in description
+
+
+def _nested_spec(depth: int) -> str:
+    """Return an argument spec with one option nested depth levels deep."""
+    lines = ["---", "argument_specs:", "  main:", "    options:"]
+    indent = "      "
+    for level in range(depth + 1):
+        lines.append(f"{indent}opt{level}:")
+        lines.append(f"{indent}  type: dict")
+        if level < depth:
+            lines.append(f"{indent}  options:")
+        indent += "    "
+    return "\n".join(lines) + "\n"
+
+
+class TestSpecLimits:
+    """Test the limits protecting against deep, huge or cyclic specs."""
+
+    def test_deep_nesting_does_not_recurse(self) -> None:
+        """Test that nesting deeper than the recursion limit is normalized."""
+        depth = sys.getrecursionlimit() + 100
+        options: dict[str, Any] = {}
+        for level in reversed(range(depth + 1)):
+            options = {f"opt{level}": {"type": "dict", "options": options}}
+
+        parser = ArgumentSpecParser(SpecLimits(max_depth=depth))
+        normalized = parser._normalize_options(options)
+
+        index = build_option_index(normalized)
+        assert len(index) == depth + 1
+        assert list(index.values())[-1].depth == depth
+
+    def test_max_depth(self, sample_role_path: Path) -> None:
+        """Test that exceeding the depth limit fails with the option path."""
+        spec_file = sample_role_path / "meta" / "argument_specs.yml"
+        spec_file.write_text(_nested_spec(3))
+
+        assert ArgumentSpecParser(SpecLimits(max_depth=3)).parse_file(spec_file)
+        with pytest.raises(
+            ParseError, match=r"nested too deeply at 'opt0\.opt1\.opt2'"
+        ):
+            ArgumentSpecParser(SpecLimits(max_depth=2)).parse_file(spec_file)
+
+    def test_max_options_counts_aliases(self, sample_role_path: Path) -> None:
+        """Test that aliased subtrees count once per use (alias bombs)."""
+        spec_file = sample_role_path / "meta" / "argument_specs.yml"
+        spec_file.write_text(
+            "---\nargument_specs:\n  main:\n    options:\n"
+            "      a: &a\n        options:\n          x: {}\n          y: {}\n"
+            "      b: {options: {p: *a, q: *a, r: *a}}\n"
+        )
+
+        # a, x, y, b, p, q, r + 2 nested options per alias = 13
+        assert ArgumentSpecParser(SpecLimits(max_options=13)).parse_file(spec_file)
+        with pytest.raises(ParseError, match="Too many options"):
+            ArgumentSpecParser(SpecLimits(max_options=12)).parse_file(spec_file)
+
+    def test_aliased_subtrees_are_shared(self, sample_role_path: Path) -> None:
+        """Test that subtrees reached via YAML aliases are normalized once."""
+        spec_file = sample_role_path / "meta" / "argument_specs.yml"
+        spec_file.write_text(
+            "---\nargument_specs:\n  main:\n    options:\n"
+            "      a: {options: &tls {cert: {type: path}}}\n"
+            "      b: {options: *tls}\n"
+        )
+        specs = ArgumentSpecParser().parse_file(spec_file)
+
+        options = specs["main"]["options"]
+        assert options["a"]["options"] is options["b"]["options"]
+        assert options["a"]["options"]["cert"]["type"] == "path"
+        # Documented (and indexed) once per use
+        assert [entry.path for entry in build_option_index(options).values()] == [
+            "a",
+            "a.cert",
+            "b",
+            "b.cert",
+        ]
+
+    def test_max_file_size(self, sample_role_path: Path) -> None:
+        """Test that oversized files are rejected before loading them."""
+        spec_file = sample_role_path / "meta" / "argument_specs.yml"
+        spec_file.write_text(_nested_spec(1))
+
+        with pytest.raises(ParseError, match="File too large"):
+            ArgumentSpecParser(SpecLimits(max_file_size=10)).parse_file(spec_file)
+
+    @pytest.mark.parametrize(
+        "options",
+        [
+            "    options: &o\n      a:\n        options: *o\n",
+            "    options:\n      a: &a\n        options:\n          b: *a\n",
+        ],
+    )
+    def test_recursive_aliases(self, sample_role_path: Path, options: str) -> None:
+        """Test that recursive YAML aliases are reported as such."""
+        spec_file = sample_role_path / "meta" / "argument_specs.yml"
+        spec_file.write_text(f"---\nargument_specs:\n  main:\n{options}")
+
+        with pytest.raises(ParseError, match="found recursive alias") as info:
+            ArgumentSpecParser().parse_file(spec_file)
+        assert "must be a dictionary" not in str(info.value)
+
+    def test_cyclic_options(self) -> None:
+        """Test that option dicts containing themselves are rejected."""
+        options: dict[str, dict[str, object]] = {"a": {"type": "dict"}}
+        options["a"]["options"] = {"b": {"type": "dict", "options": options}}
+
+        with pytest.raises(
+            ParseError, match=r"Options of parameter 'a\.b' contain themselves"
+        ):
+            ArgumentSpecParser()._normalize_options(options)
+
+        # The index builder never raises, but stops at the cycle
+        assert list(build_option_index(options)) == [("a",), ("a", "b")]
@@ -1,5 +1,6 @@
 """Tests for RoleProcessor."""
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -17,10 +18,46 @@ from ansible_docsmith import (
 )
 from ansible_docsmith.core.exceptions import ValidationError
 from ansible_docsmith.core.processor import (
+    ComponentCache,
     ProcessingResults,
     RoleProcessor,
     detect_format_from_role,
 )
+from ansible_docsmith.core.validators import SpecCheckReport, run_spec_checks
+
+
+def _run_check(
+    processor: RoleProcessor,
+    name: str,
+    role_path: Path,
+    original_specs: dict[str, Any],
+    specs: dict[str, Any] | None = None,
+) -> SpecCheckReport:
+    """Run a single argument spec check the way validate_role() does."""
+    context = processor._spec_check_context(role_path, specs or {}, original_specs)
+    return run_spec_checks(context, only=[name])
+
+
+def _check_defaults(
+    processor: RoleProcessor, role_path: Path, role_data: dict[str, Any]
+) -> tuple[list[str], list[str], list[str]]:
+    """Run the defaults consistency check on a validated role structure."""
+    report = _run_check(
+        processor,
+        "defaults",
+        role_path,
+        role_data["original_specs"],
+        role_data["specs"],
+    )
+    return report.errors, report.warnings, report.notices
+
+
+def _check_spec_file(
+    processor: RoleProcessor, name: str, spec_file: Path
+) -> SpecCheckReport:
+    """Run a single argument spec check on the raw specs of a spec file."""
+    _specs, original_specs = processor.parser.parse_file_with_original(spec_file)
+    return _run_check(processor, name, spec_file.parent.parent, original_specs)
 
 
 class TestRoleProcessor:
@@ -64,6 +101,130 @@ class TestRoleProcessor:
         readme_ops = [op for op in result.operations if "README" in str(op[0])]
         assert len(readme_ops) == 1
 
+    def test_process_role_fail_fast_skips_defaults(
+        self, sample_role_with_specs_and_defaults: Path
+    ) -> None:
+        """A stale README decides a dry run; defaults are not processed."""
+        processor = RoleProcessor(dry_run=True, fail_fast=True)
+
+        result = processor.process_role(sample_role_with_specs_and_defaults)
+
+        assert [op[0].name for op in result.operations] == ["README.md"]
+        assert processor.outcome_known(result)
+
+    def test_processors_share_components(self) -> None:
+        """Processors of one run reuse the parser and generators."""
+        components = ComponentCache()
+        first = RoleProcessor(format_type="markdown", components=components)
+        second = RoleProcessor(format_type="markdown", components=components)
+        rst = RoleProcessor(format_type="rst", components=components)
+
+        assert first.parser is second.parser is rst.parser
+        assert first.doc_generator is second.doc_generator
+        assert first.readme_updater is second.readme_updater
+        assert first.defaults_generator is second.defaults_generator
+        assert rst.doc_generator is not first.doc_generator
+        assert RoleProcessor().parser is not first.parser
+
+    def test_shared_updater_detects_bullet_style_per_readme(
+        self, temp_dir: Path
+    ) -> None:
+        """A TOC bullet style detected in one README does not leak into others."""
+        import re
+        import shutil
+
+        fixture = Path(__file__).parent.parent / "fixtures" / "example-role-simple-toc"
+        roles = {}
+        for name, bullet in (("stars", "*"), ("dashes", "-")):
+            role = roles[name] = temp_dir / name
+            shutil.copytree(fixture, role)
+            readme = role / "README.md"
+            readme.write_text(
+                re.sub(
+                    r"^[*-] ",
+                    f"{bullet} ",
+                    readme.read_text(encoding="utf-8"),
+                    flags=re.MULTILINE,
+                ),
+                encoding="utf-8",
+            )
+
+        def readme_content(role: Path, components: ComponentCache) -> str | None:
+            return (
+                RoleProcessor(dry_run=True, role_path=role, components=components)
+                .process_role(role)
+                .readme_content
+            )
+
+        components = ComponentCache()
+        assert "\n* [" in (readme_content(roles["stars"], components) or "")
+        content = readme_content(roles["dashes"], components) or ""
+        assert content == readme_content(roles["dashes"], ComponentCache())
+        assert "\n- [" in content
+        assert "\n* [" not in content
+
+    def test_shared_processor_is_reentrant(self, temp_dir: Path) -> None:
+        """One processor serves roles of any format, also concurrently."""
+        roles = []
+        for index, (readme_name, bullet) in enumerate(
+            [("README.md", "*"), ("README.md", "-"), ("README.rst", "-")] * 4
+        ):
+            role = temp_dir / f"role{index}"
+            (role / "meta").mkdir(parents=True)
+            (role / "meta" / "argument_specs.yml").write_text(
+                "---\nargument_specs:\n  main:\n    short_description: Test\n"
+                "    options:\n      port:\n        type: int\n"
+                "        description: Port with O(port).\n"
+            )
+            if readme_name == "README.md":
+                markers = (
+                    f"{bullet} [Home](https://example.com)\n\n"
+                    f"<!-- {MARKER_README_TOC_START} -->\n"
+                    f"<!-- {MARKER_README_TOC_END} -->\n"
+                    f"<!-- {MARKER_README_MAIN_START} -->\n"
+                    f"<!-- {MARKER_README_MAIN_END} -->\n"
+                )
+            else:
+                markers = (
+                    f".. {MARKER_README_MAIN_START}\n\n.. {MARKER_README_MAIN_END}\n"
+                )
+            (role / readme_name).write_text(f"# role{index}\n\n{markers}")
+            roles.append(role)
+
+        def new_readme(processor: RoleProcessor, role: Path) -> str:
+            results = processor.process_role(role, update_defaults=False)
+            assert not results.errors
+            return results.file_diffs[0][2]
+
+        # Fresh processors (and components) per role as the reference
+        expected = [new_readme(RoleProcessor(dry_run=True), role) for role in roles]
+        assert "* [`port`]" in expected[0]
+        assert "- [`port`]" in expected[1]
+
+        shared = RoleProcessor(dry_run=True)
+        assert [new_readme(shared, role) for role in roles] == expected
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            readmes = list(executor.map(lambda role: new_readme(shared, role), roles))
+        assert readmes == expected
+
+    def test_merge_prefixes_messages(self, temp_dir: Path) -> None:
+        """merge() combines results, prefixing errors and warnings."""
+        combined = ProcessingResults(
+            operations=[], errors=["first"], warnings=[], file_diffs=[]
+        )
+        other = ProcessingResults(
+            operations=[(temp_dir / "README.md", "updated")],
+            errors=["boom"],
+            warnings=["careful"],
+            file_diffs=[],
+        )
+
+        combined.merge(other, prefix="role: ")
+
+        assert combined.errors == ["first", "role: boom"]
+        assert combined.warnings == ["role: careful"]
+        assert combined.operations == [(temp_dir / "README.md", "updated")]
+
     def test_process_role_defaults_only(
         self, sample_role_with_specs_and_defaults: Path
     ) -> None:
@@ -218,11 +379,7 @@ class TestRoleProcessor:
         role_data = processor.parser.validate_structure(fixture_path)
 
         # Test the consistency validation
-        errors, warnings, notices = processor._validate_defaults_consistency(
-            fixture_path,
-            role_data["specs"],
-            processor._parse_original_specs(role_data["spec_file"]),
-        )
+        errors, warnings, notices = _check_defaults(processor, fixture_path, role_data)
 
         # Should have no errors for this fixture
         consistency_errors = [
@@ -249,11 +406,7 @@ class TestRoleProcessor:
         role_data = processor.parser.validate_structure(fixture_path)
 
         # Test the consistency validation
-        errors, warnings, notices = processor._validate_defaults_consistency(
-            fixture_path,
-            role_data["specs"],
-            processor._parse_original_specs(role_data["spec_file"]),
-        )
+        errors, warnings, notices = _check_defaults(processor, fixture_path, role_data)
 
         # Should have no errors now (fixed the mismatch fixture)
         assert len(errors) == 0
@@ -356,11 +509,7 @@ test_number: 99
 
         # Run validation
         role_data = processor.parser.validate_structure(temp_dir)
-        errors, warnings, notices = processor._validate_defaults_consistency(
-            temp_dir,
-            role_data["specs"],
-            processor._parse_original_specs(role_data["spec_file"]),
-        )
+        errors, warnings, notices = _check_defaults(processor, temp_dir, role_data)
 
         # Should have no errors but three mismatch warnings
         assert len(errors) == 0
@@ -423,9 +572,7 @@ argument_specs:
 """)
 
         # Test the mutually exclusive validation directly
-        errors = processor._validate_mutually_exclusive_keys(
-            processor._parse_original_specs(spec_file)
-        )
+        errors = _check_spec_file(processor, "exclusive-keys", spec_file).errors
 
         # Should have exactly 2 errors (one for each conflicting variable)
         assert len(errors) == 2
@@ -471,9 +618,7 @@ argument_specs:
         invalid_option_key: "bad"  # This should also trigger a warning
 """)
 
-        warnings = processor._validate_unknown_keys(
-            processor._parse_original_specs(spec_file)
-        )
+        warnings = _check_spec_file(processor, "unknown-keys", spec_file).warnings
 
         assert len(warnings) == 2
         assert any("unknown_key" in w for w in warnings)
@@ -517,9 +662,7 @@ argument_specs:
             mutually_exclusive: []
 """)
 
-        warnings = processor._validate_unknown_keys(
-            processor._parse_original_specs(spec_file)
-        )
+        warnings = _check_spec_file(processor, "unknown-keys", spec_file).warnings
 
         assert warnings == []
 
@@ -588,9 +731,7 @@ argument_specs:
             description: "Unclosed C(construct here."
 """)
 
-        warnings = processor._validate_markup(
-            processor._parse_original_specs(spec_file)
-        )
+        warnings = _check_spec_file(processor, "markup", spec_file).warnings
 
         assert len(warnings) == 2
         joined = "\n".join(warnings)
@@ -614,9 +755,7 @@ argument_specs:
         description: "No markup at all."
 """)
 
-        warnings = processor._validate_markup(
-            processor._parse_original_specs(spec_file)
-        )
+        warnings = _check_spec_file(processor, "markup", spec_file).warnings
 
         assert warnings == []
 
@@ -640,16 +779,14 @@ argument_specs:
             tpyo_key: "oops"
 """)
 
-        warnings = processor._validate_unknown_keys(
-            processor._parse_original_specs(spec_file)
-        )
+        warnings = _check_spec_file(processor, "unknown-keys", spec_file).warnings
 
         assert len(warnings) == 1
         assert "test_dict.inner" in warnings[0]
         assert "tpyo_key" in warnings[0]
 
-    def test_extract_variables_from_defaults(self, temp_dir: Path) -> None:
-        """Test extracting variable names from defaults files."""
+    def test_extract_defaults_values_from_file(self, temp_dir: Path) -> None:
+        """Test extracting variables and their values from defaults files."""
         processor = RoleProcessor()
 
         # Create test defaults file
@@ -661,11 +798,12 @@ var3:
   nested: true
 """)
 
-        result = processor._extract_variables_from_defaults(defaults_file)
+        result = processor._extract_defaults_values_from_file(defaults_file)
 
-        assert result == {"var1", "var2", "var3"}
+        assert set(result) == {"var1", "var2", "var3"}
+        assert result["var2"] == 123
 
-    def test_extract_variables_from_defaults_empty_file(self, temp_dir: Path) -> None:
+    def test_extract_defaults_values_from_empty_file(self, temp_dir: Path) -> None:
         """Test extracting variables from empty defaults file."""
         processor = RoleProcessor()
 
@@ -673,11 +811,11 @@ var3:
         defaults_file = temp_dir / "empty.yml"
         defaults_file.write_text("---\n")
 
-        result = processor._extract_variables_from_defaults(defaults_file)
+        result = processor._extract_defaults_values_from_file(defaults_file)
 
-        assert result == set()
+        assert result == {}
 
-    def test_extract_variables_from_defaults_invalid_file(self, temp_dir: Path) -> None:
+    def test_extract_defaults_values_from_invalid_file(self, temp_dir: Path) -> None:
         """Test extracting variables from invalid YAML file."""
         processor = RoleProcessor()
 
@@ -685,9 +823,9 @@ var3:
         defaults_file = temp_dir / "invalid.yml"
         defaults_file.write_text("invalid: yaml: content: [")
 
-        result = processor._extract_variables_from_defaults(defaults_file)
+        result = processor._extract_defaults_values_from_file(defaults_file)
 
-        assert result == set()
+        assert result == {}
 
     def test_validate_role_with_value_mismatch_warnings(self) -> None:
         """Test that validate_role succeeds but reports value mismatch warnings."""
@@ -758,11 +896,9 @@ var3:
 
         # This fixture has validation errors, so we expect an exception
         # But we can check that the unknown key warning would be included
-        warnings = processor._validate_unknown_keys(
-            processor._parse_original_specs(
-                fixture_path / "meta" / "argument_specs.yml"
-            )
-        )
+        warnings = _check_spec_file(
+            processor, "unknown-keys", fixture_path / "meta" / "argument_specs.yml"
+        ).warnings
 
         assert len(warnings) == 1
         warning_messages = "\n".join(warnings)
@@ -1297,11 +1433,7 @@ optional_with_default: "default_value"
         role_data = processor.parser.validate_structure(role_path)
 
         # Test the consistency validation
-        errors, warnings, notices = processor._validate_defaults_consistency(
-            role_path,
-            role_data["specs"],
-            processor._parse_original_specs(role_data["spec_file"]),
-        )
+        errors, warnings, notices = _check_defaults(processor, role_path, role_data)
 
         # Should have no errors
         assert len(errors) == 0
@@ -1359,11 +1491,7 @@ optional_with_default: "default_value"
         role_data = processor.parser.validate_structure(role_path)
 
         # Test the consistency validation
-        errors, warnings, notices = processor._validate_defaults_consistency(
-            role_path,
-            role_data["specs"],
-            processor._parse_original_specs(role_data["spec_file"]),
-        )
+        errors, warnings, notices = _check_defaults(processor, role_path, role_data)
 
         # Should have no errors
         assert len(errors) == 0
@@ -1424,11 +1552,7 @@ optional_with_default: "default_value"
         role_data = processor.parser.validate_structure(role_path)
 
         # Test the consistency validation
-        errors, warnings, notices = processor._validate_defaults_consistency(
-            role_path,
-            role_data["specs"],
-            processor._parse_original_specs(role_data["spec_file"]),
-        )
+        errors, warnings, notices = _check_defaults(processor, role_path, role_data)
 
         # Should have no errors
         assert len(errors) == 0
@@ -1489,11 +1613,7 @@ dummy_var: "dummy_value"
         role_data = processor.parser.validate_structure(role_path)
 
         # Test the consistency validation
-        errors, warnings, notices = processor._validate_defaults_consistency(
-            role_path,
-            role_data["specs"],
-            processor._parse_original_specs(role_data["spec_file"]),
-        )
+        errors, warnings, notices = _check_defaults(processor, role_path, role_data)
 
         # Should have no errors
         assert len(errors) == 0
@@ -0,0 +1,188 @@
+"""Tests for file sources (core/sources.py)."""
+
+import io
+import pickle
+import shutil
+import tarfile
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from ansible_docsmith.cli import app
+from ansible_docsmith.core.collection import CollectionProcessor
+from ansible_docsmith.core.exceptions import FileOperationError, GitError
+from ansible_docsmith.core.processor import RoleProcessor
+from ansible_docsmith.core.sources import GitSource, TarballSource
+
+FIXTURE = Path(__file__).parent.parent / "fixtures" / "example-collection"
+
+
+class TestGitSource:
+    """Reading files straight from git objects."""
+
+    def test_reads_committed_files(self, git_repo: Path) -> None:
+        readme = git_repo / "roles" / "first" / "README.md"
+        committed = readme.read_text()
+        readme.write_text("# Changed in the working tree\n")
+        shutil.rmtree(git_repo / "roles" / "second")
+
+        with GitSource("HEAD", git_repo) as source:
+            assert source.read_text(readme) == committed
+            assert source.size(readme) == len(committed.encode())
+            assert source.is_file(git_repo / "roles" / "second" / "README.md")
+            assert source.is_dir(git_repo / "roles" / "second")
+            assert not source.is_file(git_repo / "roles")
+            assert source.list_dirs(git_repo / "roles") == ["first", "second"]
+            with pytest.raises(FileNotFoundError):
+                source.read_text(git_repo / "missing.txt")
+            with pytest.raises(FileOperationError, match="read-only"):
+                source.write_text(readme, "nope")
+
+    def test_relative_paths(
+        self, git_repo: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.chdir(git_repo / "roles")
+        with GitSource("HEAD") as source:
+            assert source.is_file(Path("first") / "meta" / "argument_specs.yml")
+            assert not source.is_dir(Path("..") / ".." / "elsewhere")
+
+    def test_unknown_ref(self, git_repo: Path) -> None:
+        with pytest.raises(GitError, match="Unknown git ref 'nope'"):
+            GitSource("nope", git_repo)
+
+    def test_processors_run_read_only(self, git_repo: Path) -> None:
+        role = git_repo / "roles" / "first"
+        (role / "README.md").unlink()
+
+        with GitSource("HEAD", git_repo) as source:
+            processor = RoleProcessor(source=source)
+            assert processor.dry_run
+            results = processor.process_role(role)
+
+            collection = CollectionProcessor(git_repo, source=source)
+            collection_results = collection.process_collection()
+
+        assert not results.errors
+        assert results.changed_files() == [
+            role / "README.md",
+            role / "defaults" / "main.yml",
+        ]
+        assert not (role / "README.md").exists()
+        assert git_repo / "README.md" in collection_results.changed_files()
+
+    def test_view(self, git_repo: Path) -> None:
+        role = git_repo / "roles" / "first"
+        with GitSource("HEAD", git_repo) as source:
+            view = source.view(role)
+            try:
+                assert view.read_text(role / "README.md") == source.read_text(
+                    role / "README.md"
+                )
+                assert view.list_dirs(git_repo / "roles") == ["first"]
+                assert view.list_dirs(role) == source.list_dirs(role)
+                assert not view.is_file(git_repo / "README.md")
+                assert not view.is_dir(git_repo / "roles" / "second")
+                assert all(name.startswith("roles/first/") for name in view._objects)
+                # Only the role's files are sent to worker processes
+                assert len(pickle.dumps(view)) < len(pickle.dumps(source))
+            finally:
+                view.close()
+
+            with pytest.raises(FileNotFoundError):
+                source.view(git_repo / "missing")
+
+    def test_cli_git_ref(self, git_repo: Path) -> None:
+        runner = CliRunner()
+        shutil.rmtree(git_repo / "roles")
+
+        result = runner.invoke(app, ["validate", "--git-ref", "HEAD", str(git_repo)])
+        assert result.exit_code == 0
+        assert "Reading from git ref 'HEAD'" in result.stdout
+        assert "Role: second" in result.stdout
+
+        result = runner.invoke(
+            app, ["generate", "--git-ref", "HEAD", "--check", str(git_repo)]
+        )
+        assert result.exit_code == 1
+        assert "not up to date" in result.stdout
+        assert not (git_repo / "roles").exists()
+
+        result = runner.invoke(
+            app, ["validate", "--git-ref", "HEAD", str(git_repo / "nope")]
+        )
+        assert result.exit_code == 2
+        assert "Invalid value for PATH" in result.output
+
+
+def _build_tarball(path: Path, collection: Path) -> Path:
+    """Pack a collection like ``ansible-galaxy collection build`` does."""
+    with tarfile.open(path, "w:gz") as tar:
+        for member in sorted(collection.rglob("*")):
+            tar.add(member, member.relative_to(collection).as_posix(), recursive=False)
+    return path
+
+
+class TestTarballSource:
+    """Reading collection tarballs without extraction."""
+
+    def test_reads_needed_members(self, temp_dir: Path) -> None:
+        collection = temp_dir / "collection"
+        shutil.copytree(FIXTURE, collection)
+        (collection / "roles" / "first" / "tasks").mkdir()
+        (collection / "roles" / "first" / "tasks" / "main.yml").write_text("---\n")
+        tarball = _build_tarball(temp_dir / "ns-name-1.0.0.tar.gz", collection)
+
+        source = TarballSource(tarball)
+        readme = tarball / "roles" / "first" / "README.md"
+        assert (
+            source.read_text(readme)
+            == (collection / "roles" / "first" / "README.md").read_text()
+        )
+        assert source.list_dirs(tarball / "roles") == ["first", "second"]
+        assert source.is_dir(tarball / "roles" / "first" / "tasks")
+        # Listed, but not kept in memory
+        tasks = tarball / "roles" / "first" / "tasks" / "main.yml"
+        assert source.size(tasks) == 4
+        with pytest.raises(FileOperationError, match="not loaded"):
+            source.read_text(tasks)
+        with pytest.raises(FileOperationError, match="read-only"):
+            source.write_text(readme, "nope")
+
+    def test_rejects_paths_outside_of_root(self, temp_dir: Path) -> None:
+        tarball = temp_dir / "evil.tar"
+        with tarfile.open(tarball, "w") as tar:
+            for name in ("../outside.md", "/abs/README.md", "./README.md"):
+                info = tarfile.TarInfo(name)
+                info.size = 2
+                tar.addfile(info, io.BytesIO(b"#\n"))
+
+        source = TarballSource(tarball)
+        assert source.read_text(tarball / "README.md") == "#\n"
+        assert not source.is_file(temp_dir / "outside.md")
+        assert source.list_dirs(tarball) == []
+
+    def test_invalid_tarball(self, temp_dir: Path) -> None:
+        tarball = temp_dir / "broken.tar.gz"
+        tarball.write_text("no tarball")
+        with pytest.raises(FileOperationError, match="Cannot read tarball"):
+            TarballSource(tarball)
+
+    def test_cli_tarball(self, temp_dir: Path) -> None:
+        tarball = _build_tarball(temp_dir / "ns-name-1.0.0.tar.gz", FIXTURE)
+        runner = CliRunner()
+
+        result = runner.invoke(app, ["validate", str(tarball)])
+        assert result.exit_code == 0
+        assert "Reading from tarball 'ns-name-1.0.0.tar.gz'" in result.stdout
+        assert "Role: second" in result.stdout
+
+        result = runner.invoke(app, ["generate", "--check", str(tarball)])
+        assert result.exit_code == 1
+        assert "not up to date" in result.stdout
+        assert tarball.is_file()
+
+        (temp_dir / "broken.tgz").write_text("no tarball")
+        result = runner.invoke(app, ["validate", str(temp_dir / "broken.tgz")])
+        assert result.exit_code == 2
+        assert "Invalid value for PATH" in result.output
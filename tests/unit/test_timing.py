@@ -0,0 +1,114 @@
+"""Tests for the stage timings (core/timing.py)."""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from ansible_docsmith.core.processor import RoleProcessor
+from ansible_docsmith.core.timing import (
+    OTHER_STAGE,
+    Span,
+    collect_timings,
+    stage,
+    timed,
+    timings_enabled,
+)
+
+ROLE = Path(__file__).parent.parent / "fixtures" / "example-role-simple-toc"
+
+
+@timed("work")
+def _work(seconds: float) -> str:
+    time.sleep(seconds)
+    return "done"
+
+
+class TestStageTimings:
+    """Exclusive time per stage within collect_timings() blocks."""
+
+    def test_disabled_by_default(self) -> None:
+        assert not timings_enabled()
+        with stage("work"):
+            assert _work(0) == "done"
+
+    def test_nested_stages_are_exclusive(self) -> None:
+        timings: dict[str, float] = {}
+        start = time.perf_counter()
+        with collect_timings(timings):
+            assert timings_enabled()
+            with stage("outer"):
+                time.sleep(0.01)
+                assert _work(0.02) == "done"
+            time.sleep(0.01)
+        elapsed = time.perf_counter() - start
+
+        assert not timings_enabled()
+        assert set(timings) == {"outer", "work", OTHER_STAGE}
+        assert timings["outer"] >= 0.01
+        assert timings["work"] >= 0.02
+        assert timings[OTHER_STAGE] >= 0.01
+        assert sum(timings.values()) <= elapsed
+
+    def test_nested_blocks(self) -> None:
+        outer: dict[str, float] = {}
+        inner: dict[str, float] = {}
+        start = time.perf_counter()
+        with collect_timings(outer), stage("outer"):
+            with collect_timings(inner):
+                _work(0.01)
+            time.sleep(0.01)
+        elapsed = time.perf_counter() - start
+
+        assert set(inner) == {"work", OTHER_STAGE}
+        assert set(outer) == {"outer", OTHER_STAGE}
+        # The inner block's time only counts for its own dict
+        assert outer["outer"] >= 0.01
+        assert sum(outer.values()) + sum(inner.values()) <= elapsed
+
+    def test_threads_do_not_inherit_blocks(self) -> None:
+        timings: dict[str, float] = {}
+        with collect_timings(timings), ThreadPoolExecutor(max_workers=1) as pool:
+            assert not pool.submit(timings_enabled).result()
+        assert "work" not in timings
+
+    def test_spans(self) -> None:
+        timings: dict[str, float] = {}
+        spans: list[Span] = []
+        with collect_timings(timings, spans, "block", "role", {"path": "p"}):
+            with stage("outer"):
+                _work(0)
+
+        assert [(span.name, span.category) for span in spans] == [
+            ("work", "stage"),
+            ("outer", "stage"),
+            ("block", "role"),
+        ]
+        work, outer, block = spans
+        assert block.start <= outer.start <= work.start <= work.end <= outer.end
+        assert outer.end <= block.end
+        assert block.args == {"path": "p"}
+        assert {(span.pid, span.tid) for span in spans} == {
+            (os.getpid(), threading.get_native_id())
+        }
+
+
+def test_role_processor_timings() -> None:
+    results = RoleProcessor(dry_run=True).process_role(ROLE)
+    assert results.timings == {}
+
+    results = RoleProcessor(dry_run=True, collect_timings=True).process_role(ROLE)
+    assert {
+        "validate",
+        "yaml",
+        "readme",
+        "jinja",
+        "markup",
+        "toc",
+        "table_description",
+        "defaults_comments",
+        "comment_format",
+    } <= set(results.timings)
+    # README rendering and defaults comments are reported apart
+    assert "markdown" not in results.timings
@@ -0,0 +1,103 @@
+"""Tests for the argument spec check registry (core/validators.py)."""
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from ansible_docsmith.core import validators
+from ansible_docsmith.core.validators import (
+    SPEC_CHECKS,
+    SpecCheckContext,
+    run_spec_checks,
+    select_spec_checks,
+)
+
+ORIGINAL_SPECS: dict[str, Any] = {
+    "main": {
+        "short_description": "Bad M(ref).",
+        "typo_key": True,
+        "options": {
+            "port": {"type": "int", "default": 1, "required": True},
+            "tls": {
+                "type": "dict",
+                "options": {"cert": {"type": "path", "descripton": "Typo."}},
+            },
+        },
+    }
+}
+
+
+def _context() -> SpecCheckContext:
+    return SpecCheckContext(
+        role_path=Path("role"), specs={}, original_specs=ORIGINAL_SPECS
+    )
+
+
+class TestSelectSpecChecks:
+    """Resolution of --only/--skip selections."""
+
+    def test_defaults_to_all_in_registration_order(self) -> None:
+        assert select_spec_checks() == list(SPEC_CHECKS)
+        assert list(SPEC_CHECKS) == [
+            "defaults",
+            "unknown-keys",
+            "exclusive-keys",
+            "markup",
+        ]
+
+    def test_only_and_skip(self) -> None:
+        assert select_spec_checks(only=["markup", "defaults"]) == [
+            "defaults",
+            "markup",
+        ]
+        assert select_spec_checks(skip=["defaults", "markup"]) == [
+            "unknown-keys",
+            "exclusive-keys",
+        ]
+
+    def test_unknown_names(self) -> None:
+        with pytest.raises(ValueError, match="Unknown check"):
+            select_spec_checks(only=["markup", "nope"])
+
+
+class TestRunSpecChecks:
+    """One traversal shared by all selected checks."""
+
+    def test_findings_are_grouped_by_check(self) -> None:
+        report = run_spec_checks(_context())
+
+        assert len(report.errors) == 1
+        assert "'port' has both 'default'" in report.errors[0]
+        assert [w.split(":")[0] for w in report.warnings] == [
+            "Entry point 'main'",
+            "Entry point 'main', variable 'tls.cert'",
+            "Entry point 'main' (short_description)",
+        ]
+        assert set(report.timings) == set(SPEC_CHECKS)
+
+    def test_specs_are_traversed_once(self, monkeypatch: Any) -> None:
+        calls: list[Any] = []
+        original = validators.build_option_index
+
+        def counting(options: Any, depth: int = 0) -> Any:
+            calls.append(options)
+            return original(options, depth)
+
+        monkeypatch.setattr(validators, "build_option_index", counting)
+
+        run_spec_checks(_context())
+        assert len(calls) == 1
+
+        # Checks without option visits do not traverse the options at all
+        report = run_spec_checks(_context(), only=["defaults"])
+        assert len(calls) == 1
+        assert list(report.timings) == ["defaults"]
+
+    def test_fail_fast_stops_at_first_error(self) -> None:
+        report = run_spec_checks(_context(), fail_fast=True)
+
+        assert len(report.errors) == 1
+        # Findings after the error (the unknown key of "tls.cert") are
+        # never produced
+        assert not any("tls.cert" in warning for warning in report.warnings)